@@ -0,0 +1,180 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from jose import JWTError, jwt
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+
+from .config import Settings
+
+
+settings = Settings()
+
+
+class AdmissionBackend:
+    """Where rate-limit and concurrency state lives.
+
+    Methods are async so a backend shared across workers (e.g. Redis) can
+    implement the same interface as the in-process one.
+    """
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Takes a token from `key`'s bucket; returns 0 or the seconds until one is available."""
+        raise NotImplementedError
+
+    async def acquire(self, key: str, limit: int) -> bool:
+        """Claims one of `limit` in-flight slots for `key`, without waiting."""
+        raise NotImplementedError
+
+    async def release(self, key: str):
+        raise NotImplementedError
+
+
+class InMemoryBackend(AdmissionBackend):
+    """Per-process state; least recently used buckets are forgotten first,
+    which only ever errs towards admitting a request."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        return wait
+
+    async def acquire(self, key: str, limit: int) -> bool:
+        with self._lock:
+            count = self._in_flight.get(key, 0)
+            if count >= limit:
+                return False
+            self._in_flight[key] = count + 1
+
+        return True
+
+    async def release(self, key: str):
+        with self._lock:
+            count = self._in_flight.get(key, 0) - 1
+            if count > 0:
+                self._in_flight[key] = count
+            else:
+                self._in_flight.pop(key, None)
+
+
+backend: AdmissionBackend = InMemoryBackend(max_keys=settings.admission_max_keys)
+
+
+def _header(scope, name: bytes):
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+
+    return None
+
+
+def _client_ip(scope):
+    if settings.admission_trust_forwarded_for:
+        forwarded = _header(scope, b"x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    client = scope.get("client")
+
+    return client[0] if client else "unknown"
+
+
+def _token_subject(scope):
+    # Signature check only; invalid tokens fall back to the IP limit and are
+    # rejected by the route's own authentication
+    scheme, _, token = (_header(scope, b"authorization") or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm]).get("username")
+    except JWTError:
+        return None
+
+
+def _reject(status_code: int, detail: str, retry_after: float):
+    return JSONResponse(
+        {"detail": detail}, status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+
+class AdmissionMiddleware:
+    """Rate limits and in-flight caps, checked before a request reaches a route.
+
+    Authenticated requests draw from a bucket per user, so users behind one
+    NAT are limited separately. Anonymous ones, such as /login, draw from a
+    bucket per client IP, which everyone behind that NAT shares. Over-limit
+    requests get 429; requests beyond the global or per-route in-flight caps
+    are shed with 503.
+    """
+
+    def __init__(self, app, routes):
+        self.app = app
+        # The application's route list, shared so later include_router calls count
+        self.routes = routes
+
+    def _route(self, scope):
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return f"{scope['method']} {getattr(route, 'path_format', route.path)}"
+
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.admission_enabled or scope["path"].startswith(
+                tuple(settings.admission_exempt_prefixes)):
+            await self.app(scope, receive, send)
+            return
+
+        username = _token_subject(scope)
+        if username is not None:
+            key, rate, burst = f"user:{username}", settings.rate_limit_user_rps, settings.rate_limit_user_burst
+        else:
+            key, rate, burst = f"ip:{_client_ip(scope)}", settings.rate_limit_ip_rps, settings.rate_limit_ip_burst
+
+        if rate > 0:
+            wait = await backend.take(key, rate, burst)
+            if wait:
+                await _reject(429, "Too many requests. Please slow down.", wait)(scope, receive, send)
+                return
+
+        slots = []
+        if settings.admission_max_in_flight > 0:
+            slots.append(("in-flight", settings.admission_max_in_flight))
+        route = self._route(scope) if settings.admission_route_limits else None
+        if route in settings.admission_route_limits:
+            slots.append((f"in-flight:{route}", settings.admission_route_limits[route]))
+
+        acquired = []
+        try:
+            for slot, limit in slots:
+                if not await backend.acquire(slot, limit):
+                    await _reject(503, "Server is busy. Please try again shortly.",
+                                  settings.admission_retry_after)(scope, receive, send)
+                    return
+                acquired.append(slot)
+
+            await self.app(scope, receive, send)
+        finally:
+            for slot in acquired:
+                await backend.release(slot)
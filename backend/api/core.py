@@ -1,29 +1,67 @@
+import asyncio
+
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
 from ..db import models
-from ..db.database import SessionLocal, engine
+from ..db.database import engine, async_engine, settings
 
-from ..routes import auth, users, projects, sentences, translations
+from ..routes import auth, users, projects, sentences, translations, translation_batches, recordings, exports, tasks, stats, search, suggestions, feeds, jobs, internal
+from .. import admission, events, metrics, utils
 
 
 # Lifespan to manage app events at app start and stop
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Create tables
-    models.Base.metadata.create_all(bind=engine)
+    if settings.async_db:
+        async with async_engine.begin() as conn:
+            await conn.run_sync(models.Base.metadata.create_all)
+    else:
+        models.Base.metadata.create_all(bind=engine)
+
+    # crud publishes feed events from threadpool workers onto this loop
+    events.feed.bind(asyncio.get_running_loop())
     yield
+    events.feed.bind(None)
+
+    # Close pooled connections to database
+    engine.dispose()
+    if settings.async_db:
+        await async_engine.dispose()
 
-    # Close connection to database
-    SessionLocal.close_all()
+    utils.shutdown_password_executor()
 
 
 # Create FastAPI app
 app = FastAPI(lifespan=lifespan)
 
-# Add routes
+# Rate limits and load shedding, ahead of routing and the database
+app.add_middleware(admission.AdmissionMiddleware, routes=app.routes)
+
+# Per-route latency and SQL accounting, exposed on /internal/metrics;
+# added last so it is outermost and also times rejected requests
+app.add_middleware(metrics.MetricsMiddleware)
+metrics.instrument_engine(engine)
+if settings.async_db:
+    metrics.instrument_engine(async_engine.sync_engine)
+
+# Add routes, served from the async database stack when enabled
+if settings.async_db:
+    from ..routes.aio import auth, users, projects, sentences, translations
+
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(projects.router)
 app.include_router(sentences.router)
 app.include_router(translations.router)
+app.include_router(translation_batches.router)
+app.include_router(recordings.router)
+app.include_router(exports.router)
+app.include_router(tasks.router)
+app.include_router(stats.router)
+app.include_router(search.router)
+app.include_router(suggestions.router)
+app.include_router(feeds.router)
+app.include_router(jobs.router)
+app.include_router(internal.router)
@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import OrderedDict
+
+from .config import Settings
+
+
+settings = Settings()
+
+MISSING = object()
+
+
+class CacheBackend:
+    """Interface of a key/value cache; TTLCache is the in-process implementation.
+
+    An out-of-process backend (e.g. Redis) shares entries and invalidations
+    across workers, but must store plain, serializable values and may
+    implement `delete_where` as a no-op, leaving such entries to their TTL.
+    """
+
+    def get(self, key, default=MISSING):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl: float | None = None):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def delete_where(self, predicate):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {}
+
+
+class TTLCache(CacheBackend):
+    """Bounded, thread-safe LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=MISSING):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                self.expirations += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float | None = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        # Drop every entry whose key matches `predicate`
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data), "maxsize": self.maxsize,
+                "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "expirations": self.expirations
+            }
+
+
+# (username, project_id) -> role name, or None for non-members
+membership_cache = TTLCache(
+    maxsize=settings.membership_cache_size,
+    ttl=settings.membership_cache_ttl
+)
+
+# (username, token) -> resolved principal
+principal_cache = TTLCache(
+    maxsize=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl
+)
+
+# username -> users.token_version, or None for deleted users. Revocation is
+# shared through the database; this only spares a lookup per request.
+token_version_cache = TTLCache(
+    maxsize=settings.principal_cache_size,
+    ttl=settings.token_version_ttl
+)
+
+
+def revoke_principal(username: str):
+    # Immediate on this worker; others notice within token_version_ttl
+    principal_cache.delete_where(lambda key: key[0] == username)
+    token_version_cache.delete(username)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -11,5 +13,105 @@ class Settings(BaseSettings):
     algorithm: str
     access_token_expire_minutes: int
 
+    # Connection pool, shared by the sync and async engines
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+
+    # Annotation work queue
+    task_lease_seconds: int = 900
+
+    # Recording audio storage; set the accel-redirect prefix to let a
+    # fronting nginx serve files with sendfile
+    recordings_dir: str = "recordings"
+    recording_max_bytes: int = 512 * 1024 * 1024
+    recordings_accel_redirect_prefix: Optional[str] = None
+
+    # Translation memory: MinHash/LSH fuzzy-match index per project and language
+    # pair, built by background threads; indexes are evicted least recently used
+    # first once they hold `tm_max_sentences` sentences in total. Benchmarked
+    # on one core, 100k sentences build in about 20 s into about 75 MB per
+    # worker; see `benchmarks.translation_memory` before raising it
+    tm_num_perm: int = 32
+    tm_bands: int = 8
+    tm_ngram: int = 3
+    tm_max_candidates: int = 200
+    tm_min_score: float = 0.3
+    tm_max_sentences: int = 100000
+    tm_build_workers: int = 1
+
+    # List routes answered by the orjson row fast path instead of ORM objects
+    # validated through response_model
+    fast_list_routes: set[str] = {"sentences", "users"}
+
+    # Largest batch accepted by the batch translation submission endpoint
+    translation_batch_max: int = 1000
+
+    # Log requests slower than this, with their SQL statements; None disables
+    slow_request_seconds: Optional[float] = None
+    slow_request_statement_chars: int = 500
+
+    # Admission control: token buckets per user (authenticated) or client IP
+    # (anonymous), plus global and per-route ("METHOD /path/{template}")
+    # in-flight caps; a rate or cap of 0 disables it
+    admission_enabled: bool = True
+    rate_limit_user_rps: float = 20.0
+    rate_limit_user_burst: int = 40
+    rate_limit_ip_rps: float = 10.0
+    rate_limit_ip_burst: int = 20
+    admission_max_in_flight: int = 200
+    admission_route_limits: dict[str, int] = {
+        "POST /login": 16,
+        "GET /projects/{project_id}/export/": 4,
+    }
+    admission_retry_after: int = 1
+    admission_exempt_prefixes: list[str] = ["/internal/"]
+    admission_trust_forwarded_for: bool = False
+    admission_max_keys: int = 100000
+
+    # Project activity feed: events are batched per project over this window;
+    # a subscriber more than `feed_queue_size` batches behind gets a resync
+    feed_coalesce_seconds: float = 0.25
+    feed_queue_size: int = 32
+
+    # Background jobs: worker processes poll the jobs table; a running job
+    # whose heartbeat is older than `job_heartbeat_timeout` is requeued, or
+    # failed once it has been attempted `job_max_attempts` times
+    job_workers: int = 2
+    job_poll_seconds: float = 1.0
+    job_heartbeat_seconds: float = 5.0
+    job_heartbeat_timeout: float = 60.0
+    job_max_attempts: int = 3
+    job_batch_size: int = 1000
+    exports_dir: str = "exports"
+
+    # Serve routes from the asyncio database stack (AsyncEngine/AsyncSession)
+    async_db: bool = False
+
+    # Read-through cache of user, project and sentence rows by primary key
+    row_cache_enabled: bool = True
+    row_cache_size: int = 50000
+    row_cache_ttl: float = 30.0
+
+    # Project membership cache
+    membership_cache_size: int = 10000
+    membership_cache_ttl: float = 60.0
+
+    # Current-user resolution: trust signed token claims instead of a DB lookup
+    auth_trust_token_claims: bool = False
+    principal_cache_size: int = 10000
+    principal_cache_ttl: float = 300.0
+    # How long a worker reuses a user's token version; bounds how long a
+    # revoked token (demotion, password change, deletion) keeps working
+    token_version_ttl: float = 5.0
+
+    # Password hashing: bcrypt cost and the bounded executor it runs on
+    bcrypt_rounds: int = 12
+    password_hash_executor: str = "thread"
+    password_hash_workers: int = 4
+    password_hash_queue_limit: int = 32
+
     class Config:
         env_file = ".env"
@@ -0,0 +1,356 @@
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import Optional
+from . import models, schemas, counters, dedupe, row_cache
+from ..utils import hash_password_async
+from ..cache import MISSING, membership_cache, revoke_principal, token_version_cache
+from ..translation_memory import translation_memory
+from ..events import feed
+
+
+# Async counterparts of crud.py for the AsyncSession stack. Relationships
+# cannot lazy-load under asyncio, so anything a response needs is eager-loaded.
+
+
+async def _execute_all(db: AsyncSession, statements):
+    for statement in statements:
+        await db.execute(statement)
+
+
+# User CRUD Operations
+
+async def create_user(db: AsyncSession, user: schemas.UserCreate, hashed_password: Optional[str] = None):
+    if hashed_password is None:
+        # Never bcrypt on the event loop
+        hashed_password = await hash_password_async(user.password)
+    db_user = models.User(
+        username=user.username, email=user.email,
+        gender=user.gender, age=user.age,
+        hashed_password=hashed_password, is_admin=user.is_admin
+    )
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+
+    return db_user
+
+
+async def update_user(db: AsyncSession, username: str, user: schemas.UserUpdate, hashed_password: Optional[str] = None):
+    # A new password arrives already hashed as `hashed_password`
+    db_user = await get_user(db=db, username=username)
+    if db_user:
+        was_admin = db_user.is_admin
+        for attr, value in user.model_dump(exclude={"password"}).items():
+            if value is not None:
+                setattr(db_user, attr, value)
+        if hashed_password is not None:
+            db_user.hashed_password = hashed_password
+        # Tokens issued before a demotion or password change stop working
+        if hashed_password is not None or db_user.is_admin != was_admin:
+            db_user.token_version = models.User.token_version + 1
+        await _execute_all(db, counters.member_version_bump(username))
+        await db.commit()
+        await db.refresh(db_user)
+        row_cache.invalidate(models.User, username, db_user.username)
+        # Tokens issued before this change no longer reflect the user
+        revoke_principal(username)
+        revoke_principal(db_user.username)
+    else:
+        raise ValueError(f"User `{username}` does not exist.")
+
+    return db_user
+
+
+async def update_user_password_hash(db: AsyncSession, username: str, hashed_password: str):
+    await db.execute(update(models.User).where(models.User.username == username).values(
+        hashed_password=hashed_password))
+    await db.commit()
+
+
+async def delete_user(db: AsyncSession, username: str):
+    db_user = await get_user(db=db, username=username)
+    if db_user:
+        await _execute_all(db, counters.member_version_bump(username))
+        await db.delete(db_user)
+        await db.commit()
+        row_cache.invalidate(models.User, username)
+        membership_cache.delete_where(lambda key: key[0] == username)
+        revoke_principal(username)
+    else:
+        raise ValueError(f"User `{username}` does not exist.")
+
+    return db_user
+
+
+async def get_user(db: AsyncSession, username: str, use_cache: bool = True):
+    if use_cache:
+        cached = row_cache.get(models.User, username)
+        if cached is not MISSING:
+            return await db.merge(cached, load=False)
+
+    return row_cache.store(models.User, username, await db.scalar(
+        select(models.User).where(models.User.username == username)))
+
+
+async def get_token_version(db: AsyncSession, username: str):
+    # None once the user is deleted; shared by every worker through the database
+    version = token_version_cache.get(username)
+    if version is MISSING:
+        version = await db.scalar(select(models.User.token_version).where(models.User.username == username))
+        token_version_cache.set(username, version)
+
+    return version
+
+
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100, after: Optional[str] = None):
+    query = select(models.User).order_by(models.User.username)
+    if after is not None:
+        query = query.where(models.User.username > after)
+    else:
+        query = query.offset(skip)
+
+    return (await db.scalars(query.limit(limit))).all()
+
+
+async def get_user_rows(db: AsyncSession, skip: int = 0, limit: int = 100, after: Optional[str] = None):
+    query = select(
+        models.User.username, models.User.email, models.User.gender,
+        models.User.age, models.User.is_admin
+    ).order_by(models.User.username)
+    if after is not None:
+        query = query.where(models.User.username > after)
+    else:
+        query = query.offset(skip)
+
+    return (await db.execute(query.limit(limit))).mappings().all()
+
+
+# Project CRUD Operations
+
+async def create_project(db: AsyncSession, project: schemas.ProjectCreate):
+    db_project = models.Project(**project.model_dump())
+    db.add(db_project)
+    await db.commit()
+    await db.refresh(db_project, attribute_names=["id", "annotators"])
+
+    return db_project
+
+
+async def delete_project(db: AsyncSession, project_id: int):
+    # Returned as schemas.Project, and nothing can lazy-load once it is deleted
+    db_project = await get_project(db=db, project_id=project_id, include_annotators=True)
+    if db_project:
+        await db.delete(db_project)
+        await db.commit()
+        row_cache.invalidate(models.Project, project_id)
+        membership_cache.delete_where(lambda key: key[1] == project_id)
+        translation_memory.drop_project(project_id)
+        feed.publish(project_id, "project.deleted", [project_id])
+    else:
+        raise ValueError(f"No such project with id `{project_id}`.")
+
+    return db_project
+
+
+async def get_project(db: AsyncSession, project_id: int, include_annotators: bool = False):
+    query = select(models.Project).where(models.Project.id == project_id)
+    if include_annotators:
+        return await db.scalar(query.options(selectinload(models.Project.annotators)))
+
+    cached = row_cache.get(models.Project, project_id)
+    if cached is not MISSING:
+        return await db.merge(cached, load=False)
+
+    return row_cache.store(models.Project, project_id, await db.scalar(query))
+
+
+def _member_projects(username: str):
+    return select(models.Role.project_id).where(models.Role.username == username)
+
+
+async def get_projects(db: AsyncSession, skip: int = 0, limit: int = 100, after: Optional[int] = None,
+                       username: Optional[str] = None, include_annotators: bool = False):
+    query = select(models.Project).order_by(models.Project.id)
+    if username is not None:
+        query = query.where(models.Project.id.in_(_member_projects(username)))
+    if include_annotators:
+        query = query.options(selectinload(models.Project.annotators))
+    if after is not None:
+        query = query.where(models.Project.id > after)
+    else:
+        query = query.offset(skip)
+
+    return (await db.scalars(query.limit(limit))).all()
+
+
+async def get_project_rows(db: AsyncSession, skip: int = 0, limit: int = 100, after: Optional[int] = None,
+                           username: Optional[str] = None):
+    query = select(
+        models.Project.id, models.Project.name, models.Project.p_type
+    ).order_by(models.Project.id)
+    if username is not None:
+        query = query.where(models.Project.id.in_(_member_projects(username)))
+    if after is not None:
+        query = query.where(models.Project.id > after)
+    else:
+        query = query.offset(skip)
+
+    return (await db.execute(query.limit(limit))).mappings().all()
+
+
+async def get_project_version(db: AsyncSession, project_id: int):
+    return await db.scalar(select(models.Project.version).where(models.Project.id == project_id))
+
+
+async def get_project_by_name(db: AsyncSession, project_name: str):
+    return await db.scalar(select(models.Project).where(models.Project.name == project_name))
+
+
+# Sentence CRUD Operations
+
+async def create_sentences(db: AsyncSession, sentences: list[schemas.SentenceCreate], project_id: int, on_duplicate: str = "existing"):
+    if not sentences:
+        return []
+
+    values = [
+        {**sentence.model_dump(), "project_id": project_id,
+         "content_hash": dedupe.content_hash(sentence.text)}
+        for sentence in sentences
+    ]
+
+    try:
+        existing = {
+            (row.language_iso, row.content_hash): row
+            for row in await db.execute(dedupe.existing_query(
+                project_id, {(value["language_iso"], value["content_hash"]) for value in values}))
+        }
+        new_values, slots = dedupe.plan_batch(values, existing, on_duplicate)
+
+        db_sentences = []
+        if new_values:
+            db_sentences = (await db.execute(
+                insert(models.Sentence).returning(
+                    models.Sentence.id, models.Sentence.text,
+                    models.Sentence.language_iso, models.Sentence.project_id,
+                    sort_by_parameter_order=True
+                ),
+                new_values
+            )).all()
+            await _execute_all(db, counters.sentence_counters(project_id, len(db_sentences)))
+            await _execute_all(db, counters.version_bump([project_id]))
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    if db_sentences:
+        feed.publish(project_id, "sentences.created", [db_sentence.id for db_sentence in db_sentences])
+
+    return dedupe.assemble(slots, db_sentences, on_duplicate)
+
+
+async def get_sentence(db: AsyncSession, sentence_id: int):
+    cached = row_cache.get(models.Sentence, sentence_id)
+    if cached is not MISSING:
+        return await db.merge(cached, load=False)
+
+    return row_cache.store(models.Sentence, sentence_id, await db.get(models.Sentence, sentence_id))
+
+
+async def get_project_sentence(db: AsyncSession, project_id: int, src_sentence_id: int):
+    db_sentence = await get_sentence(db=db, sentence_id=src_sentence_id)
+
+    return db_sentence if db_sentence is not None and db_sentence.project_id == project_id else None
+
+
+async def get_project_sentences(db: AsyncSession, project_id: int, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+    query = select(models.Sentence).where(
+        models.Sentence.project_id == project_id).order_by(models.Sentence.id)
+    if after is not None:
+        query = query.where(models.Sentence.id > after)
+    else:
+        query = query.offset(skip)
+
+    return (await db.scalars(query.limit(limit))).all()
+
+
+async def get_project_sentence_rows(db: AsyncSession, project_id: int, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+    query = select(
+        models.Sentence.id, models.Sentence.text,
+        models.Sentence.language_iso, models.Sentence.project_id
+    ).where(models.Sentence.project_id == project_id).order_by(models.Sentence.id)
+    if after is not None:
+        query = query.where(models.Sentence.id > after)
+    else:
+        query = query.offset(skip)
+
+    return (await db.execute(query.limit(limit))).mappings().all()
+
+
+# Translation CRUD Operations
+
+async def create_translation(db: AsyncSession, src_sentence_id: int, translation: schemas.TranslationCreate):
+    projects_query, translated_query = counters.translation_context(
+        [(src_sentence_id, translation.language_iso)])
+    projects = dict((await db.execute(projects_query)).all())
+    translated = set((await db.execute(translated_query)).all())
+    await _execute_all(db, counters.translation_counters(
+        [(src_sentence_id, translation.language_iso, translation.annotator_username)], projects, translated))
+    await _execute_all(db, counters.version_bump(projects.values()))
+
+    db_translation = models.Translation(
+        **translation.model_dump(), src_sentence_id=src_sentence_id)
+    db.add(db_translation)
+    await release_task_leases(db=db, task_type="translation", keys=[
+        (src_sentence_id, translation.language_iso)])
+    await db.commit()
+    await db.refresh(db_translation)
+    translation_memory.notify_translated(
+        projects[src_sentence_id], [(src_sentence_id, translation.language_iso)])
+    feed.publish(projects[src_sentence_id], "translations.created", [(src_sentence_id, db_translation.id)])
+
+    return db_translation
+
+
+async def get_translation(db: AsyncSession, src_sentence_id: int, translation_id: int):
+    return await db.scalar(
+        select(models.Translation).where(models.Translation.src_sentence_id == src_sentence_id)
+        .where(models.Translation.id == translation_id)
+    )
+
+
+# Role CRUD Operations
+
+async def get_project_role(db: AsyncSession, username: str, project_id: int):
+    key = (username, project_id)
+    role = membership_cache.get(key)
+    if role is MISSING:
+        role = await db.scalar(
+            select(models.Role.role).where(models.Role.username == username)
+            .where(models.Role.project_id == project_id)
+        )
+        membership_cache.set(key, role)
+
+    return role
+
+
+# Task lease Operations
+
+async def release_task_leases(db: AsyncSession, task_type: str, keys: list[tuple[int, str]]):
+    if keys:
+        await db.execute(delete(models.TaskLease).where(models.TaskLease.task_type == task_type).where(
+            tuple_(models.TaskLease.sentence_id, models.TaskLease.language_iso).in_(keys)))
+
+
+# Job Operations
+
+async def create_job(db: AsyncSession, kind: str, username: str, project_id: Optional[int] = None,
+                     payload: Optional[dict] = None, total: Optional[int] = None):
+    db_job = models.Job(kind=kind, username=username, project_id=project_id,
+                        payload=payload or {}, total=total)
+    db.add(db_job)
+    await db.commit()
+    await db.refresh(db_job)
+
+    return db_job
@@ -0,0 +1,167 @@
+from collections import Counter, defaultdict
+
+from sqlalchemy import delete, distinct, func, insert, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from . import models
+
+
+# Statement builders for the per-project progress counters. crud.py and
+# async_crud.py execute them inside the same transaction as the write they
+# account for, so counters and rows commit (or roll back) together.
+
+LANGUAGE_COUNTERS = ("translated_sentences", "translations", "recordings")
+ANNOTATOR_COUNTERS = ("translations", "recordings")
+
+
+def _upsert(model, key_columns: tuple, counter_columns: tuple, deltas: dict):
+    # Sorted keys keep concurrent writers locking counter rows in one order
+    values = [
+        {**dict(zip(key_columns, key)), **{column: counts[column] for column in counter_columns}}
+        for key, counts in sorted(deltas.items())
+    ]
+    stmt = pg_insert(model).values(values)
+
+    return stmt.on_conflict_do_update(
+        index_elements=list(key_columns),
+        set_={column: getattr(model, column) + getattr(stmt.excluded, column)
+              for column in counter_columns}
+    )
+
+
+def sentence_counters(project_id: int, delta: int):
+    return [_upsert(models.ProjectStats, ("project_id",), ("total_sentences",),
+                    {(project_id,): {"total_sentences": delta}})]
+
+
+def translation_context(keys: list[tuple[int, str]]):
+    """Queries needed before counting new translations for (sentence_id, language_iso) keys.
+
+    The first maps sentence ids to project ids; the second returns the keys
+    that already have at least one translation.
+    """
+    sentence_ids = {sentence_id for sentence_id, _ in keys}
+    projects = select(models.Sentence.id, models.Sentence.project_id).where(
+        models.Sentence.id.in_(sentence_ids))
+    translated = select(models.Translation.src_sentence_id, models.Translation.language_iso).distinct().where(
+        tuple_(models.Translation.src_sentence_id, models.Translation.language_iso).in_(keys))
+
+    return projects, translated
+
+
+def translation_counters(translations: list[tuple[int, str, str]], projects: dict, translated: set):
+    """Counter updates for inserting (sentence_id, language_iso, annotator_username) rows."""
+    languages = defaultdict(Counter)
+    annotators = defaultdict(Counter)
+    seen = set(translated)
+    for sentence_id, language_iso, username in translations:
+        project_id = projects[sentence_id]
+        languages[(project_id, language_iso)]["translations"] += 1
+        if (sentence_id, language_iso) not in seen:
+            seen.add((sentence_id, language_iso))
+            languages[(project_id, language_iso)]["translated_sentences"] += 1
+        annotators[(project_id, username)]["translations"] += 1
+
+    return [
+        _upsert(models.ProjectLanguageStats, ("project_id", "language_iso"),
+                LANGUAGE_COUNTERS, languages),
+        _upsert(models.ProjectAnnotatorStats, ("project_id", "username"),
+                ANNOTATOR_COUNTERS, annotators),
+    ]
+
+
+def translation_removal_counters(project_id: int, language_iso: str, username: str, still_translated: bool):
+    language = Counter(translations=-1, translated_sentences=0 if still_translated else -1)
+
+    return [
+        _upsert(models.ProjectLanguageStats, ("project_id", "language_iso"),
+                LANGUAGE_COUNTERS, {(project_id, language_iso): language}),
+        _upsert(models.ProjectAnnotatorStats, ("project_id", "username"),
+                ANNOTATOR_COUNTERS, {(project_id, username): Counter(translations=-1)}),
+    ]
+
+
+def recording_counters(project_id: int, language_iso: str, username: str, delta: int):
+    return [
+        _upsert(models.ProjectLanguageStats, ("project_id", "language_iso"),
+                LANGUAGE_COUNTERS, {(project_id, language_iso): Counter(recordings=delta)}),
+        _upsert(models.ProjectAnnotatorStats, ("project_id", "username"),
+                ANNOTATOR_COUNTERS, {(project_id, username): Counter(recordings=delta)}),
+    ]
+
+
+def version_bump(project_ids):
+    # Ascending ids keep concurrent writers locking project rows in one order
+    project_ids = sorted(set(project_ids))
+    if not project_ids:
+        return []
+
+    return [update(models.Project).where(models.Project.id.in_(project_ids)).values(
+        version=models.Project.version + 1)]
+
+
+def member_version_bump(username: str):
+    # Project responses embed their annotators
+    return [update(models.Project).where(models.Project.id.in_(
+        select(models.Role.project_id).where(models.Role.username == username))).values(
+        version=models.Project.version + 1)]
+
+
+def rebuild_statements(project_id: int):
+    """Statements that recompute every counter of a project from the base tables."""
+    sentence = models.Sentence
+    translation = models.Translation
+    recording = models.Recording
+
+    language_translations = select(
+        sentence.project_id, translation.language_iso,
+        func.count(distinct(translation.src_sentence_id)).label("translated_sentences"),
+        func.count().label("translations"), literal(0).label("recordings")
+    ).join(sentence, sentence.id == translation.src_sentence_id).where(
+        sentence.project_id == project_id).group_by(sentence.project_id, translation.language_iso)
+    language_recordings = select(
+        sentence.project_id, recording.language_iso,
+        literal(0).label("translated_sentences"), literal(0).label("translations"),
+        func.count().label("recordings")
+    ).join(sentence, sentence.id == recording.src_sentence_id).where(
+        sentence.project_id == project_id).group_by(sentence.project_id, recording.language_iso)
+    languages = language_translations.union_all(language_recordings).subquery()
+
+    annotator_translations = select(
+        sentence.project_id, translation.annotator_username.label("username"),
+        func.count().label("translations"), literal(0).label("recordings")
+    ).join(sentence, sentence.id == translation.src_sentence_id).where(
+        sentence.project_id == project_id).group_by(sentence.project_id, translation.annotator_username)
+    annotator_recordings = select(
+        sentence.project_id, recording.annotator_username.label("username"),
+        literal(0).label("translations"), func.count().label("recordings")
+    ).join(sentence, sentence.id == recording.src_sentence_id).where(
+        sentence.project_id == project_id).group_by(sentence.project_id, recording.annotator_username)
+    annotators = annotator_translations.union_all(annotator_recordings).subquery()
+
+    return [
+        delete(models.ProjectStats).where(models.ProjectStats.project_id == project_id),
+        delete(models.ProjectLanguageStats).where(
+            models.ProjectLanguageStats.project_id == project_id),
+        delete(models.ProjectAnnotatorStats).where(
+            models.ProjectAnnotatorStats.project_id == project_id),
+        insert(models.ProjectStats).from_select(
+            ["project_id", "total_sentences"],
+            select(literal(project_id), func.count()).select_from(sentence).where(
+                sentence.project_id == project_id)
+        ),
+        insert(models.ProjectLanguageStats).from_select(
+            ["project_id", "language_iso", *LANGUAGE_COUNTERS],
+            select(
+                languages.c.project_id, languages.c.language_iso,
+                *[func.sum(languages.c[column]) for column in LANGUAGE_COUNTERS]
+            ).group_by(languages.c.project_id, languages.c.language_iso)
+        ),
+        insert(models.ProjectAnnotatorStats).from_select(
+            ["project_id", "username", *ANNOTATOR_COUNTERS],
+            select(
+                annotators.c.project_id, annotators.c.username,
+                *[func.sum(annotators.c[column]) for column in ANNOTATOR_COUNTERS]
+            ).group_by(annotators.c.project_id, annotators.c.username)
+        ),
+    ]
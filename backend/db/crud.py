@@ -1,12 +1,25 @@
-from sqlalchemy.orm import Session
-from . import models, schemas
+from sqlalchemy import REAL, and_, case, cast, delete, exists, func, insert, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import timedelta
+from sqlalchemy.orm import Session, selectinload
+from typing import Optional
+from . import models, schemas, counters, dedupe, row_cache
 from ..utils import hash_password
+from ..cache import MISSING, membership_cache, revoke_principal, token_version_cache
+from ..translation_memory import translation_memory
+from ..events import feed
+
+
+def _execute_all(db: Session, statements):
+    for statement in statements:
+        db.execute(statement)
 
 
 # User CRUD Operations
 
-def create_user(db: Session, user: schemas.UserCreate):
-    hashed_password = hash_password(user.password)
+def create_user(db: Session, user: schemas.UserCreate, hashed_password: Optional[str] = None):
+    if hashed_password is None:
+        hashed_password = hash_password(user.password)
     db_user = models.User(
         username=user.username, email=user.email,
         gender=user.gender, age=user.age,
@@ -19,41 +32,130 @@ def create_user(db: Session, user: schemas.UserCreate):
     return db_user
 
 
-def update_user(db: Session, username: str, user: schemas.UserUpdate):
+def create_users(db: Session, users: list[schemas.UserCreate], hashed_passwords: list[str]):
+    # Hashes are computed by the caller, on the bounded password executor
+    if not users:
+        return []
+
+    # Single multi-row INSERT ... RETURNING, committed as one unit
+    try:
+        db_users = db.execute(
+            insert(models.User).returning(
+                models.User.username, models.User.email,
+                models.User.gender, models.User.age, models.User.is_admin,
+                sort_by_parameter_order=True
+            ),
+            [
+                {
+                    **user.model_dump(exclude={"password"}),
+                    "hashed_password": hashed_password
+                }
+                for user, hashed_password in zip(users, hashed_passwords, strict=True)
+            ]
+        ).all()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return db_users
+
+
+def update_user(db: Session, username: str, user: schemas.UserUpdate, hashed_password: Optional[str] = None):
+    # A new password arrives already hashed as `hashed_password`
     db_user = get_user(db=db, username=username)
     if db_user:
-        for attr, value in user.model_dump().items():
+        was_admin = db_user.is_admin
+        for attr, value in user.model_dump(exclude={"password"}).items():
             if value is not None:
                 setattr(db_user, attr, value)
+        if hashed_password is not None:
+            db_user.hashed_password = hashed_password
+        # Tokens issued before a demotion or password change stop working
+        if hashed_password is not None or db_user.is_admin != was_admin:
+            db_user.token_version = models.User.token_version + 1
+        _execute_all(db, counters.member_version_bump(username))
         db.commit()
         db.refresh(db_user)
+        row_cache.invalidate(models.User, username, db_user.username)
+        # Tokens issued before this change no longer reflect the user
+        revoke_principal(username)
+        revoke_principal(db_user.username)
     else:
         raise ValueError(f"User `{username}` does not exist.")
 
     return db_user
 
 
+def update_user_password_hash(db: Session, username: str, hashed_password: str):
+    # Transparent rehash; the password itself is unchanged
+    db.query(models.User).filter(models.User.username == username).update(
+        {models.User.hashed_password: hashed_password})
+    db.commit()
+
+
 def delete_user(db: Session, username: str):
     db_user = get_user(db=db, username=username)
     if db_user:
+        _execute_all(db, counters.member_version_bump(username))
         db.delete(db_user)
         db.commit()
+        row_cache.invalidate(models.User, username)
+        membership_cache.delete_where(lambda key: key[0] == username)
+        revoke_principal(username)
     else:
         raise ValueError(f"User `{username}` does not exist.")
 
     return db_user
 
 
-def get_user(db: Session, username: str):
-    return db.query(models.User).filter(models.User.username == username).first()
+def get_user(db: Session, username: str, use_cache: bool = True):
+    # Login passes use_cache=False to always check the current password hash
+    if use_cache:
+        cached = row_cache.get(models.User, username)
+        if cached is not MISSING:
+            return db.merge(cached, load=False)
+
+    return row_cache.store(models.User, username, db.query(models.User).filter(models.User.username == username).first())
+
+
+def get_token_version(db: Session, username: str):
+    # None once the user is deleted; shared by every worker through the database
+    version = token_version_cache.get(username)
+    if version is MISSING:
+        version = db.scalar(select(models.User.token_version).where(models.User.username == username))
+        token_version_cache.set(username, version)
+
+    return version
+
+
+def get_user_rows(db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None):
+    # Column projection matching schemas.User, returned as mappings
+    query = select(
+        models.User.username, models.User.email, models.User.gender,
+        models.User.age, models.User.is_admin
+    ).order_by(models.User.username)
+    if after is not None:
+        query = query.where(models.User.username > after)
+    else:
+        query = query.offset(skip)
+
+    return db.execute(query.limit(limit)).mappings().all()
 
 
 def get_user_by_email(db: Session, email: str):
     return db.query(models.User).filter(models.User.email == email).first()
 
 
-def get_users(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.User).offset(skip).limit(limit).all()
+def get_users(db: Session, skip: int = 0, limit: int = 100, after: Optional[str] = None):
+    query = db.query(models.User).order_by(models.User.username)
+    if after is not None:
+        # Keyset pagination: seek past the last username seen
+        query = query.filter(models.User.username > after)
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit).all()
 
 
 # Project CRUD Operations
@@ -72,101 +174,417 @@ def delete_project(db: Session, project_id: int):
     if db_project:
         db.delete(db_project)
         db.commit()
+        row_cache.invalidate(models.Project, project_id)
+        membership_cache.delete_where(lambda key: key[1] == project_id)
+        translation_memory.drop_project(project_id)
+        feed.publish(project_id, "project.deleted", [project_id])
     else:
         raise ValueError(f"No such project with id `{project_id}`.")
 
     return db_project
 
 
-def get_project(db: Session, project_id: int):
-    return db.query(models.Project).filter(models.Project.id == project_id).first()
+def get_project(db: Session, project_id: int, include_annotators: bool = False):
+    query = db.query(models.Project).filter(models.Project.id == project_id)
+    if include_annotators:
+        # One extra IN query instead of a lazy load on first access
+        return query.options(selectinload(models.Project.annotators)).first()
+
+    cached = row_cache.get(models.Project, project_id)
+    if cached is not MISSING:
+        return db.merge(cached, load=False)
+
+    return row_cache.store(models.Project, project_id, query.first())
+
+
+def get_project_version(db: Session, project_id: int):
+    # None when the project does not exist
+    return db.scalar(select(models.Project.version).where(models.Project.id == project_id))
 
 
 def get_project_by_name(db: Session, project_name: str):
     return db.query(models.Project).filter(models.Project.name == project_name).first()
 
 
-def get_projects(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Project).offset(skip).limit(limit).all()
+def _member_projects(username: str):
+    return select(models.Role.project_id).where(models.Role.username == username)
+
+
+def get_projects(db: Session, skip: int = 0, limit: int = 100, after: Optional[int] = None,
+                 username: Optional[str] = None, include_annotators: bool = False):
+    query = db.query(models.Project).order_by(models.Project.id)
+    if username is not None:
+        query = query.filter(models.Project.id.in_(_member_projects(username)))
+    if include_annotators:
+        # Annotators for the whole page in one IN query, not one per project
+        query = query.options(selectinload(models.Project.annotators))
+    if after is not None:
+        query = query.filter(models.Project.id > after)
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit).all()
+
+
+def get_project_rows(db: Session, skip: int = 0, limit: int = 100, after: Optional[int] = None,
+                     username: Optional[str] = None):
+    # Column projection matching schemas.ProjectSummary, returned as mappings
+    query = select(
+        models.Project.id, models.Project.name, models.Project.p_type
+    ).order_by(models.Project.id)
+    if username is not None:
+        query = query.where(models.Project.id.in_(_member_projects(username)))
+    if after is not None:
+        query = query.where(models.Project.id > after)
+    else:
+        query = query.offset(skip)
+
+    return db.execute(query.limit(limit)).mappings().all()
 
 
 # Sentence CRUD Operations
 
 def create_sentence(db: Session, sentence: schemas.SentenceCreate, project_id: int):
     db_sentence = models.Sentence(
-        **sentence.model_dump(), project_id=project_id)
+        **sentence.model_dump(), project_id=project_id,
+        content_hash=dedupe.content_hash(sentence.text))
     db.add(db_sentence)
+    _execute_all(db, counters.sentence_counters(project_id, 1))
+    _execute_all(db, counters.version_bump([project_id]))
     db.commit()
     db.refresh(db_sentence)
+    feed.publish(project_id, "sentences.created", [db_sentence.id])
 
     return db_sentence
 
 
+def create_sentences(db: Session, sentences: list[schemas.SentenceCreate], project_id: int, on_duplicate: str = "existing"):
+    """Inserts a batch of sentences in one transaction, deduplicating set-wise.
+
+    `on_duplicate` decides what happens to sentences whose normalized text
+    already exists in the project (or earlier in the batch): "reject" raises
+    `dedupe.DuplicateSentenceError`, "skip" leaves them out of the result and
+    "existing" returns the stored sentence in their place.
+    """
+    if not sentences:
+        return []
+
+    values = [
+        {**sentence.model_dump(), "project_id": project_id,
+         "content_hash": dedupe.content_hash(sentence.text)}
+        for sentence in sentences
+    ]
+
+    try:
+        existing = {
+            (row.language_iso, row.content_hash): row
+            for row in db.execute(dedupe.existing_query(
+                project_id, {(value["language_iso"], value["content_hash"]) for value in values}))
+        }
+        new_values, slots = dedupe.plan_batch(values, existing, on_duplicate)
+
+        # Single multi-row INSERT ... RETURNING, committed as one unit
+        db_sentences = []
+        if new_values:
+            db_sentences = db.execute(
+                insert(models.Sentence).returning(
+                    models.Sentence.id, models.Sentence.text,
+                    models.Sentence.language_iso, models.Sentence.project_id,
+                    sort_by_parameter_order=True
+                ),
+                new_values
+            ).all()
+            _execute_all(db, counters.sentence_counters(
+                project_id, len(db_sentences)))
+            _execute_all(db, counters.version_bump([project_id]))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if db_sentences:
+        feed.publish(project_id, "sentences.created", [db_sentence.id for db_sentence in db_sentences])
+
+    return dedupe.assemble(slots, db_sentences, on_duplicate)
+
+
 def delete_sentence(db: Session, sentence_id: int):
     db_sentence = get_sentence(db=db, sentence_id=sentence_id)
     if db_sentence:
         db.delete(db_sentence)
+        _execute_all(db, counters.sentence_counters(
+            db_sentence.project_id, -1))
+        _execute_all(db, counters.version_bump([db_sentence.project_id]))
         db.commit()
+        row_cache.invalidate(models.Sentence, sentence_id)
+        feed.publish(db_sentence.project_id, "sentences.deleted", [sentence_id])
     else:
         raise ValueError(f"No such sentence with id `{sentence_id}`.")
 
     return db_sentence
 
 
+def purge_project_sentences(db: Session, project_id: int, batch_size: int = 1000,
+                            duplicates: bool = False, before: Optional[int] = None):
+    """Deletes up to `batch_size` of a project's sentences with everything
+    attached to them, in one transaction; returns the deleted ids, newest first.
+
+    Flagged duplicates (`duplicates=True`) must all be purged first, since
+    they reference canonical sentences. Pass the last returned id as `before`
+    to continue from there instead of rescanning deleted index entries. Only
+    the sentence counter is maintained; the per-language and per-annotator
+    ones are dropped with the project.
+    """
+    query = select(models.Sentence.id).where(models.Sentence.project_id == project_id).where(
+        models.Sentence.duplicate_of_id.isnot(None) if duplicates else models.Sentence.duplicate_of_id.is_(None))
+    if before is not None:
+        query = query.where(models.Sentence.id < before)
+
+    try:
+        sentence_ids = db.scalars(query.order_by(models.Sentence.id.desc()).limit(batch_size)).all()
+        if not sentence_ids:
+            db.rollback()
+            return []
+
+        db.execute(delete(models.TaskLease).where(models.TaskLease.sentence_id.in_(sentence_ids)))
+        db.execute(delete(models.Translation).where(models.Translation.src_sentence_id.in_(sentence_ids)))
+        db.execute(delete(models.Recording).where(models.Recording.src_sentence_id.in_(sentence_ids)))
+        db.execute(delete(models.Sentence).where(models.Sentence.id.in_(sentence_ids)))
+        _execute_all(db, counters.sentence_counters(project_id, -len(sentence_ids)))
+        _execute_all(db, counters.version_bump([project_id]))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    row_cache.invalidate(models.Sentence, *sentence_ids)
+    feed.publish(project_id, "sentences.deleted", sentence_ids)
+
+    return sentence_ids
+
+
 def get_sentence(db: Session, sentence_id: int):
-    return db.query(models.Sentence).filter(models.Sentence.id == sentence_id).first()
+    cached = row_cache.get(models.Sentence, sentence_id)
+    if cached is not MISSING:
+        return db.merge(cached, load=False)
+
+    return row_cache.store(models.Sentence, sentence_id, db.query(models.Sentence).filter(models.Sentence.id == sentence_id).first())
 
 
 def get_project_sentence(db: Session, project_id: int, src_sentence_id: int):
-    return db.query(models.Sentence).filter(models.Sentence.project_id == project_id).filter(models.Sentence.id == src_sentence_id).first()
+    # Primary-key lookup, so it shares get_sentence's cache entry
+    db_sentence = get_sentence(db=db, sentence_id=src_sentence_id)
+
+    return db_sentence if db_sentence is not None and db_sentence.project_id == project_id else None
+
+
+def get_sentences(db: Session, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+    query = db.query(models.Sentence).order_by(models.Sentence.id)
+    if after is not None:
+        query = query.filter(models.Sentence.id > after)
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit).all()
+
 
+def get_project_sentences(db: Session, project_id: int, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+    # Keyed on (project_id, id)
+    query = db.query(models.Sentence).filter(
+        models.Sentence.project_id == project_id).order_by(models.Sentence.id)
+    if after is not None:
+        query = query.filter(models.Sentence.id > after)
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit).all()
+
+
+def get_project_sentence_rows(db: Session, project_id: int, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+    # Column projection matching schemas.Sentence, returned as mappings
+    query = select(
+        models.Sentence.id, models.Sentence.text,
+        models.Sentence.language_iso, models.Sentence.project_id
+    ).where(models.Sentence.project_id == project_id).order_by(models.Sentence.id)
+    if after is not None:
+        query = query.where(models.Sentence.id > after)
+    else:
+        query = query.offset(skip)
+
+    return db.execute(query.limit(limit)).mappings().all()
+
+
+def get_project_sentence_ids(db: Session, project_id: int, sentence_ids):
+    # Which of `sentence_ids` belong to the project, in one query
+    return set(db.scalars(select(models.Sentence.id).where(models.Sentence.project_id == project_id).where(
+        models.Sentence.id.in_(set(sentence_ids)))).all())
 
-def get_sentences(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Sentence).offset(skip).limit(limit).all()
 
+def iter_project_corpus(db: Session, project_id: int, language_iso: Optional[str] = None, batch_size: int = 1000):
+    """Yields (sentence, translations, recordings) for a project, in sentence id order.
 
-def get_project_sentences(db: Session, project_id: int, skip: int = 0, limit: int = 100):
-    return db.query(models.Sentence).filter(models.Sentence.project_id == project_id).offset(skip).limit(limit).all()
+    Sentences are read through a server-side cursor in batches of `batch_size`;
+    translations and recordings are fetched per batch, so memory use does not
+    depend on project size. `language_iso` filters translations and recordings.
+    """
+    sentences = db.execute(
+        select(models.Sentence.id, models.Sentence.text, models.Sentence.language_iso)
+        .where(models.Sentence.project_id == project_id)
+        .order_by(models.Sentence.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    for batch in sentences.partitions():
+        sentence_ids = [sentence.id for sentence in batch]
+
+        translations_query = select(
+            models.Translation.src_sentence_id, models.Translation.id, models.Translation.text,
+            models.Translation.language_iso, models.Translation.annotator_username
+        ).where(models.Translation.src_sentence_id.in_(sentence_ids)).order_by(models.Translation.id)
+        recordings_query = select(
+            models.Recording.src_sentence_id, models.Recording.id, models.Recording.audio_file_path,
+            models.Recording.language_iso, models.Recording.annotator_username
+        ).where(models.Recording.src_sentence_id.in_(sentence_ids)).order_by(models.Recording.id)
+        if language_iso is not None:
+            translations_query = translations_query.where(
+                models.Translation.language_iso == language_iso)
+            recordings_query = recordings_query.where(
+                models.Recording.language_iso == language_iso)
+
+        translations = {sentence_id: [] for sentence_id in sentence_ids}
+        for translation in db.execute(translations_query):
+            translations[translation.src_sentence_id].append(translation)
+        recordings = {sentence_id: [] for sentence_id in sentence_ids}
+        for recording in db.execute(recordings_query):
+            recordings[recording.src_sentence_id].append(recording)
+
+        for sentence in batch:
+            yield sentence, translations[sentence.id], recordings[sentence.id]
 
 
 # Translation CRUD Operations
 
 def create_translation(db: Session, src_sentence_id: int, translation: schemas.TranslationCreate):
+    projects = _count_translations(db, [(src_sentence_id, translation)])
     db_translation = models.Translation(
         **translation.model_dump(), src_sentence_id=src_sentence_id)
     db.add(db_translation)
+    release_task_leases(db=db, task_type="translation", keys=[
+                        (src_sentence_id, translation.language_iso)])
     db.commit()
     db.refresh(db_translation)
+    translation_memory.notify_translated(
+        projects[src_sentence_id], [(src_sentence_id, translation.language_iso)])
+    feed.publish(projects[src_sentence_id], "translations.created", [(src_sentence_id, db_translation.id)])
 
     return db_translation
 
 
+def create_translations(db: Session, translations: list[tuple[int, schemas.TranslationCreate]]):
+    # `translations` holds (src_sentence_id, translation) pairs
+    if not translations:
+        return []
+
+    try:
+        projects = _count_translations(db, translations)
+        db_translations = db.execute(
+            insert(models.Translation).returning(
+                models.Translation.id, models.Translation.text,
+                models.Translation.language_iso, models.Translation.src_sentence_id,
+                models.Translation.annotator_username,
+                sort_by_parameter_order=True
+            ),
+            [{**translation.model_dump(), "src_sentence_id": src_sentence_id}
+             for src_sentence_id, translation in translations]
+        ).all()
+        release_task_leases(db=db, task_type="translation", keys=[
+                            (src_sentence_id, translation.language_iso) for src_sentence_id, translation in translations])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    for project_id in set(projects.values()):
+        translation_memory.notify_translated(project_id, [
+            (src_sentence_id, translation.language_iso) for src_sentence_id, translation in translations
+            if projects[src_sentence_id] == project_id])
+        feed.publish(project_id, "translations.created", [
+            (db_translation.src_sentence_id, db_translation.id) for db_translation in db_translations
+            if projects[db_translation.src_sentence_id] == project_id])
+
+    return db_translations
+
+
 def delete_translation(db: Session, translation_id: int):
-    db_translation = get_translation(db=db, translation_id=translation_id)
+    db_translation = db.get(models.Translation, translation_id)
     if db_translation:
         db.delete(db_translation)
+        db.flush()
+        project_id = db.scalar(select(models.Sentence.project_id).where(
+            models.Sentence.id == db_translation.src_sentence_id))
+        still_translated = db.scalar(select(exists().where(
+            models.Translation.src_sentence_id == db_translation.src_sentence_id).where(
+            models.Translation.language_iso == db_translation.language_iso)))
+        _execute_all(db, counters.translation_removal_counters(
+            project_id, db_translation.language_iso, db_translation.annotator_username, still_translated))
+        _execute_all(db, counters.version_bump([project_id]))
         db.commit()
+        feed.publish(project_id, "translations.deleted", [(db_translation.src_sentence_id, translation_id)])
     else:
         raise ValueError(f"No such translation with id `{translation_id}`.")
 
     return db_translation
 
 
+def _count_translations(db: Session, translations: list[tuple[int, schemas.TranslationCreate]]):
+    # Must run before the rows are inserted: a sentence only counts as newly
+    # translated if it had no translation in that language yet
+    keys = [(src_sentence_id, translation.language_iso)
+            for src_sentence_id, translation in translations]
+    projects_query, translated_query = counters.translation_context(keys)
+    projects = dict(db.execute(projects_query).all())
+    translated = set(db.execute(translated_query).all())
+
+    _execute_all(db, counters.translation_counters(
+        [(src_sentence_id, translation.language_iso, translation.annotator_username)
+         for src_sentence_id, translation in translations],
+        projects, translated
+    ))
+    _execute_all(db, counters.version_bump(projects.values()))
+
+    return projects
+
+
 def get_translation(db: Session, src_sentence_id: int, translation_id: int):
     return db.query(models.Translation).filter(models.Translation.src_sentence_id == src_sentence_id).filter(models.Translation.id == translation_id).first()
 
 
-def get_translations(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Translation).offset(skip).limit(limit).all()
+def get_translations(db: Session, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+    query = db.query(models.Translation).order_by(models.Translation.id)
+    if after is not None:
+        query = query.filter(models.Translation.id > after)
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit).all()
 
 
 # Recording CRUD Operations
 
-def create_recording(db: Session, recording: schemas.RecordingCreate):
-    db_recording = models.Recording(**recording.model_dump())
+def create_recording(db: Session, src_sentence_id: int, recording: schemas.RecordingCreate):
+    db_recording = models.Recording(
+        **recording.model_dump(), src_sentence_id=src_sentence_id)
     db.add(db_recording)
+    project_id = db.scalar(select(models.Sentence.project_id).where(
+        models.Sentence.id == src_sentence_id))
+    _execute_all(db, counters.recording_counters(
+        project_id, recording.language_iso, recording.annotator_username, 1))
+    _execute_all(db, counters.version_bump([project_id]))
+    release_task_leases(db=db, task_type="recording", keys=[
+                        (src_sentence_id, recording.language_iso)])
     db.commit()
     db.refresh(db_recording)
+    feed.publish(project_id, "recordings.created", [(src_sentence_id, db_recording.id)])
 
     return db_recording
 
@@ -175,7 +593,13 @@ def delete_recording(db: Session, recording_id: int):
     db_recording = get_recording(db=db, recording_id=recording_id)
     if db_recording:
         db.delete(db_recording)
+        project_id = db.scalar(select(models.Sentence.project_id).where(
+            models.Sentence.id == db_recording.src_sentence_id))
+        _execute_all(db, counters.recording_counters(
+            project_id, db_recording.language_iso, db_recording.annotator_username, -1))
+        _execute_all(db, counters.version_bump([project_id]))
         db.commit()
+        feed.publish(project_id, "recordings.deleted", [(db_recording.src_sentence_id, recording_id)])
     else:
         raise ValueError(f"No such recording with id `{recording_id}`.")
 
@@ -186,8 +610,14 @@ def get_recording(db: Session, recording_id: int):
     return db.query(models.Recording).filter(models.Recording.id == recording_id).first()
 
 
-def get_recordings(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Recording).offset(skip).limit(limit).all()
+def get_recordings(db: Session, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+    query = db.query(models.Recording).order_by(models.Recording.id)
+    if after is not None:
+        query = query.filter(models.Recording.id > after)
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit).all()
 
 
 # Role CRUD Operations
@@ -195,17 +625,48 @@ def get_recordings(db: Session, skip: int = 0, limit: int = 100):
 def create_role(db: Session, role: schemas.RoleCreate):
     db_role = models.Role(**role.model_dump())
     db.add(db_role)
+    _execute_all(db, counters.version_bump([role.project_id]))
     db.commit()
     db.refresh(db_role)
+    membership_cache.delete((db_role.username, db_role.project_id))
 
     return db_role
 
 
+def create_roles(db: Session, roles: list[schemas.RoleCreate]):
+    if not roles:
+        return []
+
+    try:
+        db_roles = db.execute(
+            insert(models.Role).returning(
+                models.Role.id, models.Role.username,
+                models.Role.project_id, models.Role.role,
+                sort_by_parameter_order=True
+            ),
+            [role.model_dump() for role in roles]
+        ).all()
+        _execute_all(db, counters.version_bump(
+            db_role.project_id for db_role in db_roles))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    for db_role in db_roles:
+        membership_cache.delete((db_role.username, db_role.project_id))
+
+    return db_roles
+
+
 def delete_role(db: Session, role_id: int):
     db_role = get_role(db=db, role_id=role_id)
     if db_role:
+        key = (db_role.username, db_role.project_id)
         db.delete(db_role)
+        _execute_all(db, counters.version_bump([db_role.project_id]))
         db.commit()
+        membership_cache.delete(key)
     else:
         raise ValueError(f"No such role with id `{role_id}`.")
 
@@ -216,5 +677,341 @@ def get_role(db: Session, role_id: int):
     return db.query(models.Role).filter(models.Role.id == role_id).first()
 
 
-def get_roles(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Role).offset(skip).limit(limit).all()
+def get_roles(db: Session, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+    query = db.query(models.Role).order_by(models.Role.id)
+    if after is not None:
+        query = query.filter(models.Role.id > after)
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit).all()
+
+
+def get_project_role(db: Session, username: str, project_id: int):
+    # Single probe of the unique (username, project_id) index, cached per pair
+    key = (username, project_id)
+    role = membership_cache.get(key)
+    if role is MISSING:
+        role = db.query(models.Role.role).filter(models.Role.username == username).filter(
+            models.Role.project_id == project_id).scalar()
+        membership_cache.set(key, role)
+
+    return role
+
+
+# Task lease Operations
+
+def lease_next_sentences(db: Session, project_id: int, username: str, language_iso: str, task_type: str, count: int, lease_seconds: int):
+    """Leases up to `count` sentences still missing a `task_type` in `language_iso`.
+
+    Candidate rows are locked with FOR UPDATE SKIP LOCKED, so concurrent
+    checkouts never wait on each other or receive the same sentence. Leases
+    already held by `username` are handed out again and renewed.
+    """
+    done_model = models.Translation if task_type == "translation" else models.Recording
+    done = exists().where(done_model.src_sentence_id == models.Sentence.id).where(
+        done_model.language_iso == language_iso)
+    leased = exists().where(models.TaskLease.sentence_id == models.Sentence.id).where(
+        models.TaskLease.language_iso == language_iso).where(
+        models.TaskLease.task_type == task_type).where(
+        models.TaskLease.expires_at > func.now()).where(
+        models.TaskLease.username != username)
+
+    query = select(models.Sentence.id, models.Sentence.text, models.Sentence.language_iso, models.Sentence.project_id).where(
+        models.Sentence.project_id == project_id).where(~done).where(~leased)
+    if task_type == "translation":
+        # Nothing to translate into the sentence's own language
+        query = query.where(models.Sentence.language_iso != language_iso)
+
+    try:
+        sentences = db.execute(
+            query.order_by(models.Sentence.id).limit(count)
+            .with_for_update(of=models.Sentence, skip_locked=True)
+        ).all()
+
+        if not sentences:
+            db.rollback()
+            return []
+
+        expires_at = func.now() + timedelta(seconds=lease_seconds)
+        stmt = pg_insert(models.TaskLease).values([
+            {
+                "sentence_id": sentence.id, "language_iso": language_iso, "task_type": task_type,
+                "username": username, "expires_at": expires_at
+            }
+            for sentence in sentences
+        ])
+        # Take over expired (or our own) leases on the same unit of work. The
+        # candidate scan may predate a lease another checkout just committed;
+        # the conflict check sees it, and the row is left out of RETURNING.
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_task_leases_sentence_id_language_iso_task_type",
+            set_={"username": stmt.excluded.username,
+                  "expires_at": stmt.excluded.expires_at},
+            where=(models.TaskLease.expires_at <= func.now()) | (
+                models.TaskLease.username == stmt.excluded.username)
+        ).returning(models.TaskLease.id, models.TaskLease.sentence_id, models.TaskLease.expires_at)
+        leases = {lease.sentence_id: lease for lease in db.execute(stmt)}
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return [
+        {
+            "id": leases[sentence.id].id, "sentence": sentence, "language_iso": language_iso,
+            "task_type": task_type, "expires_at": leases[sentence.id].expires_at
+        }
+        for sentence in sentences if sentence.id in leases
+    ]
+
+
+def release_task_leases(db: Session, task_type: str, keys: list[tuple[int, str]]):
+    # Work submitted for (sentence_id, language_iso): its lease is done.
+    # Runs inside the caller's transaction.
+    if keys:
+        db.execute(delete(models.TaskLease).where(models.TaskLease.task_type == task_type).where(
+            tuple_(models.TaskLease.sentence_id, models.TaskLease.language_iso).in_(keys)))
+
+
+def delete_task_lease(db: Session, lease_id: int, username: str):
+    deleted = db.execute(delete(models.TaskLease).where(models.TaskLease.id == lease_id).where(
+        models.TaskLease.username == username)).rowcount
+    db.commit()
+
+    if not deleted:
+        raise ValueError(f"No such task lease with id `{lease_id}`.")
+
+
+# Project statistics
+
+def get_project_stats(db: Session, project_id: int):
+    total_sentences = db.scalar(select(models.ProjectStats.total_sentences).where(
+        models.ProjectStats.project_id == project_id))
+    languages = db.query(models.ProjectLanguageStats).filter(
+        models.ProjectLanguageStats.project_id == project_id).order_by(models.ProjectLanguageStats.language_iso).all()
+    annotators = db.query(models.ProjectAnnotatorStats).filter(
+        models.ProjectAnnotatorStats.project_id == project_id).order_by(models.ProjectAnnotatorStats.username).all()
+
+    return {
+        "project_id": project_id,
+        "total_sentences": total_sentences or 0,
+        "languages": languages,
+        "annotators": annotators
+    }
+
+
+def rebuild_project_stats(db: Session, project_id: int):
+    try:
+        _execute_all(db, counters.rebuild_statements(project_id))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+# Search
+
+def search_project(db: Session, project_id: int, q: str, target: str = "sentences", language_iso: Optional[str] = None, limit: int = 20, after: Optional[list] = None):
+    """Ranked full-text search over a project's sentences or translations.
+
+    Results are ordered by (rank desc, id) and keyset-paginated on that pair:
+    `after` is the [rank, id] of the last hit of the previous page.
+    """
+    query = func.websearch_to_tsquery(models.FTS_CONFIG, q)
+
+    if target == "sentences":
+        model = models.Sentence
+        document = models.fts_document(model.text)
+        hits = select(
+            model.id, model.id.label("sentence_id"), model.language_iso, model.text,
+            func.ts_rank_cd(document, query).label("rank")
+        ).where(model.project_id == project_id)
+    else:
+        model = models.Translation
+        document = models.fts_document(model.text)
+        hits = select(
+            model.id, model.src_sentence_id.label("sentence_id"), model.language_iso, model.text,
+            func.ts_rank_cd(document, query).label("rank")
+        ).join(models.Sentence, models.Sentence.id == model.src_sentence_id).where(
+            models.Sentence.project_id == project_id)
+
+    hits = hits.where(document.op("@@")(query))
+    if language_iso is not None:
+        hits = hits.where(model.language_iso == language_iso)
+    hits = hits.subquery()
+
+    page = select(hits)
+    if after is not None:
+        last_rank, last_id = after
+        # ts_rank_cd is float4; compared as float8 the cursor's rank would
+        # never equal the row it came from
+        last_rank = cast(last_rank, REAL)
+        page = page.where(or_(hits.c.rank < last_rank, and_(
+            hits.c.rank == last_rank, hits.c.id > last_id)))
+    page = page.order_by(hits.c.rank.desc(), hits.c.id).limit(limit).subquery()
+
+    # Headlines are costly, so only build them for the returned page
+    return db.execute(
+        select(
+            page.c.id, page.c.sentence_id, page.c.language_iso, page.c.text, page.c.rank,
+            func.ts_headline(models.FTS_CONFIG, page.c.text, query,
+                             "StartSel=<mark>, StopSel=</mark>, MaxFragments=2").label("snippet")
+        ).order_by(page.c.rank.desc(), page.c.id)
+    ).all()
+
+
+# Job Operations
+
+def create_job(db: Session, kind: str, username: str, project_id: Optional[int] = None,
+               payload: Optional[dict] = None, total: Optional[int] = None):
+    db_job = models.Job(kind=kind, username=username, project_id=project_id,
+                        payload=payload or {}, total=total)
+    db.add(db_job)
+    db.commit()
+    db.refresh(db_job)
+
+    return db_job
+
+
+def get_job(db: Session, job_id: int):
+    # Never cached: workers update the row out of process
+    return db.get(models.Job, job_id)
+
+
+def get_jobs(db: Session, skip: int = 0, limit: int = 100, after: Optional[int] = None,
+             username: Optional[str] = None, status: Optional[str] = None):
+    query = db.query(models.Job).order_by(models.Job.id)
+    if username is not None:
+        query = query.filter(models.Job.username == username)
+    if status is not None:
+        query = query.filter(models.Job.status == status)
+    if after is not None:
+        query = query.filter(models.Job.id > after)
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit).all()
+
+
+def cancel_job(db: Session, job_id: int):
+    """Cancels a queued job outright; a running one is flagged and stops at
+    its worker's next checkpoint or heartbeat. Finished jobs are unchanged."""
+    db_job = db.get(models.Job, job_id, with_for_update=True)
+    if db_job is None:
+        db.rollback()
+        raise ValueError(f"No such job with id `{job_id}`.")
+
+    if db_job.status == "queued":
+        db_job.status = "cancelled"
+        db_job.finished_at = func.now()
+    elif db_job.status == "running":
+        db_job.cancel_requested = True
+    db.commit()
+    db.refresh(db_job)
+
+    return db_job
+
+
+def claim_job(db: Session, worker_id: str):
+    """Claims the oldest queued job for `worker_id`, or returns None.
+
+    The row is locked with FOR UPDATE SKIP LOCKED, so concurrent workers
+    never wait on each other or claim the same job.
+    """
+    try:
+        db_job = db.scalars(
+            select(models.Job).where(models.Job.status == "queued")
+            .order_by(models.Job.id).limit(1).with_for_update(skip_locked=True)
+        ).first()
+        if db_job is None:
+            db.rollback()
+            return None
+
+        db_job.status = "running"
+        db_job.worker_id = worker_id
+        db_job.attempts = models.Job.attempts + 1
+        db_job.heartbeat_at = func.now()
+        db_job.started_at = func.now()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    db.refresh(db_job)
+
+    return db_job
+
+
+def _update_claimed_job(db: Session, job_id: int, worker_id: str, values: dict):
+    # Returns None once the job is no longer held by `worker_id` (reaped,
+    # finished elsewhere), else whether cancellation was requested
+    cancel_requested = db.scalar(
+        update(models.Job).where(models.Job.id == job_id).where(
+            models.Job.worker_id == worker_id).where(models.Job.status == "running")
+        .values(heartbeat_at=func.now(), **values).returning(models.Job.cancel_requested)
+    )
+    db.commit()
+
+    return cancel_requested
+
+
+def heartbeat_job(db: Session, job_id: int, worker_id: str):
+    return _update_claimed_job(db, job_id, worker_id, {})
+
+
+def checkpoint_job(db: Session, job_id: int, worker_id: str, progress: int,
+                   total: Optional[int] = None, state: Optional[dict] = None):
+    # `state` is kept in `result` until the job finishes; a resumed attempt
+    # picks it up from there
+    values = {"progress": progress}
+    if total is not None:
+        values["total"] = total
+    if state is not None:
+        values["result"] = state
+
+    return _update_claimed_job(db, job_id, worker_id, values)
+
+
+def finish_job(db: Session, job_id: int, worker_id: str, status: str,
+               result: Optional[dict] = None, error: Optional[str] = None):
+    values = {"status": status, "error": error, "finished_at": func.now()}
+    if result is not None:
+        values["result"] = result
+
+    return _update_claimed_job(db, job_id, worker_id, values) is not None
+
+
+def release_job(db: Session, job_id: int, worker_id: str):
+    # Worker shutting down mid-job: requeue without spending an attempt
+    return _update_claimed_job(db, job_id, worker_id, {
+        "status": "queued", "worker_id": None, "attempts": models.Job.attempts - 1}) is not None
+
+
+def reap_orphaned_jobs(db: Session, heartbeat_timeout: float, max_attempts: int):
+    """Recovers running jobs whose worker stopped sending heartbeats.
+
+    They are requeued to resume from their last checkpoint, cancelled if
+    cancellation was requested, or failed once `max_attempts` attempts have
+    been made. Safe to run from every worker at once. Returns (id, status)
+    pairs.
+    """
+    cancelled = models.Job.cancel_requested
+    exhausted = and_(~cancelled, models.Job.attempts >= max_attempts)
+    try:
+        reaped = db.execute(
+            update(models.Job).where(models.Job.status == "running").where(
+                models.Job.heartbeat_at < func.now() - timedelta(seconds=heartbeat_timeout))
+            .values(
+                status=case((cancelled, "cancelled"), (exhausted, "failed"), else_="queued"),
+                error=case((exhausted, f"Worker stopped responding; gave up after {max_attempts} attempts."),
+                           else_=models.Job.error),
+                finished_at=case((or_(cancelled, exhausted), func.now()), else_=None),
+                worker_id=None
+            ).returning(models.Job.id, models.Job.status)
+        ).all()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return reaped
@@ -1,16 +1,32 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from urllib.parse import quote_plus
 from ..config import Settings
+from .pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 
 settings = Settings()
 db_password = quote_plus(settings.db_password)
 DB_URL = f"postgresql://{settings.db_username}:{db_password}@{settings.db_hostname}:{settings.db_port}/{settings.db_name}"
-engine = create_engine(DB_URL)
+pool_options = dict(
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping
+)
+engine = create_engine(DB_URL, poolclass=InstrumentedQueuePool, **pool_options)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async stack, only built when enabled so the asyncpg driver stays optional
+ASYNC_DB_URL = f"postgresql+asyncpg://{settings.db_username}:{db_password}@{settings.db_hostname}:{settings.db_port}/{settings.db_name}"
+async_engine = create_async_engine(
+    ASYNC_DB_URL, poolclass=InstrumentedAsyncQueuePool, **pool_options) if settings.async_db else None
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -21,4 +37,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close_all()
+        # Close only this request's session, returning its connection to the pool
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,82 @@
+import hashlib
+import re
+import unicodedata
+
+from sqlalchemy import select, tuple_
+
+from . import models
+
+
+# Ingest-time duplicate detection for sentences. Shared by crud.py and
+# async_crud.py; everything here is set-wise so bulk imports cost one
+# lookup query regardless of batch size.
+
+POLICIES = ("reject", "skip", "existing")
+
+_whitespace = re.compile(r"\s+")
+
+
+class DuplicateSentenceError(ValueError):
+
+    def __init__(self, positions: list[int]):
+        self.positions = positions
+        super().__init__(
+            f"Duplicate sentences at positions {positions}.")
+
+
+def normalize_text(text: str):
+    # Case, Unicode compatibility forms and whitespace runs do not make a new sentence
+    return _whitespace.sub(" ", unicodedata.normalize("NFKC", text).casefold()).strip()
+
+
+def content_hash(text: str):
+    return hashlib.sha256(normalize_text(text).encode()).hexdigest()
+
+
+def existing_query(project_id: int, keys):
+    """Canonical sentences of a project matching (language_iso, content_hash) keys."""
+    return select(
+        models.Sentence.id, models.Sentence.text, models.Sentence.language_iso,
+        models.Sentence.project_id, models.Sentence.content_hash
+    ).where(models.Sentence.project_id == project_id).where(
+        models.Sentence.duplicate_of_id.is_(None)).where(
+        tuple_(models.Sentence.language_iso, models.Sentence.content_hash).in_(keys))
+
+
+def plan_batch(values: list[dict], existing: dict, on_duplicate: str):
+    """Splits hashed sentence values into rows to insert and per-input results.
+
+    `existing` maps (language_iso, content_hash) to an already stored row.
+    Returns (rows to insert, slots) where each slot is ("new", index into
+    the rows to insert) or ("existing", stored row).
+    """
+    new_values = []
+    slots = []
+    seen = {}
+    duplicates = []
+    for position, value in enumerate(values):
+        key = (value["language_iso"], value["content_hash"])
+        if key in existing:
+            duplicates.append(position)
+            slots.append(("existing", existing[key]))
+        elif key in seen:
+            # Repeated within the batch itself
+            duplicates.append(position)
+            slots.append(("new", seen[key]))
+        else:
+            seen[key] = len(new_values)
+            slots.append(("new", len(new_values)))
+            new_values.append(value)
+
+    if duplicates and on_duplicate == "reject":
+        raise DuplicateSentenceError(duplicates)
+
+    return new_values, slots
+
+
+def assemble(slots, inserted: list, on_duplicate: str):
+    if on_duplicate == "skip":
+        return list(inserted)
+
+    # One row per input, duplicates resolved to the stored (or first) sentence
+    return [inserted[ref] if kind == "new" else ref for kind, ref in slots]
@@ -0,0 +1,174 @@
+import argparse
+import sys
+
+from sqlalchemy import func, select, text, tuple_, update
+from sqlalchemy.orm import Session
+
+from . import models, crud, dedupe
+from .database import SessionLocal
+
+
+# Query plan checks
+
+def hot_queries():
+    # Mirrors the access patterns in crud.py, each with the index it must use;
+    # tests/test_query_plans.py checks the statements crud itself builds
+    return {
+        "project_sentences": (select(models.Sentence)
+        .where(models.Sentence.project_id == 1)
+        .where(models.Sentence.id > 1)
+        .order_by(models.Sentence.id).limit(100), "ix_sentences_project_id_id"),
+        "project_sentence": (select(models.Sentence)
+        .where(models.Sentence.project_id == 1)
+        .where(models.Sentence.id == 1), "ix_sentences_project_id_id"),
+        "sentence_translation": (select(models.Translation)
+        .where(models.Translation.src_sentence_id == 1)
+        .where(models.Translation.id == 1), "ix_translations_src_sentence_id_id"),
+        "sentence_translations": (select(models.Translation)
+        .where(models.Translation.src_sentence_id == 1), "ix_translations_src_sentence_id_id"),
+        "sentence_recordings": (select(models.Recording)
+        .where(models.Recording.src_sentence_id == 1), "ix_recordings_src_sentence_id_id"),
+        "role_membership": (select(models.Role)
+        .where(models.Role.username == "annotator")
+        .where(models.Role.project_id == 1), "uq_roles_username_project_id"),
+        "project_annotators": (select(models.Role)
+        .where(models.Role.project_id == 1), "ix_roles_project_id"),
+        "sentence_search": (select(models.Sentence.id)
+        .where(models.fts_document(models.Sentence.text).op("@@")(
+            func.websearch_to_tsquery(models.FTS_CONFIG, "term"))), "ix_sentences_text_fts"),
+        "translation_search": (select(models.Translation.id)
+        .where(models.fts_document(models.Translation.text).op("@@")(
+            func.websearch_to_tsquery(models.FTS_CONFIG, "term"))), "ix_translations_text_fts"),
+    }
+
+
+def _indexes(plan: dict):
+    if "Index Name" in plan:
+        yield plan["Index Name"]
+    for child in plan.get("Plans", []):
+        yield from _indexes(child)
+
+
+def check_query_plans(db: Session):
+    """Returns {query name: (expected index, indexes used)} for hot queries
+    whose plan does not use their index."""
+    failures = {}
+    # Seed tables are tiny, so make the planner pick an index whenever one
+    # exists; naming the index keeps a primary key scan from passing
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    for name, (stmt, index) in hot_queries().items():
+        sql = str(stmt.compile(dialect=db.bind.dialect,
+                               compile_kwargs={"literal_binds": True}))
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        used = sorted(set(_indexes(plan[0]["Plan"])))
+        if index not in used:
+            failures[name] = (index, used)
+    db.rollback()
+
+    return failures
+
+
+# Progress counter reconciliation
+
+def rebuild_stats(db: Session, project_ids=None):
+    if project_ids is None:
+        project_ids = db.scalars(select(models.Project.id).order_by(models.Project.id)).all()
+
+    # One transaction per project keeps locks short
+    for project_id in project_ids:
+        crud.rebuild_project_stats(db=db, project_id=project_id)
+
+    return project_ids
+
+
+# Sentence content hash backfill
+
+def backfill_hashes(db: Session, batch_size: int = 1000):
+    """Hashes sentences stored before duplicate detection, flagging duplicates.
+
+    Walks unhashed sentences in id order, one transaction per batch. A
+    sentence whose normalized text already has a canonical sentence in the
+    same project and language gets `duplicate_of_id` set instead of joining
+    the unique index. Returns (hashed, flagged) counts.
+    """
+    hashed = flagged = 0
+    last_id = 0
+    while True:
+        batch = db.execute(
+            select(models.Sentence.id, models.Sentence.text,
+                   models.Sentence.language_iso, models.Sentence.project_id)
+            .where(models.Sentence.content_hash.is_(None))
+            .where(models.Sentence.id > last_id)
+            .order_by(models.Sentence.id).limit(batch_size)
+        ).all()
+        if not batch:
+            return hashed, flagged
+
+        keys = {(sentence.project_id, sentence.language_iso, dedupe.content_hash(sentence.text)): None
+                for sentence in batch}
+        canonical = {
+            (row.project_id, row.language_iso, row.content_hash): row.id
+            for row in db.execute(
+                select(models.Sentence.project_id, models.Sentence.language_iso,
+                       models.Sentence.content_hash, models.Sentence.id)
+                .where(models.Sentence.duplicate_of_id.is_(None))
+                .where(tuple_(models.Sentence.project_id, models.Sentence.language_iso, models.Sentence.content_hash).in_(list(keys)))
+            )
+        }
+
+        updates = []
+        for sentence in batch:
+            key = (sentence.project_id, sentence.language_iso,
+                   dedupe.content_hash(sentence.text))
+            duplicate_of_id = canonical.get(key)
+            if duplicate_of_id is None:
+                # Lowest id wins: it becomes the canonical sentence
+                canonical[key] = sentence.id
+            else:
+                flagged += 1
+            updates.append({"id": sentence.id, "content_hash": key[2],
+                            "duplicate_of_id": duplicate_of_id})
+
+        db.execute(update(models.Sentence), updates)
+        db.commit()
+        hashed += len(batch)
+        last_id = batch[-1].id
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backend.db.maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser(
+        "check-plans", help="Fail if a hot query does not use its index.")
+    rebuild = commands.add_parser(
+        "rebuild-stats", help="Recompute project progress counters from scratch.")
+    rebuild.add_argument("--project-id", type=int, action="append",
+                         dest="project_ids", help="Limit to a project (repeatable).")
+    backfill = commands.add_parser(
+        "backfill-hashes", help="Hash existing sentences and flag duplicates.")
+    backfill.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        if args.command == "check-plans":
+            failures = check_query_plans(db)
+            for name, (index, used) in failures.items():
+                print(f"{name}: expected {index}, used {', '.join(used) or 'no index'}")
+            return 1 if failures else 0
+
+        if args.command == "rebuild-stats":
+            for project_id in rebuild_stats(db, project_ids=args.project_ids):
+                print(f"Rebuilt counters for project {project_id}")
+            return 0
+
+        if args.command == "backfill-hashes":
+            hashed, flagged = backfill_hashes(db, batch_size=args.batch_size)
+            print(f"Hashed {hashed} sentences, flagged {flagged} duplicates")
+            return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
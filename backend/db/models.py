@@ -1,9 +1,20 @@
-from sqlalchemy import Column, String, Integer, Boolean, ForeignKey
+from sqlalchemy import BigInteger, Column, String, Integer, Boolean, DateTime, ForeignKey, Index, UniqueConstraint, func, literal_column
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from .database import Base
 
 
+# Text search configuration; `simple` only lowercases, which suits the many
+# languages we collect that have no Postgres stemmer
+FTS_CONFIG = literal_column("'simple'::regconfig")
+
+
+def fts_document(column):
+    # Must match the indexed expression for the GIN indexes to be used
+    return func.to_tsvector(FTS_CONFIG, column)
+
+
 class User(Base):
     """Users table"""
 
@@ -14,6 +25,8 @@ class User(Base):
     gender = Column(String, nullable=True)
     age = Column(Integer, nullable=True, default=0)
     is_admin = Column(Boolean, nullable=False, default=False)
+    # Bumped when issued tokens must stop working; tokens carry it as `ver`
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     project = relationship("Project", secondary="roles",
                            back_populates="annotators")
@@ -27,6 +40,20 @@ class Sentence(Base):
     text = Column(String)
     language_iso = Column(String)
     project_id = Column(Integer, ForeignKey("projects.id"))
+    # SHA-256 of the normalized text, see dedupe.normalize_text
+    content_hash = Column(String, nullable=True)
+    duplicate_of_id = Column(Integer, ForeignKey("sentences.id"), nullable=True)
+
+    __table_args__ = (
+        # Project sentence pages and lookups, keyset-paginated on id
+        Index("ix_sentences_project_id_id", "project_id", "id"),
+        # Flagged legacy duplicates are kept out of the uniqueness check
+        Index("uq_sentences_project_id_language_iso_content_hash",
+              "project_id", "language_iso", "content_hash", unique=True,
+              postgresql_where=duplicate_of_id.is_(None)),
+        Index("ix_sentences_text_fts", fts_document(text),
+              postgresql_using="gin"),
+    )
 
 
 class Translation(Base):
@@ -39,6 +66,13 @@ class Translation(Base):
     src_sentence_id = Column(Integer, ForeignKey("sentences.id"))
     annotator_username = Column(String, ForeignKey("users.username"))
 
+    __table_args__ = (
+        Index("ix_translations_src_sentence_id_id", "src_sentence_id", "id"),
+        Index("ix_translations_annotator_username", "annotator_username"),
+        Index("ix_translations_text_fts", fts_document(text),
+              postgresql_using="gin"),
+    )
+
 
 class Recording(Base):
     """Recordings table"""
@@ -50,6 +84,11 @@ class Recording(Base):
     src_sentence_id = Column(Integer, ForeignKey("sentences.id"))
     annotator_username = Column(String, ForeignKey("users.username"))
 
+    __table_args__ = (
+        Index("ix_recordings_src_sentence_id_id", "src_sentence_id", "id"),
+        Index("ix_recordings_annotator_username", "annotator_username"),
+    )
+
 
 class Project(Base):
     """Projects table"""
@@ -58,6 +97,8 @@ class Project(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, unique=True)
     p_type = Column(String)
+    # Bumped by every write to the project's data; backs ETags
+    version = Column(Integer, nullable=False, default=0, server_default="0")
 
     annotators = relationship(
         "User", secondary="roles", back_populates="project")
@@ -71,3 +112,94 @@ class Role(Base):
     username = Column(String, ForeignKey("users.username"))
     project_id = Column(Integer, ForeignKey("projects.id"))
     role = Column(String, nullable=False)
+
+    __table_args__ = (
+        # Membership checks; a user holds at most one role per project
+        UniqueConstraint("username", "project_id",
+                         name="uq_roles_username_project_id"),
+        # Project -> annotators join
+        Index("ix_roles_project_id", "project_id"),
+    )
+
+
+class TaskLease(Base):
+    """Task leases table"""
+
+    __tablename__ = "task_leases"
+    id = Column(Integer, primary_key=True)
+    sentence_id = Column(Integer, ForeignKey("sentences.id"), nullable=False)
+    language_iso = Column(String, nullable=False)
+    task_type = Column(String, nullable=False)
+    username = Column(String, ForeignKey("users.username"), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        # One live lease per unit of work
+        UniqueConstraint("sentence_id", "language_iso", "task_type",
+                         name="uq_task_leases_sentence_id_language_iso_task_type"),
+    )
+
+
+class ProjectStats(Base):
+    """Per-project sentence counter, maintained by crud write paths"""
+
+    __tablename__ = "project_stats"
+    project_id = Column(Integer, ForeignKey(
+        "projects.id", ondelete="CASCADE"), primary_key=True)
+    total_sentences = Column(Integer, nullable=False, default=0)
+
+
+class ProjectLanguageStats(Base):
+    """Per-project, per-language progress counters"""
+
+    __tablename__ = "project_language_stats"
+    project_id = Column(Integer, ForeignKey(
+        "projects.id", ondelete="CASCADE"), primary_key=True)
+    language_iso = Column(String, primary_key=True)
+    translated_sentences = Column(Integer, nullable=False, default=0)
+    translations = Column(Integer, nullable=False, default=0)
+    recordings = Column(Integer, nullable=False, default=0)
+
+
+class ProjectAnnotatorStats(Base):
+    """Per-project, per-annotator contribution counters"""
+
+    __tablename__ = "project_annotator_stats"
+    project_id = Column(Integer, ForeignKey(
+        "projects.id", ondelete="CASCADE"), primary_key=True)
+    username = Column(String, primary_key=True)
+    translations = Column(Integer, nullable=False, default=0)
+    recordings = Column(Integer, nullable=False, default=0)
+
+
+class Job(Base):
+    """Background jobs table; the queue the job workers poll"""
+
+    __tablename__ = "jobs"
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    # queued -> running -> succeeded | failed | cancelled
+    status = Column(String, nullable=False, default="queued")
+    # Not foreign keys: a job outlives the project it deletes and its submitter
+    project_id = Column(Integer, nullable=True)
+    username = Column(String, nullable=True)
+    payload = Column(JSONB, nullable=False, default=dict)
+    result = Column(JSONB, nullable=True)
+    error = Column(String, nullable=True)
+    # Sentences processed, or bytes written for exports (which outgrow int4)
+    progress = Column(BigInteger, nullable=False, default=0)
+    total = Column(BigInteger, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    # Set by the worker holding the job; stale heartbeats mark orphans
+    worker_id = Column(String, nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Workers claim the oldest queued job; the reaper scans running ones
+        Index("ix_jobs_status_id", "status", "id"),
+        Index("ix_jobs_username_id", "username", "id"),
+    )
@@ -0,0 +1,63 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolStats:
+    """Cumulative checkout counters for one connection pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, waited: float, timed_out: bool):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+class _InstrumentedPoolMixin:
+    stats: PoolStats
+
+    def _do_get(self):
+        # Time spent waiting for a free (or new overflow) connection
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.stats.record_checkout(time.perf_counter() - start, timed_out)
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    stats = PoolStats()
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    stats = PoolStats()
+
+
+def pool_status(pool):
+    stats = pool.stats
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": stats.checkouts,
+        "timeouts": stats.timeouts,
+        "wait_seconds_total": stats.wait_seconds_total,
+        "wait_seconds_max": stats.wait_seconds_max,
+    }
@@ -0,0 +1,66 @@
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from ..cache import MISSING, CacheBackend, TTLCache
+from ..config import Settings
+
+
+# Read-through cache of single rows (users, projects, sentences) by primary
+# key. Entries are plain column dicts; crud rebuilds a detached instance from
+# one and merges it into the caller's session without emitting SQL. Only
+# found rows are cached, so creates never need to invalidate.
+
+settings = Settings()
+
+# Columns left out of snapshots: `version` changes on every write to the
+# project, `token_version` must be read fresh (see get_token_version) and
+# password hashes should not sit in a shared cache. They stay unloaded on
+# cached instances and are fetched if accessed.
+EXCLUDED_COLUMNS = {
+    "projects": {"version"},
+    "users": {"hashed_password", "token_version"},
+}
+
+backend: CacheBackend = TTLCache(maxsize=settings.row_cache_size, ttl=settings.row_cache_ttl)
+
+
+def use_backend(cache_backend: CacheBackend):
+    global backend
+    backend = cache_backend
+
+
+def _key(model, ident):
+    return (model.__tablename__, ident)
+
+
+def get(model, ident):
+    """Returns a detached instance of the cached row, or MISSING."""
+    if not settings.row_cache_enabled:
+        return MISSING
+
+    values = backend.get(_key(model, ident))
+    if values is MISSING:
+        return MISSING
+
+    instance = model(**values)
+    # Marks the values as loaded from the database, so `Session.merge(...,
+    # load=False)` accepts the instance
+    make_transient_to_detached(instance)
+
+    return instance
+
+
+def store(model, ident, instance):
+    if settings.row_cache_enabled and instance is not None:
+        excluded = EXCLUDED_COLUMNS.get(model.__tablename__, ())
+        backend.set(_key(model, ident), {
+            column.key: getattr(instance, column.key)
+            for column in inspect(model).column_attrs if column.key not in excluded
+        })
+
+    return instance
+
+
+def invalidate(model, *idents):
+    for ident in idents:
+        backend.delete(_key(model, ident))
@@ -1,5 +1,6 @@
-from typing import Optional
-from pydantic import BaseModel, EmailStr
+from datetime import datetime
+from typing import Literal, Optional
+from pydantic import BaseModel, EmailStr, Field
 
 
 class UserBase(BaseModel):
@@ -62,6 +63,16 @@ class Translation(TranslationBase):
         from_attributes = True
 
 
+class TranslationSubmission(TranslationBase):
+    sentence_id: int
+
+
+class TranslationSubmissionResult(BaseModel):
+    sentence_id: int
+    status: Literal["created", "not_found"]
+    translation: Optional[Translation] = None
+
+
 class RecordingBase(BaseModel):
     audio_file_path: str
     language_iso: str
@@ -71,11 +82,13 @@ class RecordingCreate(RecordingBase):
     annotator_username: str
 
 
-class Recording:
+class Recording(RecordingBase):
     id: int
+    src_sentence_id: int
+    annotator_username: str
 
     class Config:
-        form_attributes = True
+        from_attributes = True
 
 
 class ProjectBase(BaseModel):
@@ -87,14 +100,17 @@ class ProjectCreate(ProjectBase):
     pass
 
 
-class Project(ProjectBase):
+class ProjectSummary(ProjectBase):
     id: int
-    annotators: list[User] = []
 
     class Config:
         from_attributes = True
 
 
+class Project(ProjectSummary):
+    annotators: list[User] = []
+
+
 class RoleBase(BaseModel):
     role: str
     username: str
@@ -116,6 +132,108 @@ class Token(BaseModel):
     token_type: str
 
 
+class LanguageStats(BaseModel):
+    language_iso: str
+    translated_sentences: int
+    translations: int
+    recordings: int
+
+    class Config:
+        from_attributes = True
+
+
+class AnnotatorStats(BaseModel):
+    username: str
+    translations: int
+    recordings: int
+
+    class Config:
+        from_attributes = True
+
+
+class ProjectStats(BaseModel):
+    project_id: int
+    total_sentences: int
+    languages: list[LanguageStats] = []
+    annotators: list[AnnotatorStats] = []
+
+
+class SearchHit(BaseModel):
+    id: int
+    sentence_id: int
+    language_iso: str
+    text: str
+    snippet: str
+    rank: float
+
+    class Config:
+        from_attributes = True
+
+
+class Suggestion(BaseModel):
+    sentence_id: int
+    text: str
+    score: float
+    translations: list[Translation] = []
+
+
+class TaskCheckout(BaseModel):
+    language_iso: str
+    task_type: Literal["translation", "recording"] = "translation"
+    count: int = Field(default=1, ge=1, le=100)
+
+
+class TaskLease(BaseModel):
+    id: int
+    sentence: Sentence
+    language_iso: str
+    task_type: str
+    expires_at: datetime
+
+
 class TokenData(BaseModel):
     username: Optional[str | None] = None
     is_admin: bool
+    iat: Optional[int | None] = None
+    exp: Optional[int | None] = None
+    ver: int = 0
+
+
+class CacheStats(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+class PoolStats(BaseModel):
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class Job(BaseModel):
+    id: int
+    kind: str
+    status: str
+    project_id: Optional[int] = None
+    username: Optional[str] = None
+    progress: int
+    total: Optional[int] = None
+    attempts: int
+    cancel_requested: bool
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from collections import defaultdict
+
+import orjson
+
+from .config import Settings
+
+
+settings = Settings()
+
+# Sent instead of the dropped backlog when a subscriber falls behind; the
+# client should refetch over REST (conditional GETs make that cheap)
+RESYNC = orjson.dumps({"type": "resync"}).decode()
+
+
+class Subscription:
+    def __init__(self, project_id: int, queue_size: int):
+        self.project_id = project_id
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflows = 0
+
+    def offer(self, message: str):
+        # Never blocks the publisher: a full queue is replaced by one resync
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflows += 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+
+class ProjectFeed:
+    """In-process fan-out of project activity to feed subscribers.
+
+    `publish` may be called from any thread (crud runs in the threadpool); it
+    hands the event to the event loop, which buffers a project's events for
+    `coalesce_seconds` and then sends every subscriber one batched message.
+    Events published while no loop is bound, or for projects nobody is
+    watching, are dropped.
+    """
+
+    def __init__(self, coalesce_seconds: float, queue_size: int):
+        self.coalesce_seconds = coalesce_seconds
+        self.queue_size = queue_size
+        self._loop = None
+        self._subscribers = defaultdict(set)
+        self._pending = {}
+        self.published = 0
+        self.delivered = 0
+
+    def bind(self, loop: asyncio.AbstractEventLoop | None):
+        self._loop = loop
+
+    def subscribe(self, project_id: int):
+        # Loop thread only
+        subscription = Subscription(project_id, self.queue_size)
+        self._subscribers[project_id].add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.project_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.project_id]
+
+    def subscriber_count(self, project_id: int | None = None):
+        if project_id is not None:
+            return len(self._subscribers.get(project_id, ()))
+
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, project_id: int, event_type: str, ids):
+        loop = self._loop
+        # Unlocked read from other threads; at worst one event is dropped
+        # for a subscriber that is just joining
+        if loop is None or project_id not in self._subscribers:
+            return
+        try:
+            loop.call_soon_threadsafe(self._enqueue, project_id, event_type, list(ids))
+        except RuntimeError:
+            # Loop already closed during shutdown
+            pass
+
+    def _enqueue(self, project_id: int, event_type: str, ids: list):
+        self.published += 1
+        pending = self._pending.get(project_id)
+        if pending is None:
+            pending = self._pending[project_id] = defaultdict(list)
+            self._loop.call_later(self.coalesce_seconds, self._flush, project_id)
+        pending[event_type].extend(ids)
+
+    def _flush(self, project_id: int):
+        pending = self._pending.pop(project_id, None)
+        subscribers = self._subscribers.get(project_id)
+        if not pending or not subscribers:
+            return
+
+        # Serialized once, shared by every subscriber
+        message = orjson.dumps({
+            "type": "batch",
+            "project_id": project_id,
+            "sent_at": time.time(),
+            "events": [{"type": event_type, "ids": ids} for event_type, ids in pending.items()],
+        }).decode()
+        for subscription in list(subscribers):
+            subscription.offer(message)
+        self.delivered += len(subscribers)
+
+
+feed = ProjectFeed(coalesce_seconds=settings.feed_coalesce_seconds, queue_size=settings.feed_queue_size)
@@ -0,0 +1,311 @@
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+
+from .config import Settings
+from .db import crud, schemas
+from .db.database import SessionLocal
+from .routes.exports import export_chunks, export_filename
+
+
+settings = Settings()
+logger = logging.getLogger(__name__)
+
+# Background jobs run by worker processes polling the jobs table; Postgres is
+# the only broker. A worker claims a job with FOR UPDATE SKIP LOCKED, sends
+# heartbeats while it runs and records progress at checkpoints. Handlers are
+# written to resume from their last checkpoint, since a job whose worker
+# dies is requeued by whichever worker next notices the stale heartbeat.
+
+HANDLERS = {}
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobLost(Exception):
+    """The job was reaped and may already run elsewhere; stop without writing."""
+
+
+class JobInterrupted(Exception):
+    """The worker is shutting down; the job goes back to the queue."""
+
+
+def handler(kind: str):
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+
+    return register
+
+
+class JobContext:
+    """Handed to a handler: records checkpoints and tells it when to stop.
+
+    A thread sends heartbeats between checkpoints, so handlers only need to
+    call `checkpoint` once per batch.
+    """
+
+    def __init__(self, job_id: int, worker_id: str, stopping: threading.Event):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.stopping = stopping
+        self._cancelled = threading.Event()
+        self._lost = threading.Event()
+        self._done = threading.Event()
+        self._heartbeat = threading.Thread(target=self._send_heartbeats, daemon=True)
+
+    def __enter__(self):
+        self._heartbeat.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._done.set()
+        self._heartbeat.join()
+
+    def _record(self, cancel_requested):
+        if cancel_requested is None:
+            self._lost.set()
+        elif cancel_requested:
+            self._cancelled.set()
+
+    def _send_heartbeats(self):
+        while not self._done.wait(settings.job_heartbeat_seconds):
+            db = SessionLocal()
+            try:
+                self._record(crud.heartbeat_job(db=db, job_id=self.job_id, worker_id=self.worker_id))
+            except Exception:
+                # A missed beat is fine; the timeout allows several
+                logger.exception("Heartbeat for job %s failed", self.job_id)
+            finally:
+                db.close()
+
+    def check(self):
+        if self._lost.is_set():
+            raise JobLost()
+        if self._cancelled.is_set():
+            raise JobCancelled()
+        if self.stopping.is_set():
+            raise JobInterrupted()
+
+    def checkpoint(self, progress: int, total: int | None = None, state: dict | None = None):
+        db = SessionLocal()
+        try:
+            self._record(crud.checkpoint_job(
+                db=db, job_id=self.job_id, worker_id=self.worker_id,
+                progress=progress, total=total, state=state))
+        finally:
+            db.close()
+        self.check()
+
+
+@handler("import_sentences")
+def import_sentences(db, job, ctx: JobContext):
+    # One transaction per batch. "existing" only shapes the HTTP response, so
+    # it stores like "skip"; a batch replayed after a crash may find its own
+    # rows, so it never rejects (they are then counted as skipped).
+    sentences = [schemas.SentenceCreate(**sentence) for sentence in job.payload["sentences"]]
+    on_duplicate = job.payload.get("on_duplicate", "existing")
+    state = job.result or {"created": 0, "skipped": 0}
+
+    start = job.progress
+    for offset in range(start, len(sentences), settings.job_batch_size):
+        batch = sentences[offset:offset + settings.job_batch_size]
+        replayed = offset == start and job.attempts > 1
+        db_sentences = crud.create_sentences(
+            db=db, sentences=batch, project_id=job.project_id,
+            on_duplicate="reject" if on_duplicate == "reject" and not replayed else "skip")
+
+        state["created"] += len(db_sentences)
+        state["skipped"] += len(batch) - len(db_sentences)
+        ctx.checkpoint(offset + len(batch), state=state)
+
+    return state
+
+
+@handler("delete_project")
+def delete_project(db, job, ctx: JobContext):
+    deleted = job.progress
+    if job.total is None:
+        ctx.checkpoint(deleted, total=crud.get_project_stats(db=db, project_id=job.project_id)["total_sentences"])
+
+    for duplicates in (True, False):
+        before = None
+        while True:
+            sentence_ids = crud.purge_project_sentences(
+                db=db, project_id=job.project_id, batch_size=settings.job_batch_size,
+                duplicates=duplicates, before=before)
+            if not sentence_ids:
+                break
+            before = sentence_ids[-1]
+            deleted += len(sentence_ids)
+            ctx.checkpoint(deleted)
+
+    try:
+        crud.delete_project(db=db, project_id=job.project_id)
+
+    except ValueError:
+        # Deleted by an earlier attempt that died before finishing the job
+        if job.attempts == 1:
+            raise
+
+    return {"deleted_sentences": deleted}
+
+
+@handler("export_project")
+def export_project(db, job, ctx: JobContext):
+    # Not resumable: a retried export starts over
+    filename, media_type = export_filename(job.project_id, job.payload["format"], job.payload["gzip"])
+    relative_path = f"job-{job.id}-{filename}"
+    path = os.path.join(settings.exports_dir, relative_path)
+    tmp_path = path + ".part"
+    os.makedirs(settings.exports_dir, exist_ok=True)
+
+    chunks = export_chunks(
+        project_id=job.project_id, format=job.payload["format"],
+        language_iso=job.payload["language_iso"], gzip=job.payload["gzip"])
+    size = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            for i, chunk in enumerate(chunks):
+                f.write(chunk)
+                size += len(chunk)
+                # Progress is in bytes written; chunks are about 64 KiB
+                if i % 64 == 63:
+                    ctx.checkpoint(size)
+        # The size is only known at the end; it becomes the total as well
+        ctx.checkpoint(size, total=size)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        # Closes the export's own session right away on cancellation
+        chunks.close()
+
+    return {"path": relative_path, "filename": filename, "media_type": media_type, "bytes": size}
+
+
+def run_job(job, worker_id: str, stopping: threading.Event):
+    status, result, error = "succeeded", None, None
+    job_handler = HANDLERS.get(job.kind)
+
+    db = SessionLocal()
+    try:
+        with JobContext(job.id, worker_id, stopping) as ctx:
+            if job_handler is None:
+                raise ValueError(f"Unknown job kind `{job.kind}`.")
+            result = job_handler(db, job, ctx)
+
+    except JobLost:
+        logger.warning("Job %s was taken over after missing heartbeats", job.id)
+        return
+
+    except JobInterrupted:
+        status = None
+
+    except JobCancelled:
+        status = "cancelled"
+
+    except Exception as e:
+        logger.exception("Job %s (%s) failed", job.id, job.kind)
+        status, error = "failed", str(e) or type(e).__name__
+
+    finally:
+        db.close()
+
+    db = SessionLocal()
+    try:
+        if status is None:
+            crud.release_job(db=db, job_id=job.id, worker_id=worker_id)
+        else:
+            crud.finish_job(db=db, job_id=job.id, worker_id=worker_id, status=status, result=result, error=error)
+    finally:
+        db.close()
+
+
+def work(worker_id: str, stopping):
+    """Claims and runs jobs until `stopping` is set, reaping orphans on every poll."""
+    while not stopping.is_set():
+        db = SessionLocal()
+        try:
+            for job_id, status in crud.reap_orphaned_jobs(
+                    db=db, heartbeat_timeout=settings.job_heartbeat_timeout,
+                    max_attempts=settings.job_max_attempts):
+                logger.warning("Recovered orphaned job %s: %s", job_id, status)
+            job = crud.claim_job(db=db, worker_id=worker_id)
+        finally:
+            db.close()
+
+        if job is None:
+            stopping.wait(settings.job_poll_seconds)
+            continue
+
+        logger.info("Running job %s (%s), attempt %s", job.id, job.kind, job.attempts)
+        run_job(job, worker_id, stopping)
+
+
+def _worker_process(stopping):
+    # The parent turns SIGINT/SIGTERM into `stopping`
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+
+    work(f"{socket.gethostname()}:{os.getpid()}", stopping)
+
+
+def run_pool(processes: int):
+    """Runs `processes` workers until SIGINT/SIGTERM, restarting any that die.
+
+    On shutdown each worker hands its running job back to the queue at the
+    job's next checkpoint, without spending an attempt.
+    """
+    # Spawned, so each worker builds its own engine and connection pool
+    context = multiprocessing.get_context("spawn")
+    stopping = context.Event()
+
+    def start(index: int):
+        process = context.Process(target=_worker_process, args=(stopping,), name=f"job-worker-{index}")
+        process.start()
+        return process
+
+    def shutdown(signum, frame):
+        stopping.set()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    workers = [start(index) for index in range(processes)]
+    while not stopping.wait(1):
+        for index, process in enumerate(workers):
+            if not process.is_alive():
+                # Its job is requeued once the heartbeat goes stale
+                logger.warning("%s exited with code %s; restarting", process.name, process.exitcode)
+                workers[index] = start(index)
+
+    for process in workers:
+        process.join()
+
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backend.jobs")
+    parser.add_argument("--processes", type=int, default=settings.job_workers,
+                        help="Worker processes to run.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+
+    return run_pool(args.processes)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
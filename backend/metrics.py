@@ -0,0 +1,216 @@
+import bisect
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from .config import Settings
+
+
+settings = Settings()
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram; `observe` is thread-safe."""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.db_seconds = 0.0
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed: float, stats: "RequestStats"):
+        self.latency.observe(elapsed)
+        self.statements.observe(stats.statements)
+        with self._lock:
+            self.db_seconds += stats.db_seconds
+            self.rows += stats.rows
+
+
+class RequestStats:
+    """SQL accounting for one request, filled in by the engine hooks."""
+
+    def __init__(self, keep_statements: bool):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.statement_log = [] if keep_statements else None
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed: float, rows: int):
+        # Sync routes run in the threadpool, which shares this object
+        with self._lock:
+            self.statements += 1
+            self.db_seconds += elapsed
+            self.rows += rows
+            if self.statement_log is not None:
+                self.statement_log.append((elapsed, statement))
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+_routes: dict[tuple[str, str, str], RouteMetrics] = {}
+_routes_lock = threading.Lock()
+
+
+def _route_metrics(key: tuple[str, str, str]):
+    metrics = _routes.get(key)
+    if metrics is None:
+        with _routes_lock:
+            metrics = _routes.setdefault(key, RouteMetrics())
+
+    return metrics
+
+
+# SQLAlchemy engine hooks
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        # rowcount is -1 where the driver does not report it
+        stats.record(statement, time.perf_counter() - start, max(cursor.rowcount, 0))
+
+
+def instrument_engine(engine):
+    # Pass `async_engine.sync_engine` for the asyncio stack
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ASGI middleware
+
+class MetricsMiddleware:
+    """Times every HTTP request and attributes its SQL work to the matched route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(keep_statements=settings.slow_request_seconds is not None)
+        token = _current.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+
+            # Label by path template so ids do not explode the series count
+            route = scope.get("route")
+            path = getattr(route, "path_format", UNMATCHED_ROUTE)
+            _route_metrics((scope["method"], path, str(status_code))).record(elapsed, stats)
+
+            if settings.slow_request_seconds is not None and elapsed >= settings.slow_request_seconds:
+                _log_slow_request(scope["method"], scope["path"], status_code, elapsed, stats)
+
+
+def _log_slow_request(method: str, path: str, status_code: int, elapsed: float, stats: RequestStats):
+    lines = [
+        f"{seconds * 1000:8.2f} ms  {' '.join(statement.split())[:settings.slow_request_statement_chars]}"
+        for seconds, statement in stats.statement_log
+    ]
+    logger.warning(
+        "Slow request %s %s -> %s in %.1f ms (%d statements, %.1f ms in database, %d rows)\n%s",
+        method, path, status_code, elapsed * 1000, stats.statements,
+        stats.db_seconds * 1000, stats.rows, "\n".join(lines)
+    )
+
+
+# Prometheus text exposition
+
+def _labels(method: str, route: str, status_code: str, **extra):
+    labels = {"method": method, "route": route, "status": status_code, **extra}
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n"))
+        for name, value in labels.items()
+    )
+
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _histogram_lines(name: str, histogram: Histogram, key: tuple[str, str, str]):
+    counts, total, count = histogram.snapshot()
+    cumulative = 0
+    for bound, bucket_count in zip((*histogram.buckets, "+Inf"), counts):
+        cumulative += bucket_count
+        yield f"{name}_bucket{_labels(*key, le=str(bound))} {cumulative}"
+    yield f"{name}_sum{_labels(*key)} {total}"
+    yield f"{name}_count{_labels(*key)} {count}"
+
+
+def render_prometheus():
+    with _routes_lock:
+        routes = sorted(_routes.items())
+
+    lines = [
+        "# HELP http_request_duration_seconds Request latency by route.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for key, metrics in routes:
+        lines.extend(_histogram_lines("http_request_duration_seconds", metrics.latency, key))
+
+    lines += [
+        "# HELP http_request_sql_statements SQL statements executed per request.",
+        "# TYPE http_request_sql_statements histogram",
+    ]
+    for key, metrics in routes:
+        lines.extend(_histogram_lines("http_request_sql_statements", metrics.statements, key))
+
+    lines += [
+        "# HELP http_request_db_seconds_total Time spent executing SQL.",
+        "# TYPE http_request_db_seconds_total counter",
+    ]
+    lines += [f"http_request_db_seconds_total{_labels(*key)} {metrics.db_seconds}" for key, metrics in routes]
+
+    lines += [
+        "# HELP http_request_db_rows_total Rows returned or affected by SQL statements.",
+        "# TYPE http_request_db_rows_total counter",
+    ]
+    lines += [f"http_request_db_rows_total{_labels(*key)} {metrics.rows}" for key, metrics in routes]
+
+    return "\n".join(lines) + "\n"
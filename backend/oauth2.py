@@ -1,11 +1,14 @@
 from jose import JWTError, jwt
 from fastapi import Depends, status, HTTPException
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
+import time
 
-from .db import schemas, crud, database
+from .db import schemas, crud, async_crud, database
+from .cache import MISSING, principal_cache
 from .config import Settings
 
 
@@ -19,11 +22,12 @@ ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
+    now = datetime.now(timezone.utc)
     if expires_delta:
-        expire = datetime.now() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.now() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({'exp': expire})
+        expire = now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({'iat': now, 'exp': expire})
     encoded_jwt = jwt.encode(to_encode, SECRETE_KEY, algorithm=ALGORITHM)
 
     return encoded_jwt
@@ -39,22 +43,130 @@ def verify_access_token(token: str, credentials_exeption: Exception):
 
         token_data = schemas.TokenData(
             username=username,
-            is_admin=payload.get("is_admin")
+            is_admin=payload.get("is_admin"),
+            iat=payload.get("iat"),
+            exp=payload.get("exp"),
+            ver=payload.get("ver", 0)
         )
-    except:
-        raise JWTError
+    except JWTError:
+        raise credentials_exeption
 
     return token_data
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
-    credentials_exception = HTTPException(
+def _credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail=f"Could not validate credentials.",
         headers={"WWW-Authenticate": "Bearer"}
     )
 
-    token_data = verify_access_token(token, credentials_exception)
 
-    # Fetch and return user
-    return crud.get_user(db=db, username=token_data.username)
+def _check_token_version(token_data: schemas.TokenData, version: Optional[int]):
+    # The user was deleted, demoted or changed their password since the
+    # token was issued; checked on every request, before any cached principal
+    if version is None or version != token_data.ver:
+        raise _credentials_exception()
+
+
+def _cached_principal(token: str, token_data: schemas.TokenData):
+    # Returns MISSING when the user has to be fetched from the database
+    principal = principal_cache.get((token_data.username, token))
+    if principal is MISSING and settings.auth_trust_token_claims:
+        # Signed claims are authoritative while the token version matches
+        principal = token_data
+        _cache_principal(token, token_data, principal)
+
+    return principal
+
+
+def _cache_principal(token: str, token_data: schemas.TokenData, principal: schemas.TokenData):
+    # Never cache a principal past its token's expiry
+    ttl = settings.principal_cache_ttl
+    if token_data.exp is not None:
+        ttl = min(ttl, token_data.exp - time.time())
+    if ttl > 0:
+        principal_cache.set((token_data.username, token), principal, ttl=ttl)
+
+
+def _principal_from_user(token: str, token_data: schemas.TokenData, db_user):
+    if db_user is None:
+        raise _credentials_exception()
+
+    principal = schemas.TokenData(
+        username=db_user.username,
+        is_admin=db_user.is_admin,
+        iat=token_data.iat,
+        exp=token_data.exp,
+        ver=token_data.ver
+    )
+    _cache_principal(token, token_data, principal)
+
+    return principal
+
+
+def _check_project_role(user: schemas.TokenData, project_id: int, member_role: Optional[str], role: Optional[str]):
+    if member_role is None or (role is not None and member_role != role):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"User `{user.username}` is not authorized to access project with id `{project_id}`."
+        )
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
+    token_data = verify_access_token(token, _credentials_exception())
+    _check_token_version(token_data, crud.get_token_version(db=db, username=token_data.username))
+
+    principal = _cached_principal(token, token_data)
+    if principal is not MISSING:
+        return principal
+
+    # Fetch user
+    db_user = crud.get_user(db=db, username=token_data.username)
+
+    return _principal_from_user(token, token_data, db_user)
+
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(database.get_async_db)):
+    token_data = verify_access_token(token, _credentials_exception())
+    _check_token_version(token_data, await async_crud.get_token_version(db=db, username=token_data.username))
+
+    principal = _cached_principal(token, token_data)
+    if principal is not MISSING:
+        return principal
+
+    db_user = await async_crud.get_user(db=db, username=token_data.username)
+
+    return _principal_from_user(token, token_data, db_user)
+
+
+def require_project_access(role: Optional[str] = None):
+    """Dependency factory: admins, or members of `project_id` (holding `role`, if given)."""
+
+    def dependency(project_id: int, db: Session = Depends(database.get_db), user: schemas.User = Depends(get_current_user)):
+        if user.is_admin:
+            return user
+
+        member_role = crud.get_project_role(
+            db=db, username=user.username, project_id=project_id)
+        _check_project_role(user, project_id, member_role, role)
+
+        return user
+
+    return dependency
+
+
+def require_project_access_async(role: Optional[str] = None):
+    """Async stack counterpart of `require_project_access`."""
+
+    async def dependency(project_id: int, db: AsyncSession = Depends(database.get_async_db), user: schemas.User = Depends(get_current_user_async)):
+        if user.is_admin:
+            return user
+
+        member_role = await async_crud.get_project_role(
+            db=db, username=user.username, project_id=project_id)
+        _check_project_role(user, project_id, member_role, role)
+
+        return user
+
+    return dependency
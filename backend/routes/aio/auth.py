@@ -0,0 +1,58 @@
+from fastapi import Depends, APIRouter, HTTPException, status
+from fastapi.security.oauth2 import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...db import database, schemas, models, async_crud
+from ... import utils, oauth2
+
+
+router = APIRouter(tags=["Authentication"])
+
+
+@router.post("/login", response_model=schemas.Token)
+async def login_user(user_credentials: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(database.get_async_db)):
+    # Attempt sign in with provided credentials (username and password)
+    db_user: models.User = await async_crud.get_user(
+        db=db, username=user_credentials.username, use_cache=False)
+
+    if not db_user:
+        # No user with provided username
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Email or password is incorrect."
+        )
+
+    # Return the connection to the pool before waiting on bcrypt
+    username, hashed_password, is_admin, token_version = (
+        db_user.username, db_user.hashed_password, db_user.is_admin, db_user.token_version)
+    await db.close()
+
+    # Verify password for fetched user, off the event loop
+    try:
+        is_valid, new_hash = await utils.verify_and_update_async(
+            plain_password=user_credentials.password, hashed_password=hashed_password)
+
+    except utils.PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy. Please try again shortly.",
+            headers={"Retry-After": "1"}
+        )
+
+    if not is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Email or password is incorrect."
+        )
+
+    # Stored hash uses an outdated cost factor
+    if new_hash is not None:
+        await async_crud.update_user_password_hash(
+            db=db, username=username, hashed_password=new_hash)
+
+    # Create and return access token
+    access_token = oauth2.create_access_token(
+        data={"username": username, "is_admin": is_admin, "ver": token_version}
+    )
+
+    return {"access_token": access_token, "token_type": "bearer"}
@@ -0,0 +1,143 @@
+from fastapi import Depends, APIRouter, Header, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from ...db import database, schemas, async_crud
+from ... import oauth2, utils
+
+
+router = APIRouter(
+    tags=["Projects"],
+    prefix="/projects"
+)
+
+
+# Create project
+@router.post("/", response_model=schemas.Project)
+async def create_project(project: schemas.ProjectCreate, db: AsyncSession = Depends(database.get_async_db), user: schemas.User = Depends(oauth2.get_current_user_async)):
+    if not user.is_admin:
+        # Only admins can create projects.
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"User `{user.username}` does not have the necessary privileges."
+        )
+
+    db_project = await async_crud.get_project_by_name(db=db, project_name=project.name)
+
+    if db_project:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"There is an already existing project with name `{project.name}`."
+        )
+
+    return await async_crud.create_project(db=db, project=project)
+
+
+def _select_fields(fields: Optional[str], include: Optional[str], default):
+    try:
+        return utils.select_fields(fields, include, allowed=list(schemas.Project.model_fields), default=default)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+# Get set of projects
+# Admins see every project, annotators only the ones they have a role in
+@router.get("/", response_model=list[schemas.Project])
+async def get_projects(skip: int = 0, limit: int = 10, cursor: Optional[str] = None, fields: Optional[str] = None, include: Optional[str] = None, db: AsyncSession = Depends(database.get_async_db), user: schemas.User = Depends(oauth2.get_current_user_async)):
+    selected = _select_fields(fields, include, default=list(schemas.ProjectSummary.model_fields))
+
+    try:
+        after = utils.decode_cursor(cursor) if cursor else None
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    username = None if user.is_admin else user.username
+
+    if "annotators" not in selected:
+        rows = await async_crud.get_project_rows(db=db, skip=skip, limit=limit, after=after, username=username)
+        headers = {"X-Next-Cursor": utils.encode_cursor(rows[-1]["id"])} if rows and len(rows) == limit else None
+
+        return utils.rows_response(rows, headers=headers, fields=selected)
+
+    projects = await async_crud.get_projects(db=db, skip=skip, limit=limit, after=after, username=username, include_annotators=True)
+    headers = {"X-Next-Cursor": utils.encode_cursor(projects[-1].id)} if projects and len(projects) == limit else None
+
+    return ORJSONResponse([
+        schemas.Project.model_validate(project).model_dump(include=set(selected)) for project in projects
+    ], headers=headers)
+
+
+# Get project
+# Only admin or annotators of project can access the project
+@router.get("/{project_id}/", response_model=schemas.Project)
+async def get_project(project_id: int, fields: Optional[str] = None, include: Optional[str] = None, if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(database.get_async_db), user: schemas.User = Depends(oauth2.require_project_access_async())):
+    selected = _select_fields(fields, include, default=list(schemas.Project.model_fields))
+    with_annotators = "annotators" in selected
+
+    version = await async_crud.get_project_version(db=db, project_id=project_id)
+
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such project with id `{project_id}`."
+        )
+
+    etag = utils.version_etag(project_id, version)
+    if utils.etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    db_project = await async_crud.get_project(db=db, project_id=project_id, include_annotators=with_annotators)
+
+    if db_project is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such project with id `{project_id}`."
+        )
+
+    schema = schemas.Project if with_annotators else schemas.ProjectSummary
+
+    return ORJSONResponse(schema.model_validate(db_project).model_dump(include=set(selected)), headers={"ETag": etag})
+
+
+# Delete Project
+@router.delete("/{project_id}/", response_model=schemas.Project)
+async def delete_project(project_id: int, background: bool = False, db: AsyncSession = Depends(database.get_async_db), user: schemas.User = Depends(oauth2.get_current_user_async)):
+    # Only admins can delete projects
+    if not user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"User `{user.username}` does not have the necessary privileges."
+        )
+
+    # Sentences and their translations and recordings are purged in batches
+    # by a job worker, then the project itself is deleted
+    if background:
+        if await async_crud.get_project(db=db, project_id=project_id, include_annotators=False) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No such project with id `{project_id}`."
+            )
+        db_job = await async_crud.create_job(
+            db=db, kind="delete_project", username=user.username, project_id=project_id)
+
+        return utils.accepted_response(schemas.Job.model_validate(db_job).model_dump(), f"/jobs/{db_job.id}/")
+
+    try:
+        db_project = await async_crud.delete_project(db=db, project_id=project_id)
+
+        return db_project
+
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such project with id `{project_id}`."
+        )
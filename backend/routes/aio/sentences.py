@@ -0,0 +1,121 @@
+from fastapi import Depends, APIRouter, Header, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from typing import Literal, Optional
+
+from ...db import database, schemas, async_crud, dedupe
+from ... import oauth2, utils
+
+
+router = APIRouter(
+    tags=["Sentences"],
+    prefix="/projects/{project_id}/sentences"
+)
+
+
+# Create sentences
+@router.post("/", response_model=list[schemas.Sentence])
+async def create_sentence(project_id: int, sentences: list[schemas.SentenceCreate], on_duplicate: Literal["reject", "skip", "existing"] = "existing", background: bool = False, db: AsyncSession = Depends(database.get_async_db), user: schemas.User = Depends(oauth2.get_current_user_async)):
+    # Only admins can create sentences
+    if not user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"User `{user.username}` does not have the necessary privileges."
+        )
+
+    db_project = await async_crud.get_project(db=db, project_id=project_id, include_annotators=False)
+    if db_project is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such project with id `{project_id}`."
+        )
+
+    # Large uploads are imported by a job worker in committed batches; with
+    # "reject", batches before the offending one stay imported
+    if background:
+        db_job = await async_crud.create_job(
+            db=db, kind="import_sentences", username=user.username, project_id=project_id,
+            payload={"sentences": [sentence.model_dump() for sentence in sentences], "on_duplicate": on_duplicate},
+            total=len(sentences))
+
+        return utils.accepted_response(schemas.Job.model_validate(db_job).model_dump(), f"/jobs/{db_job.id}/")
+
+    # Insert the whole batch in one transaction
+    try:
+        return await async_crud.create_sentences(db=db, sentences=sentences, project_id=project_id, on_duplicate=on_duplicate)
+
+    except dedupe.DuplicateSentenceError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+
+    except IntegrityError:
+        # A concurrent import stored the same sentence first
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Some sentences were created concurrently. Please retry."
+        )
+
+
+# Get sentence
+@router.get("/{sentence_id}", response_model=schemas.Sentence)
+async def get_sentence(project_id: int, sentence_id: int, db: AsyncSession = Depends(database.get_async_db), user: schemas.User = Depends(oauth2.require_project_access_async())):
+    db_sentence = await async_crud.get_project_sentence(
+        db=db, project_id=project_id, src_sentence_id=sentence_id)
+
+    if db_sentence is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such sentence with id `{sentence_id}` is associated with project with id `{project_id}`"
+        )
+
+    return db_sentence
+
+
+# Get a set of sentences
+@router.get("/", response_model=list[schemas.Sentence])
+async def get_sentences(project_id: int, response: Response, skip: int = 0, limit: int = 10, cursor: Optional[str] = None, if_none_match: Optional[str] = Header(None), db: AsyncSession = Depends(database.get_async_db), user: schemas.User = Depends(oauth2.require_project_access_async())):
+    try:
+        after = utils.decode_cursor(cursor) if cursor else None
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    # The version is read before the page, so a concurrent write can only
+    # make the ETag stale (costing a later 200), never newer than the data
+    version = await async_crud.get_project_version(db=db, project_id=project_id)
+
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such project with id `{project_id}`."
+        )
+
+    etag = utils.version_etag(project_id, version)
+    if utils.etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    if "sentences" in database.settings.fast_list_routes:
+        rows = await async_crud.get_project_sentence_rows(
+            db=db, project_id=project_id, skip=skip, limit=limit, after=after)
+        headers = {"ETag": etag}
+        if rows and len(rows) == limit:
+            headers["X-Next-Cursor"] = utils.encode_cursor(rows[-1]["id"])
+
+        return utils.rows_response(rows, headers=headers)
+
+    db_sentences = await async_crud.get_project_sentences(
+        db=db, project_id=project_id, skip=skip, limit=limit, after=after)
+
+    response.headers["ETag"] = etag
+
+    # Opaque cursor for the next page, keyed on the last sentence id
+    if db_sentences and len(db_sentences) == limit:
+        response.headers["X-Next-Cursor"] = utils.encode_cursor(
+            db_sentences[-1].id)
+
+    return db_sentences
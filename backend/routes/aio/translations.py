@@ -0,0 +1,49 @@
+from fastapi import Depends, APIRouter, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...db import database, schemas, async_crud
+from ... import oauth2
+
+
+router = APIRouter(
+    tags=["Translations"],
+    prefix="/projects/{project_id}/sentences/{sentence_id}/translations"
+)
+
+
+# Create translation
+@router.post("/", response_model=schemas.Translation)
+async def create_translation(project_id: int, sentence_id: int, translation: schemas.TranslationCreate, db: AsyncSession = Depends(database.get_async_db), user: schemas.User = Depends(oauth2.require_project_access_async())):
+    db_sentence = await async_crud.get_project_sentence(
+        db=db, project_id=project_id, src_sentence_id=sentence_id)
+
+    if db_sentence is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such sentence with id `{sentence_id}` found in project with id `{project_id}`."
+        )
+
+    return await async_crud.create_translation(db=db, src_sentence_id=sentence_id, translation=translation)
+
+
+@router.get("/{translation_id}", response_model=schemas.Translation)
+async def get_translation(project_id: int, sentence_id: int, translation_id: int, db: AsyncSession = Depends(database.get_async_db), user: schemas.User = Depends(oauth2.require_project_access_async())):
+    db_project_sentence = await async_crud.get_project_sentence(
+        db=db, project_id=project_id, src_sentence_id=sentence_id)
+
+    if db_project_sentence is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such sentence with id `{sentence_id}` found in project with id `{project_id}`."
+        )
+
+    db_translation = await async_crud.get_translation(
+        db=db, src_sentence_id=sentence_id, translation_id=translation_id)
+
+    if db_translation is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such translation with id `{translation_id}` found for sentence with id `{sentence_id}`."
+        )
+
+    return db_translation
@@ -0,0 +1,123 @@
+from fastapi import Depends, APIRouter, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from ...db import database, schemas, async_crud
+from ... import utils
+
+
+router = APIRouter(
+    tags=["Users"],
+    prefix="/users"
+)
+
+
+# Create user
+@router.post("/", response_model=schemas.User)
+async def create_user(user: schemas.UserCreate, db: AsyncSession = Depends(database.get_async_db)):
+    db_user = await async_crud.get_user(db=db, username=user.username)
+
+    if db_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Username `{user.username}` is already taken."
+        )
+
+    # Return the connection to the pool before waiting on bcrypt
+    await db.close()
+
+    try:
+        hashed_password = await utils.hash_password_async(user.password)
+
+    except utils.PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy. Please try again shortly.",
+            headers={"Retry-After": "1"}
+        )
+
+    return await async_crud.create_user(db=db, user=user, hashed_password=hashed_password)
+
+
+# Get specific user
+@router.get("/{username}/", response_model=schemas.User)
+async def get_user(username: str, db: AsyncSession = Depends(database.get_async_db)):
+    db_user = await async_crud.get_user(db=db, username=username)
+
+    if db_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User `{username}` not found."
+        )
+
+    return db_user
+
+
+# Get set of users
+@router.get("/", response_model=list[schemas.User])
+async def get_users(response: Response, skip: int = 0, limit: int = 10, cursor: Optional[str] = None, db: AsyncSession = Depends(database.get_async_db)):
+    try:
+        after = utils.decode_cursor(cursor, key_type=str) if cursor else None
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    if "users" in database.settings.fast_list_routes:
+        rows = await async_crud.get_user_rows(db=db, skip=skip, limit=limit, after=after)
+        headers = {"X-Next-Cursor": utils.encode_cursor(rows[-1]["username"])} if rows and len(rows) == limit else None
+
+        return utils.rows_response(rows, headers=headers)
+
+    users = await async_crud.get_users(db=db, skip=skip, limit=limit, after=after)
+
+    # Opaque cursor for the next page, keyed on the last username
+    if users and len(users) == limit:
+        response.headers["X-Next-Cursor"] = utils.encode_cursor(
+            users[-1].username)
+
+    return users
+
+
+# Update user
+@router.put("/{username}/", response_model=schemas.User)
+async def update_user(user: schemas.UserUpdate, username: str, db: AsyncSession = Depends(database.get_async_db)):
+    # bcrypt runs on the bounded executor, never on the event loop
+    hashed_password = None
+    if user.password is not None:
+        try:
+            hashed_password = await utils.hash_password_async(user.password)
+
+        except utils.PasswordHasherBusy:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy. Please try again shortly.",
+                headers={"Retry-After": "1"}
+            )
+
+    try:
+        db_user = await async_crud.update_user(db=db, username=username, user=user, hashed_password=hashed_password)
+
+        return db_user
+
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User `{username}` not found."
+        )
+
+
+@router.delete("/{username}/", response_model=schemas.User)
+async def delete_user(username: str, db: AsyncSession = Depends(database.get_async_db)):
+    try:
+        db_user = await async_crud.delete_user(db=db, username=username)
+
+        return db_user
+
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User `{username}` not found."
+        )
@@ -1,4 +1,5 @@
 from fastapi import Depends, APIRouter, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security.oauth2 import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
@@ -10,10 +11,10 @@ router = APIRouter(tags=["Authentication"])
 
 
 @router.post("/login", response_model=schemas.Token)
-def login_user(user_credentials: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
+async def login_user(user_credentials: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
     # Attempt sign in with provided credentials (username and password)
-    db_user: models.User = crud.get_user(
-        db=db, username=user_credentials.username)
+    db_user: models.User = await run_in_threadpool(
+        crud.get_user, db=db, username=user_credentials.username, use_cache=False)
 
     if not db_user:
         # No user with provided username
@@ -22,16 +23,37 @@ def login_user(user_credentials: OAuth2PasswordRequestForm = Depends(), db: Sess
             detail="Email or password is incorrect."
         )
 
-    # Verify password for fetched user
-    if not utils.verify(plain_password=user_credentials.password, hashed_password=db_user.hashed_password):
+    # Return the connection to the pool before waiting on bcrypt
+    username, hashed_password, is_admin, token_version = (
+        db_user.username, db_user.hashed_password, db_user.is_admin, db_user.token_version)
+    await run_in_threadpool(db.close)
+
+    # Verify password for fetched user, off the event loop
+    try:
+        is_valid, new_hash = await utils.verify_and_update_async(
+            plain_password=user_credentials.password, hashed_password=hashed_password)
+
+    except utils.PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy. Please try again shortly.",
+            headers={"Retry-After": "1"}
+        )
+
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Email or password is incorrect."
         )
 
+    # Stored hash uses an outdated cost factor
+    if new_hash is not None:
+        await run_in_threadpool(
+            crud.update_user_password_hash, db=db, username=username, hashed_password=new_hash)
+
     # Create and return access token
     access_token = oauth2.create_access_token(
-        data={"username": db_user.username, "is_admin": db_user.is_admin}
+        data={"username": username, "is_admin": is_admin, "ver": token_version}
     )
 
     return {"access_token": access_token, "token_type": "bearer"}
@@ -0,0 +1,160 @@
+import csv
+import io
+import zlib
+from typing import Literal, Optional
+
+import orjson
+from fastapi import Depends, APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ..db import database, schemas, crud
+from .. import oauth2, utils
+
+
+router = APIRouter(
+    tags=["Exports"],
+    prefix="/projects/{project_id}/export"
+)
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "tsv": "text/tab-separated-values",
+}
+
+PARALLEL_CORPUS_HEADER = [
+    "sentence_id", "source_language", "source_text",
+    "target_language", "target_text", "annotator_username"
+]
+
+
+def _ndjson_lines(corpus):
+    for sentence, translations, recordings in corpus:
+        yield orjson.dumps({
+            "id": sentence.id,
+            "text": sentence.text,
+            "language_iso": sentence.language_iso,
+            "translations": [
+                {
+                    "id": translation.id,
+                    "text": translation.text,
+                    "language_iso": translation.language_iso,
+                    "annotator_username": translation.annotator_username
+                }
+                for translation in translations
+            ],
+            "recordings": [
+                {
+                    "id": recording.id,
+                    "audio_file_path": recording.audio_file_path,
+                    "language_iso": recording.language_iso,
+                    "annotator_username": recording.annotator_username
+                }
+                for recording in recordings
+            ]
+        }) + b"\n"
+
+
+def _parallel_corpus_lines(corpus, delimiter: str):
+    # One row per (sentence, translation) pair
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter, lineterminator="\n")
+
+    writer.writerow(PARALLEL_CORPUS_HEADER)
+    for sentence, translations, _ in corpus:
+        for translation in translations:
+            writer.writerow([
+                sentence.id, sentence.language_iso, sentence.text,
+                translation.language_iso, translation.text, translation.annotator_username
+            ])
+        if buffer.tell() >= 64 * 1024:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode()
+
+
+def _chunked(lines, chunk_size: int = 64 * 1024):
+    # Coalesce small lines into fewer, larger writes
+    chunk = []
+    size = 0
+    for line in lines:
+        chunk.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield b"".join(chunk)
+            chunk, size = [], 0
+
+    if chunk:
+        yield b"".join(chunk)
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+
+    yield compressor.flush()
+
+
+def export_filename(project_id: int, format: str, gzip: bool):
+    filename = f"project-{project_id}.{format}"
+    if gzip:
+        return filename + ".gz", "application/gzip"
+
+    return filename, MEDIA_TYPES[format]
+
+
+def export_chunks(project_id: int, format: str, language_iso: Optional[str], gzip: bool):
+    # The request's session is closed before the body is streamed, so the
+    # export runs on its own session; background export jobs reuse it
+    db = database.SessionLocal()
+    try:
+        corpus = crud.iter_project_corpus(
+            db=db, project_id=project_id, language_iso=language_iso)
+
+        if format == "ndjson":
+            chunks = _chunked(_ndjson_lines(corpus))
+        else:
+            chunks = _parallel_corpus_lines(
+                corpus, delimiter="," if format == "csv" else "\t")
+
+        if gzip:
+            chunks = _gzipped(chunks)
+
+        yield from chunks
+    finally:
+        db.close()
+
+
+# Export project sentences with their translations and recordings
+@router.get("/")
+def export_project(project_id: int, format: Literal["ndjson", "csv", "tsv"] = "ndjson", language_iso: Optional[str] = None, gzip: bool = False, background: bool = False, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.require_project_access())):
+    db_project = crud.get_project(db=db, project_id=project_id)
+
+    if db_project is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such project with id `{project_id}`."
+        )
+
+    # Written to a file by a job worker, downloaded from /jobs/{job_id}/result
+    if background:
+        db_job = crud.create_job(
+            db=db, kind="export_project", username=user.username, project_id=project_id,
+            payload={"format": format, "language_iso": language_iso, "gzip": gzip})
+
+        return utils.accepted_response(schemas.Job.model_validate(db_job).model_dump(), f"/jobs/{db_job.id}/")
+
+    filename, media_type = export_filename(project_id, format, gzip)
+
+    return StreamingResponse(
+        export_chunks(project_id=project_id, format=format,
+                      language_iso=language_iso, gzip=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,80 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
+
+from ..db import database
+from .. import oauth2
+from ..events import feed
+
+
+router = APIRouter(
+    tags=["Feeds"],
+    prefix="/projects/{project_id}/feed"
+)
+
+
+def _authorize(token: str, project_id: int):
+    # Same checks as require_project_access, on a short-lived session since
+    # the socket outlives any request-scoped one
+    db = database.SessionLocal()
+    try:
+        user = oauth2.get_current_user(token=token, db=db)
+        return oauth2.require_project_access()(project_id=project_id, db=db, user=user)
+    finally:
+        db.close()
+
+
+def _bearer_token(websocket: WebSocket, token: Optional[str]):
+    # Browsers cannot set headers on a WebSocket, hence the query parameter
+    if token:
+        return token
+    scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+
+    return credentials if scheme.lower() == "bearer" else None
+
+
+async def _wait_disconnect(websocket: WebSocket):
+    # Clients only listen; anything they send is ignored
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+# Project activity feed; one batched JSON message per coalescing window
+@router.websocket("/")
+async def project_feed(websocket: WebSocket, project_id: int, token: Optional[str] = None):
+    token = _bearer_token(websocket, token)
+    if token is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Missing bearer token.")
+        return
+
+    try:
+        await run_in_threadpool(_authorize, token, project_id)
+
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+        return
+
+    await websocket.accept()
+    subscription = feed.subscribe(project_id)
+    disconnected = asyncio.create_task(_wait_disconnect(websocket))
+    try:
+        while True:
+            message = asyncio.create_task(subscription.queue.get())
+            done, _ = await asyncio.wait({message, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected in done:
+                message.cancel()
+                break
+
+            # A slow client blocks only here; its queue absorbs the backlog
+            await websocket.send_text(message.result())
+
+    except WebSocketDisconnect:
+        pass
+
+    finally:
+        feed.unsubscribe(subscription)
+        disconnected.cancel()
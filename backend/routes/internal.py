@@ -0,0 +1,53 @@
+from fastapi import Depends, APIRouter, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from ..db import database, row_cache, schemas
+from ..db.pool import pool_status
+from .. import cache, metrics, oauth2
+
+
+router = APIRouter(
+    tags=["Internal"],
+    prefix="/internal"
+)
+
+
+def require_admin(user: schemas.User = Depends(oauth2.get_current_user)):
+    if not user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"User `{user.username}` does not have the necessary privileges."
+        )
+
+    return user
+
+
+# Connection pool statistics, per engine
+@router.get("/pool", response_model=dict[str, schemas.PoolStats])
+def get_pool_stats(user: schemas.User = Depends(require_admin)):
+    stats = {"sync": pool_status(database.engine.pool)}
+    if database.async_engine is not None:
+        stats["async"] = pool_status(database.async_engine.sync_engine.pool)
+
+    return stats
+
+
+# Per-route latency and SQL statistics in Prometheus text format
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics(user: schemas.User = Depends(require_admin)):
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+# Hit/miss/eviction counters of the in-process caches
+@router.get("/caches", response_model=dict[str, schemas.CacheStats])
+def get_cache_stats(user: schemas.User = Depends(require_admin)):
+    caches = {
+        "rows": row_cache.backend,
+        "memberships": cache.membership_cache,
+        "principals": cache.principal_cache,
+    }
+
+    stats = {name: backend.stats() for name, backend in caches.items()}
+
+    # Out-of-process backends may not report counters
+    return {name: value for name, value in stats.items() if value}
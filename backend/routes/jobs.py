@@ -0,0 +1,95 @@
+import os
+from typing import Literal, Optional
+
+from fastapi import Depends, APIRouter, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from ..db import database, schemas, crud
+from .. import oauth2, utils
+
+
+router = APIRouter(
+    tags=["Jobs"],
+    prefix="/jobs"
+)
+
+
+def _get_job(db: Session, job_id: int, user: schemas.User):
+    db_job = crud.get_job(db=db, job_id=job_id)
+
+    # Other users' jobs are indistinguishable from missing ones
+    if db_job is None or not (user.is_admin or db_job.username == user.username):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such job with id `{job_id}`."
+        )
+
+    return db_job
+
+
+# Get jobs; admins see everyone's
+@router.get("/", response_model=list[schemas.Job])
+def get_jobs(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, job_status: Optional[Literal["queued", "running", "succeeded", "failed", "cancelled"]] = Query(None, alias="status"), db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.get_current_user)):
+    try:
+        after = utils.decode_cursor(cursor) if cursor else None
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    db_jobs = crud.get_jobs(
+        db=db, skip=skip, limit=limit, after=after, status=job_status,
+        username=None if user.is_admin else user.username
+    )
+
+    # Opaque cursor for the next page, keyed on the last job id
+    if db_jobs and len(db_jobs) == limit:
+        response.headers["X-Next-Cursor"] = utils.encode_cursor(
+            db_jobs[-1].id)
+
+    return db_jobs
+
+
+# Get job status and progress
+@router.get("/{job_id}/", response_model=schemas.Job)
+def get_job(job_id: int, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.get_current_user)):
+    return _get_job(db=db, job_id=job_id, user=user)
+
+
+# Cancel job
+@router.delete("/{job_id}/", response_model=schemas.Job)
+def cancel_job(job_id: int, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.get_current_user)):
+    _get_job(db=db, job_id=job_id, user=user)
+
+    try:
+        return crud.cancel_job(db=db, job_id=job_id)
+
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such job with id `{job_id}`."
+        )
+
+
+# Download the file written by a finished export job
+@router.get("/{job_id}/result")
+def get_job_result(job_id: int, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.get_current_user)):
+    db_job = _get_job(db=db, job_id=job_id, user=user)
+
+    if db_job.kind != "export_project" or db_job.status != "succeeded":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job with id `{job_id}` has no file to download (status `{db_job.status}`)."
+        )
+
+    path = os.path.join(database.settings.exports_dir, db_job.result["path"])
+    if not os.path.isfile(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Export file for job with id `{job_id}` is missing."
+        )
+
+    return FileResponse(path, media_type=db_job.result["media_type"], filename=db_job.result["filename"])
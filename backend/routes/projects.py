@@ -1,8 +1,10 @@
-from fastapi import Depends, APIRouter, HTTPException, status
+from fastapi import Depends, APIRouter, Header, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
+from typing import Optional
 
 from ..db import database, schemas, crud
-from .. import oauth2
+from .. import oauth2, utils
 
 
 router = APIRouter(
@@ -32,30 +34,85 @@ def create_project(project: schemas.ProjectCreate, db: Session = Depends(databas
     return crud.create_project(db=db, project=project)
 
 
+def _select_fields(fields: Optional[str], include: Optional[str], default):
+    try:
+        return utils.select_fields(fields, include, allowed=list(schemas.Project.model_fields), default=default)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+# Get set of projects
+# Admins see every project, annotators only the ones they have a role in
+@router.get("/", response_model=list[schemas.Project])
+def get_projects(skip: int = 0, limit: int = 10, cursor: Optional[str] = None, fields: Optional[str] = None, include: Optional[str] = None, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.get_current_user)):
+    selected = _select_fields(fields, include, default=list(schemas.ProjectSummary.model_fields))
+
+    try:
+        after = utils.decode_cursor(cursor) if cursor else None
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    username = None if user.is_admin else user.username
+
+    if "annotators" not in selected:
+        # No annotators requested, so skip the roles -> users join entirely
+        rows = crud.get_project_rows(db=db, skip=skip, limit=limit, after=after, username=username)
+        headers = {"X-Next-Cursor": utils.encode_cursor(rows[-1]["id"])} if rows and len(rows) == limit else None
+
+        return utils.rows_response(rows, headers=headers, fields=selected)
+
+    projects = crud.get_projects(db=db, skip=skip, limit=limit, after=after, username=username, include_annotators=True)
+    headers = {"X-Next-Cursor": utils.encode_cursor(projects[-1].id)} if projects and len(projects) == limit else None
+
+    return ORJSONResponse([
+        schemas.Project.model_validate(project).model_dump(include=set(selected)) for project in projects
+    ], headers=headers)
+
+
 # Get project
+# Only admin or annotators of project can access the project
 @router.get("/{project_id}/", response_model=schemas.Project)
-def get_project(project_id: int, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.get_current_user)):
-    db_project = crud.get_project(db=db, project_id=project_id)
+def get_project(project_id: int, fields: Optional[str] = None, include: Optional[str] = None, if_none_match: Optional[str] = Header(None), db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.require_project_access())):
+    selected = _select_fields(fields, include, default=list(schemas.Project.model_fields))
+    with_annotators = "annotators" in selected
 
-    if db_project is None:
+    version = crud.get_project_version(db=db, project_id=project_id)
+
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No such project with id `{project_id}`."
         )
 
-    # Only admin or annotators of project can access the project
-    if not user.is_admin or user.username not in [annotator.username for annotator in db_project.annotators]:
+    etag = utils.version_etag(project_id, version)
+    if utils.etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    db_project = crud.get_project(db=db, project_id=project_id, include_annotators=with_annotators)
+
+    if db_project is None:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"User `{user.username}` does not have the necessary privileges."
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such project with id `{project_id}`."
         )
 
-    return db_project
+    # ProjectSummary never touches `annotators`, so nothing lazy-loads
+    schema = schemas.Project if with_annotators else schemas.ProjectSummary
+
+    return ORJSONResponse(schema.model_validate(db_project).model_dump(include=set(selected)), headers={"ETag": etag})
 
 
 # Delete Project
 @router.delete("/{project_id}/", response_model=schemas.Project)
-def delete_project(project_id: int, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.get_current_user)):
+def delete_project(project_id: int, background: bool = False, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.get_current_user)):
     # Only admins can delete projects
     if not user.is_admin:
         raise HTTPException(
@@ -63,6 +120,19 @@ def delete_project(project_id: int, db: Session = Depends(database.get_db), user
             detail=f"User `{user.username}` does not have the necessary privileges."
         )
 
+    # Sentences and their translations and recordings are purged in batches
+    # by a job worker, then the project itself is deleted
+    if background:
+        if crud.get_project(db=db, project_id=project_id) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No such project with id `{project_id}`."
+            )
+        db_job = crud.create_job(
+            db=db, kind="delete_project", username=user.username, project_id=project_id)
+
+        return utils.accepted_response(schemas.Job.model_validate(db_job).model_dump(), f"/jobs/{db_job.id}/")
+
     try:
         db_project = crud.delete_project(db=db, project_id=project_id)
 
@@ -0,0 +1,136 @@
+import os
+
+from fastapi import Depends, APIRouter, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session
+
+from ..db import database, schemas, crud
+from .. import oauth2, storage
+
+
+router = APIRouter(
+    tags=["Recordings"],
+    prefix="/projects/{project_id}/sentences/{sentence_id}/recordings"
+)
+
+
+def _get_sentence_recording(db: Session, project_id: int, sentence_id: int, recording_id: int):
+    db_sentence = crud.get_project_sentence(
+        db=db, project_id=project_id, src_sentence_id=sentence_id)
+
+    if db_sentence is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such sentence with id `{sentence_id}` found in project with id `{project_id}`."
+        )
+
+    db_recording = crud.get_recording(db=db, recording_id=recording_id)
+
+    if db_recording is None or db_recording.src_sentence_id != sentence_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such recording with id `{recording_id}` found for sentence with id `{sentence_id}`."
+        )
+
+    return db_recording
+
+
+# Upload recording; the request body is the raw audio stream
+@router.post("/", response_model=schemas.Recording)
+async def create_recording(project_id: int, sentence_id: int, language_iso: str, request: Request, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.require_project_access())):
+    db_sentence = await run_in_threadpool(
+        crud.get_project_sentence, db=db, project_id=project_id, src_sentence_id=sentence_id)
+
+    if db_sentence is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such sentence with id `{sentence_id}` found in project with id `{project_id}`."
+        )
+
+    # Return the connection to the pool for the length of the upload; the
+    # insert below checks one out again
+    await run_in_threadpool(db.close)
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    extension = storage.AUDIO_EXTENSIONS.get(content_type)
+
+    if extension is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported audio type `{content_type}`. Expects one of {sorted(storage.AUDIO_EXTENSIONS)}."
+        )
+
+    try:
+        relative_path, _, _ = await storage.store_audio_stream(
+            request.stream(), extension=extension, max_bytes=database.settings.recording_max_bytes)
+
+    except storage.UploadTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+
+    recording = schemas.RecordingCreate(
+        audio_file_path=relative_path, language_iso=language_iso, annotator_username=user.username)
+
+    return await run_in_threadpool(
+        crud.create_recording, db=db, src_sentence_id=sentence_id, recording=recording)
+
+
+# Get recording metadata
+@router.get("/{recording_id}", response_model=schemas.Recording)
+def get_recording(project_id: int, sentence_id: int, recording_id: int, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.require_project_access())):
+    return _get_sentence_recording(db=db, project_id=project_id, sentence_id=sentence_id, recording_id=recording_id)
+
+
+# Download recording audio, honouring single `Range` requests
+@router.get("/{recording_id}/audio")
+def get_recording_audio(project_id: int, sentence_id: int, recording_id: int, request: Request, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.require_project_access())):
+    db_recording = _get_sentence_recording(
+        db=db, project_id=project_id, sentence_id=sentence_id, recording_id=recording_id)
+
+    path = storage.audio_path(db_recording.audio_file_path)
+    media_type = storage.MEDIA_TYPES.get(
+        os.path.splitext(path)[1], "application/octet-stream")
+
+    # Hand the transfer (ranges included) to the fronting proxy
+    accel_prefix = database.settings.recordings_accel_redirect_prefix
+    if accel_prefix:
+        return Response(
+            media_type=media_type,
+            headers={"X-Accel-Redirect": accel_prefix.rstrip("/") + "/" + db_recording.audio_file_path}
+        )
+
+    if not os.path.isfile(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Audio for recording with id `{recording_id}` is missing."
+        )
+
+    file_size = os.path.getsize(path)
+    range_header = request.headers.get("range")
+    try:
+        byte_range = storage.parse_range(range_header, file_size) if range_header else None
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail=str(e),
+            headers={"Content-Range": f"bytes */{file_size}"}
+        )
+
+    if byte_range is None:
+        return FileResponse(path, media_type=media_type, headers={"Accept-Ranges": "bytes"})
+
+    start, end = byte_range
+    return StreamingResponse(
+        storage.iter_file_range(path, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers={
+            "Accept-Ranges": "bytes",
+            "Content-Range": f"bytes {start}-{end}/{file_size}",
+            "Content-Length": str(end - start + 1)
+        }
+    )
@@ -0,0 +1,38 @@
+from fastapi import Depends, APIRouter, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+from typing import Literal, Optional
+
+from ..db import database, schemas, crud
+from .. import oauth2, utils
+
+
+router = APIRouter(
+    tags=["Search"],
+    prefix="/projects/{project_id}/search"
+)
+
+
+# Search sentences or translations of a project
+@router.get("/", response_model=list[schemas.SearchHit])
+def search_project(project_id: int, response: Response, q: str = Query(min_length=1), target: Literal["sentences", "translations"] = "sentences", language_iso: Optional[str] = None, limit: int = Query(default=20, ge=1, le=100), cursor: Optional[str] = None, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.require_project_access())):
+    try:
+        after = utils.decode_cursor(cursor, key_type=list) if cursor else None
+        if after is not None and (len(after) != 2 or not isinstance(after[0], (int, float)) or type(after[1]) is not int):
+            raise ValueError(f"Invalid cursor `{cursor}`.")
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    hits = crud.search_project(
+        db=db, project_id=project_id, q=q, target=target,
+        language_iso=language_iso, limit=limit, after=after)
+
+    # Opaque cursor for the next page, keyed on the last (rank, id)
+    if hits and len(hits) == limit:
+        response.headers["X-Next-Cursor"] = utils.encode_cursor(
+            [hits[-1].rank, hits[-1].id])
+
+    return hits
@@ -1,8 +1,10 @@
-from fastapi import Depends, APIRouter, HTTPException, status
+from fastapi import Depends, APIRouter, Header, HTTPException, Response, status
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from typing import Literal, Optional
 
-from ..db import database, schemas, crud
-from .. import oauth2
+from ..db import database, schemas, crud, dedupe
+from .. import oauth2, utils
 
 
 router = APIRouter(
@@ -13,7 +15,7 @@ router = APIRouter(
 
 # Create sentences
 @router.post("/", response_model=list[schemas.Sentence])
-def create_sentence(project_id: int, sentences: list[schemas.SentenceCreate], db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.get_current_user)):
+def create_sentence(project_id: int, sentences: list[schemas.SentenceCreate], on_duplicate: Literal["reject", "skip", "existing"] = "existing", background: bool = False, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.get_current_user)):
     # Only admins can create sentences
     if not user.is_admin:
         raise HTTPException(
@@ -37,17 +39,37 @@ def create_sentence(project_id: int, sentences: list[schemas.SentenceCreate], db
             detail=f"Expects object of type `list`. Got `{type(sentences)} instead.`"
         )
 
-    created_sentences = []
-    for sentence in sentences:
-        created_sentences.append(crud.create_sentence(
-            db=db, sentence=sentence, project_id=project_id))
+    # Large uploads are imported by a job worker in committed batches; with
+    # "reject", batches before the offending one stay imported
+    if background:
+        db_job = crud.create_job(
+            db=db, kind="import_sentences", username=user.username, project_id=project_id,
+            payload={"sentences": [sentence.model_dump() for sentence in sentences], "on_duplicate": on_duplicate},
+            total=len(sentences))
 
-    return created_sentences
+        return utils.accepted_response(schemas.Job.model_validate(db_job).model_dump(), f"/jobs/{db_job.id}/")
+
+    # Insert the whole batch in one transaction
+    try:
+        return crud.create_sentences(db=db, sentences=sentences, project_id=project_id, on_duplicate=on_duplicate)
+
+    except dedupe.DuplicateSentenceError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+
+    except IntegrityError:
+        # A concurrent import stored the same sentence first
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Some sentences were created concurrently. Please retry."
+        )
 
 
 # Get sentence
 @router.get("/{sentence_id}", response_model=schemas.Sentence)
-def get_sentence(project_id: int, sentence_id: int, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.get_current_user)):
+def get_sentence(project_id: int, sentence_id: int, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.require_project_access())):
     db_project = crud.get_project(db=db, project_id=project_id)
 
     if db_project is None:
@@ -56,12 +78,6 @@ def get_sentence(project_id: int, sentence_id: int, db: Session = Depends(databa
             detail=f"No such project with id `{project_id}`."
         )
 
-    if not (user.is_admin or user.username in [annotator.username for annotator in db_project.annotators]):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"User `{user.username} is is not authorized to access project with id `{project_id}`."
-        )
-
     db_sentence = crud.get_sentence(db=db, sentence_id=sentence_id)
 
     if db_sentence is None or db_sentence.project_id != project_id:
@@ -75,19 +91,47 @@ def get_sentence(project_id: int, sentence_id: int, db: Session = Depends(databa
 
 # Get a set of sentences
 @router.get("/", response_model=list[schemas.Sentence])
-def get_sentences(project_id: int, skip: int = 0, limit: int = 10, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.get_current_user)):
-    db_project = crud.get_project(db=db, project_id=project_id)
+def get_sentences(project_id: int, response: Response, skip: int = 0, limit: int = 10, cursor: Optional[str] = None, if_none_match: Optional[str] = Header(None), db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.require_project_access())):
+    try:
+        after = utils.decode_cursor(cursor) if cursor else None
 
-    if db_project is None:
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"No such project with id `{project_id}`."
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
 
-    if not (user.is_admin or user.username in [annotator.username for annotator in db_project.annotators]):
+    # The version is read before the page, so a concurrent write can only
+    # make the ETag stale (costing a later 200), never newer than the data
+    version = crud.get_project_version(db=db, project_id=project_id)
+
+    if version is None:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"User `{user.username} is is not authorized to access project with id `{project_id}`."
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such project with id `{project_id}`."
         )
 
-    return crud.get_project_sentences(db=db, project_id=project_id, skip=skip, limit=limit)
+    etag = utils.version_etag(project_id, version)
+    if utils.etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    if "sentences" in database.settings.fast_list_routes:
+        rows = crud.get_project_sentence_rows(
+            db=db, project_id=project_id, skip=skip, limit=limit, after=after)
+        headers = {"ETag": etag}
+        if rows and len(rows) == limit:
+            headers["X-Next-Cursor"] = utils.encode_cursor(rows[-1]["id"])
+
+        return utils.rows_response(rows, headers=headers)
+
+    db_sentences = crud.get_project_sentences(
+        db=db, project_id=project_id, skip=skip, limit=limit, after=after)
+
+    response.headers["ETag"] = etag
+
+    # Opaque cursor for the next page, keyed on the last sentence id
+    if db_sentences and len(db_sentences) == limit:
+        response.headers["X-Next-Cursor"] = utils.encode_cursor(
+            db_sentences[-1].id)
+
+    return db_sentences
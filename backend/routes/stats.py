@@ -0,0 +1,25 @@
+from fastapi import Depends, APIRouter, HTTPException, status
+from sqlalchemy.orm import Session
+
+from ..db import database, schemas, crud
+from .. import oauth2
+
+
+router = APIRouter(
+    tags=["Statistics"],
+    prefix="/projects/{project_id}/stats"
+)
+
+
+# Get project progress, read from incrementally maintained counters
+@router.get("/", response_model=schemas.ProjectStats)
+def get_project_stats(project_id: int, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.require_project_access())):
+    db_project = crud.get_project(db=db, project_id=project_id)
+
+    if db_project is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such project with id `{project_id}`."
+        )
+
+    return crud.get_project_stats(db=db, project_id=project_id)
@@ -0,0 +1,37 @@
+from fastapi import Depends, APIRouter, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session
+
+from ..db import database, schemas, crud
+from ..translation_memory import translation_memory
+from .. import oauth2
+
+
+router = APIRouter(
+    tags=["Suggestions"],
+    prefix="/projects/{project_id}/sentences/{sentence_id}/suggestions"
+)
+
+
+# Closest already-translated sentences of the project, with their translations;
+# 202 with no suggestions while the project's index is still being built
+@router.get("/", response_model=list[schemas.Suggestion])
+def get_suggestions(project_id: int, sentence_id: int, language_iso: str, limit: int = Query(default=5, ge=1, le=50), db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.require_project_access())):
+    db_sentence = crud.get_project_sentence(
+        db=db, project_id=project_id, src_sentence_id=sentence_id)
+
+    if db_sentence is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such sentence with id `{sentence_id}` found in project with id `{project_id}`."
+        )
+
+    index = translation_memory.index(
+        project_id=project_id, source_iso=db_sentence.language_iso, target_iso=language_iso)
+
+    suggestions = index.suggest(db=db, text=db_sentence.text, exclude_id=db_sentence.id, limit=limit)
+
+    if suggestions is None:
+        return ORJSONResponse([], status_code=status.HTTP_202_ACCEPTED, headers={"Retry-After": "1"})
+
+    return suggestions
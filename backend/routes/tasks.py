@@ -0,0 +1,42 @@
+from fastapi import Depends, APIRouter, HTTPException, status
+from sqlalchemy.orm import Session
+
+from ..db import database, schemas, crud
+from .. import oauth2
+
+
+router = APIRouter(
+    tags=["Tasks"],
+    prefix="/projects/{project_id}/tasks"
+)
+
+
+# Check out the next sentence(s) needing work
+@router.post("/next", response_model=list[schemas.TaskLease])
+def checkout_tasks(project_id: int, checkout: schemas.TaskCheckout, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.require_project_access())):
+    db_project = crud.get_project(db=db, project_id=project_id)
+
+    if db_project is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such project with id `{project_id}`."
+        )
+
+    return crud.lease_next_sentences(
+        db=db, project_id=project_id, username=user.username,
+        language_iso=checkout.language_iso, task_type=checkout.task_type,
+        count=checkout.count, lease_seconds=database.settings.task_lease_seconds
+    )
+
+
+# Give a leased task back before it expires
+@router.delete("/{lease_id}", status_code=status.HTTP_204_NO_CONTENT)
+def release_task(project_id: int, lease_id: int, db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.require_project_access())):
+    try:
+        crud.delete_task_lease(db=db, lease_id=lease_id, username=user.username)
+
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such task lease with id `{lease_id}` held by user `{user.username}`."
+        )
@@ -0,0 +1,49 @@
+from fastapi import Depends, APIRouter, HTTPException, status
+from sqlalchemy.orm import Session
+
+from ..db import database, schemas, crud
+from .. import oauth2
+
+
+router = APIRouter(
+    tags=["Translations"],
+    prefix="/projects/{project_id}/translations"
+)
+
+
+# Submit many translations across a project's sentences at once
+@router.post("/batch", response_model=list[schemas.TranslationSubmissionResult])
+def submit_translations(project_id: int, submissions: list[schemas.TranslationSubmission], db: Session = Depends(database.get_db), user: schemas.User = Depends(oauth2.require_project_access())):
+    if len(submissions) > database.settings.translation_batch_max:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Expects at most {database.settings.translation_batch_max} translations per batch. Got {len(submissions)}."
+        )
+
+    db_project = crud.get_project(db=db, project_id=project_id)
+
+    if db_project is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No such project with id `{project_id}`."
+        )
+
+    # Validate every referenced sentence with a single query
+    known_ids = crud.get_project_sentence_ids(
+        db=db, project_id=project_id, sentence_ids=[submission.sentence_id for submission in submissions])
+
+    accepted = [
+        (submission.sentence_id, schemas.TranslationCreate(
+            text=submission.text, language_iso=submission.language_iso, annotator_username=user.username))
+        for submission in submissions if submission.sentence_id in known_ids
+    ]
+
+    # All accepted rows are inserted in one transaction
+    created = iter(crud.create_translations(db=db, translations=accepted))
+
+    return [
+        {"sentence_id": submission.sentence_id, "status": "created", "translation": next(created)}
+        if submission.sentence_id in known_ids else
+        {"sentence_id": submission.sentence_id, "status": "not_found"}
+        for submission in submissions
+    ]
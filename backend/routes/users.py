@@ -1,7 +1,10 @@
-from fastapi import Depends, APIRouter, HTTPException, status
+from fastapi import Depends, APIRouter, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from typing import Optional
 
 from ..db import database, schemas, crud
+from .. import utils
 
 
 router = APIRouter(
@@ -12,8 +15,8 @@ router = APIRouter(
 
 # Create user
 @router.post("/", response_model=schemas.User)
-def create_user(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
-    db_user = crud.get_user(db=db, username=user.username)
+async def create_user(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
+    db_user = await run_in_threadpool(crud.get_user, db=db, username=user.username)
 
     if db_user:
         raise HTTPException(
@@ -21,7 +24,20 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(database.get_db)
             detail=f"Username `{user.username}` is already taken."
         )
 
-    return crud.create_user(db=db, user=user)
+    # Return the connection to the pool before waiting on bcrypt
+    await run_in_threadpool(db.close)
+
+    try:
+        hashed_password = await utils.hash_password_async(user.password)
+
+    except utils.PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy. Please try again shortly.",
+            headers={"Retry-After": "1"}
+        )
+
+    return await run_in_threadpool(crud.create_user, db=db, user=user, hashed_password=hashed_password)
 
 
 # Get specific user
@@ -40,17 +56,51 @@ def get_user(username: str, db: Session = Depends(database.get_db)):
 
 # Get set of users
 @router.get("/", response_model=list[schemas.User])
-def get_users(skip: int = 0, limit: int = 10, db: Session = Depends(database.get_db)):
-    users = crud.get_users(db=db, skip=skip, limit=limit)
+def get_users(response: Response, skip: int = 0, limit: int = 10, cursor: Optional[str] = None, db: Session = Depends(database.get_db)):
+    try:
+        after = utils.decode_cursor(cursor, key_type=str) if cursor else None
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    if "users" in database.settings.fast_list_routes:
+        rows = crud.get_user_rows(db=db, skip=skip, limit=limit, after=after)
+        headers = {"X-Next-Cursor": utils.encode_cursor(rows[-1]["username"])} if rows and len(rows) == limit else None
+
+        return utils.rows_response(rows, headers=headers)
+
+    users = crud.get_users(db=db, skip=skip, limit=limit, after=after)
+
+    # Opaque cursor for the next page, keyed on the last username
+    if users and len(users) == limit:
+        response.headers["X-Next-Cursor"] = utils.encode_cursor(
+            users[-1].username)
 
     return users
 
 
 # Update user
 @router.put("/{username}/", response_model=schemas.User)
-def update_user(user: schemas.UserUpdate, username: str, db: Session = Depends(database.get_db)):
+async def update_user(user: schemas.UserUpdate, username: str, db: Session = Depends(database.get_db)):
+    # Hashed before any database work, so no connection waits on bcrypt
+    hashed_password = None
+    if user.password is not None:
+        try:
+            hashed_password = await utils.hash_password_async(user.password)
+
+        except utils.PasswordHasherBusy:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy. Please try again shortly.",
+                headers={"Retry-After": "1"}
+            )
+
     try:
-        db_user = crud.update_user(db=db, username=username, user=user)
+        db_user = await run_in_threadpool(
+            crud.update_user, db=db, username=username, user=user, hashed_password=hashed_password)
 
         return db_user
 
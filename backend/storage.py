@@ -0,0 +1,116 @@
+import hashlib
+import os
+import uuid
+
+import anyio
+
+from .config import Settings
+
+
+settings = Settings()
+
+# Accepted upload content types -> stored file extension
+AUDIO_EXTENSIONS = {
+    "audio/wav": ".wav",
+    "audio/wave": ".wav",
+    "audio/x-wav": ".wav",
+    "audio/flac": ".flac",
+    "audio/x-flac": ".flac",
+    "audio/ogg": ".opus",
+    "audio/opus": ".opus",
+}
+
+MEDIA_TYPES = {
+    ".wav": "audio/wav",
+    ".flac": "audio/flac",
+    ".opus": "audio/ogg",
+}
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def audio_path(relative_path: str):
+    return os.path.join(settings.recordings_dir, relative_path)
+
+
+async def store_audio_stream(chunks, extension: str, max_bytes: int):
+    """Writes an async byte stream to content-addressed storage.
+
+    The body is never held in memory: chunks are hashed and appended to a
+    temporary file as they arrive, which is then renamed to
+    `<sha256[:2]>/<sha256[2:4]>/<sha256><extension>`. Returns the path
+    relative to `settings.recordings_dir`, the digest and the size.
+    """
+    tmp_dir = os.path.join(settings.recordings_dir, "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    tmp_path = os.path.join(tmp_dir, uuid.uuid4().hex)
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with await anyio.open_file(tmp_path, "wb") as f:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(
+                        f"Upload exceeds the limit of {max_bytes} bytes.")
+                digest.update(chunk)
+                await f.write(chunk)
+
+        sha256 = digest.hexdigest()
+        relative_path = os.path.join(
+            sha256[:2], sha256[2:4], sha256 + extension)
+        os.makedirs(os.path.dirname(audio_path(relative_path)), exist_ok=True)
+        # Identical content is stored once; a rename over it is harmless
+        os.replace(tmp_path, audio_path(relative_path))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return relative_path, sha256, size
+
+
+def parse_range(header: str, file_size: int):
+    """Parses a single `bytes=` range into inclusive (start, end) offsets.
+
+    Returns None when the header should be ignored (the full file is sent)
+    and raises ValueError when the range cannot be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+
+    start, _, end = spec.strip().partition("-")
+    try:
+        if start == "":
+            # Suffix range: the last `end` bytes
+            length = int(end)
+            if length <= 0:
+                raise ValueError
+            start, end = max(file_size - length, 0), file_size - 1
+        else:
+            start = int(start)
+            end = int(end) if end else file_size - 1
+            end = min(end, file_size - 1)
+    except ValueError:
+        raise ValueError(f"Invalid range `{header}`.")
+
+    if start > end or start >= file_size:
+        raise ValueError(f"Unsatisfiable range `{header}`.")
+
+    return start, end
+
+
+def iter_file_range(path: str, start: int, end: int, chunk_size: int = 64 * 1024):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
@@ -0,0 +1,243 @@
+import logging
+import random
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session
+
+from .config import Settings
+from .db import models
+from .db.database import SessionLocal
+from .db.dedupe import normalize_text
+
+
+settings = Settings()
+logger = logging.getLogger(__name__)
+
+_MASK = (1 << 64) - 1
+
+
+def shingles(text: str, n: int):
+    # Character n-grams of the normalized text; short texts are one shingle
+    text = normalize_text(text)
+    if len(text) <= n:
+        return {text}
+
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def similarity(a: set, b: set):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class MinHashLSH:
+    """MinHash signatures over character n-grams, bucketed with LSH banding.
+
+    Each permutation is approximated by XOR-ing the shingle hash with a
+    random 64-bit mask, which keeps signing cheap in pure Python. Two texts
+    become candidates when all rows of at least one band agree.
+    """
+
+    def __init__(self, num_perm: int, bands: int, ngram: int, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("`num_perm` must be a multiple of `bands`.")
+        rng = random.Random(seed)
+        self.masks = [rng.getrandbits(64) for _ in range(num_perm)]
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        self.buckets = [{} for _ in range(bands)]
+        self.ids = set()
+
+    def _band_keys(self, text: str):
+        hashes = [hash(shingle) & _MASK for shingle in shingles(text, self.ngram)]
+        signature = [min(h ^ mask for h in hashes) for mask in self.masks]
+
+        return [hash(tuple(signature[band * self.rows:(band + 1) * self.rows]))
+                for band in range(self.bands)]
+
+    def add(self, item_id: int, text: str):
+        if item_id in self.ids:
+            return
+        self.ids.add(item_id)
+        for bucket, key in zip(self.buckets, self._band_keys(text)):
+            bucket.setdefault(key, []).append(item_id)
+
+    def query(self, text: str, max_candidates: int):
+        # Candidates sharing the most bands first
+        matches = Counter()
+        for bucket, key in zip(self.buckets, self._band_keys(text)):
+            matches.update(bucket.get(key, ()))
+
+        return [item_id for item_id, _ in matches.most_common(max_candidates)]
+
+
+class ProjectIndex:
+    """Fuzzy-match index of one project's `source_iso` sentences translated into `target_iso`.
+
+    Built once by `build` off the request path; until then `suggest` answers
+    None. Afterwards each query first adds the sentences translated since.
+    """
+
+    def __init__(self, project_id: int, source_iso: str, target_iso: str):
+        self.project_id = project_id
+        self.source_iso = source_iso
+        self.target_iso = target_iso
+        self.lsh = MinHashLSH(
+            num_perm=settings.tm_num_perm, bands=settings.tm_bands, ngram=settings.tm_ngram)
+        self.pending = set()
+        self.pending_lock = threading.Lock()
+        self.lock = threading.Lock()
+        self.built = False
+        # Set once evicted, so an unfinished build stops early
+        self.dropped = False
+
+    @property
+    def size(self):
+        return len(self.lsh.ids)
+
+    def _sentences(self, db: Session, sentence_ids=None):
+        translated = exists().where(models.Translation.src_sentence_id == models.Sentence.id).where(
+            models.Translation.language_iso == self.target_iso)
+        query = select(models.Sentence.id, models.Sentence.text).where(
+            models.Sentence.project_id == self.project_id).where(
+            models.Sentence.language_iso == self.source_iso).where(translated)
+        if sentence_ids is not None:
+            query = query.where(models.Sentence.id.in_(sentence_ids))
+
+        return db.execute(query.execution_options(yield_per=10000))
+
+    def build(self, db: Session, max_sentences: int):
+        with self.lock:
+            with self.pending_lock:
+                self.pending.clear()
+            for sentence in self._sentences(db):
+                if self.dropped:
+                    return
+                if self.size >= max_sentences:
+                    logger.warning("Translation memory for project %s (%s -> %s) truncated at %d sentences",
+                                   self.project_id, self.source_iso, self.target_iso, max_sentences)
+                    break
+                self.lsh.add(sentence.id, sentence.text)
+            self.built = True
+
+    def refresh(self, db: Session):
+        # Only sentences translated since the build; a handful per query
+        with self.lock:
+            with self.pending_lock:
+                sentence_ids, self.pending = self.pending, set()
+            if sentence_ids:
+                for sentence in self._sentences(db, sentence_ids):
+                    self.lsh.add(sentence.id, sentence.text)
+
+    def suggest(self, db: Session, text: str, exclude_id: int, limit: int):
+        # None while the index is still being built
+        if not self.built:
+            return None
+        self.refresh(db)
+        candidate_ids = [sentence_id for sentence_id in self.lsh.query(text, settings.tm_max_candidates)
+                         if sentence_id != exclude_id]
+        if not candidate_ids:
+            return []
+
+        rows = db.execute(
+            select(models.Sentence.id, models.Sentence.text, models.Translation)
+            .join(models.Translation, models.Translation.src_sentence_id == models.Sentence.id)
+            .where(models.Sentence.id.in_(candidate_ids))
+            .where(models.Translation.language_iso == self.target_iso)
+            .order_by(models.Sentence.id, models.Translation.id)
+        ).all()
+
+        # Rerank candidates on exact n-gram overlap
+        query_shingles = shingles(text, self.lsh.ngram)
+        suggestions = {}
+        for sentence_id, sentence_text, translation in rows:
+            if sentence_id not in suggestions:
+                score = similarity(query_shingles, shingles(sentence_text, self.lsh.ngram))
+                suggestions[sentence_id] = {
+                    "sentence_id": sentence_id, "text": sentence_text,
+                    "score": score, "translations": []
+                }
+            suggestions[sentence_id]["translations"].append(translation)
+
+        ranked = sorted((suggestion for suggestion in suggestions.values()
+                         if suggestion["score"] >= settings.tm_min_score),
+                        key=lambda suggestion: (-suggestion["score"], suggestion["sentence_id"]))
+
+        return ranked[:limit]
+
+
+class TranslationMemory:
+    """Process-wide registry of project indexes.
+
+    Indexes are built on a small background executor, never by the request
+    that first asks for one. Once the indexes hold more than `max_sentences`
+    sentences in total, the least recently used are evicted.
+    """
+
+    def __init__(self, max_sentences: int, build_workers: int):
+        self.max_sentences = max_sentences
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=build_workers, thread_name_prefix="tm-build")
+
+    def index(self, project_id: int, source_iso: str, target_iso: str):
+        key = (project_id, source_iso, target_iso)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = self._indexes[key] = ProjectIndex(
+                    project_id, source_iso, target_iso)
+                self._executor.submit(self._build, key, index)
+            self._indexes.move_to_end(key)
+
+            return index
+
+    def _build(self, key, index: ProjectIndex):
+        db = SessionLocal()
+        try:
+            index.build(db, self.max_sentences)
+
+        except Exception:
+            logger.exception("Building translation memory for project %s (%s -> %s) failed", *key)
+            # Forgotten, so the next query schedules another build
+            with self._lock:
+                if self._indexes.get(key) is index:
+                    del self._indexes[key]
+            return
+
+        finally:
+            db.close()
+
+        self._evict()
+
+    def _evict(self):
+        # The most recently used index stays, however large
+        with self._lock:
+            total = sum(index.size for index in self._indexes.values())
+            while total > self.max_sentences and len(self._indexes) > 1:
+                _, index = self._indexes.popitem(last=False)
+                index.dropped = True
+                total -= index.size
+
+    def notify_translated(self, project_id: int, keys):
+        # (sentence_id, target_iso) pairs committed for a project; loaded
+        # indexes pick them up on their next query
+        with self._lock:
+            indexes = [index for (index_project_id, _, _), index in self._indexes.items()
+                       if index_project_id == project_id]
+        for index in indexes:
+            with index.pending_lock:
+                index.pending.update(sentence_id for sentence_id, target_iso in keys
+                                     if target_iso == index.target_iso)
+
+    def drop_project(self, project_id: int):
+        with self._lock:
+            for key in [key for key in self._indexes if key[0] == project_id]:
+                self._indexes.pop(key).dropped = True
+
+
+translation_memory = TranslationMemory(
+    max_sentences=settings.tm_max_sentences, build_workers=settings.tm_build_workers)
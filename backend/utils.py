@@ -1,7 +1,24 @@
+import asyncio
+import base64
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi.responses import ORJSONResponse
 from passlib.context import CryptContext
 
+from .config import Settings
+
+
+settings = Settings()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with a different cost are flagged by `needs_update`
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto",
+    bcrypt__default_rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds,
+    bcrypt__max_rounds=settings.bcrypt_rounds
+)
 
 
 def hash_password(password: str):
@@ -10,3 +27,138 @@ def hash_password(password: str):
 
 def verify(plain_password: str, hashed_password: str):
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update(plain_password: str, hashed_password: str):
+    # Returns (is_valid, new_hash); new_hash is set when the cost has changed
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+# Bounded executor keeping bcrypt off the event loop
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(
+    settings.password_hash_workers + settings.password_hash_queue_limit)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            if settings.password_hash_executor == "process":
+                _executor = ProcessPoolExecutor(
+                    max_workers=settings.password_hash_workers)
+            else:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.password_hash_workers,
+                    thread_name_prefix="password-hash")
+
+    return _executor
+
+
+async def _run_hasher(fn, *args):
+    # Reject instead of queueing without bound once workers and queue are full
+    if not _slots.acquire(blocking=False):
+        raise PasswordHasherBusy("Password hashing executor is saturated.")
+
+    try:
+        future = _get_executor().submit(fn, *args)
+    except Exception:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password_async(password: str):
+    return await _run_hasher(hash_password, password)
+
+
+async def verify_and_update_async(plain_password: str, hashed_password: str):
+    return await _run_hasher(verify_and_update, plain_password, hashed_password)
+
+
+def shutdown_password_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+# Fast serialization for column-projected rows
+
+def rows_response(rows, headers: dict | None = None, fields: list[str] | None = None):
+    # Rows are already shaped like the response schema, so skip validation
+    if fields is not None:
+        return ORJSONResponse([{field: row[field] for field in fields} for row in rows], headers=headers)
+
+    return ORJSONResponse([dict(row) for row in rows], headers=headers)
+
+
+def accepted_response(content: dict, location: str):
+    # 202 for work handed off to a background job, polled at `location`
+    return ORJSONResponse(content, status_code=202, headers={"Location": location})
+
+
+# Sparse fieldsets
+
+def select_fields(fields: str | None, include: str | None, allowed, default) -> list[str]:
+    # `fields` replaces the default selection, `include` adds to it
+    selected = set(default)
+    if fields:
+        selected = {field.strip() for field in fields.split(",") if field.strip()}
+    if include:
+        selected |= {field.strip() for field in include.split(",") if field.strip()}
+
+    unknown = selected.difference(allowed)
+    if unknown:
+        raise ValueError(
+            f"Unknown fields {', '.join(f'`{field}`' for field in sorted(unknown))}.")
+
+    # Keep the schema's field order in responses
+    return [field for field in allowed if field in selected]
+
+
+# Conditional requests
+
+def version_etag(project_id: int, version: int):
+    # Weak: the same version may be rendered with different serializers
+    return f'W/"{project_id}.{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str):
+    # If-None-Match uses weak comparison, so the W/ prefix is ignored
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+# Opaque keyset pagination cursors
+
+def encode_cursor(key):
+    payload = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_type: type = int):
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor `{cursor}`.")
+
+    if type(key) is not key_type:
+        raise ValueError(f"Invalid cursor `{cursor}`.")
+
+    return key
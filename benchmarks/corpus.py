@@ -0,0 +1,162 @@
+"""Synthetic corpus generator and database seeder for the benchmarks.
+
+Seeds the database from `.env` with N projects, M sentences per project,
+K translations per sentence and a pool of annotators holding a role in
+every project. Everything is created through `crud`, so counters, content
+hashes and versions are maintained as in production. Names carry a run tag,
+so seeding never collides with existing data.
+
+    python -m benchmarks.corpus --projects 2 --sentences 10000 --translations 2 \\
+        --annotators 20 --manifest corpus.json
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+
+from backend import utils
+from backend.db import crud, database, models, schemas
+
+
+SYLLABLES = ["ka", "lo", "mi", "tu", "ne", "sa", "ri", "po", "de", "wa",
+             "ba", "ye", "zu", "fo", "hi", "ga", "ma", "nu", "ko", "le"]
+TARGET_LANGUAGES = ["fr", "sw", "yo", "de", "es"]
+PASSWORD = "benchmark-password"
+
+
+def vocabulary(rng: random.Random, size: int = 2000):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4))))
+
+    return sorted(words)
+
+
+def synthetic_sentences(count: int, seed: int = 0, variant_rate: float = 0.2):
+    """Yields `count` sentences; about `variant_rate` of them are one-word edits
+    of an earlier sentence, so fuzzy matching has near-duplicates to find."""
+    rng = random.Random(seed)
+    words = vocabulary(rng)
+    recent = []
+    for i in range(count):
+        if recent and rng.random() < variant_rate:
+            tokens = rng.choice(recent).split()
+            tokens[rng.randrange(len(tokens) - 1)] = rng.choice(words)
+        else:
+            # The trailing index keeps fresh sentences distinct
+            tokens = [rng.choice(words) for _ in range(rng.randint(6, 14))] + [str(i)]
+        sentence = " ".join(tokens)
+        recent.append(sentence)
+        if len(recent) > 1000:
+            recent.pop(0)
+
+        yield sentence
+
+
+def _batches(items, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def seed(projects: int, sentences: int, translations: int, annotators: int,
+         batch_size: int = 1000, sample: int = 1000, seed_value: int = 0, tag: str | None = None):
+    """Creates the corpus and returns a JSON-serializable manifest describing it."""
+    rng = random.Random(seed_value)
+    # Unique per run, unlike the data, which `seed_value` makes reproducible
+    tag = tag or f"bench-{uuid.uuid4().hex[:8]}"
+    models.Base.metadata.create_all(bind=database.engine)
+
+    # One bcrypt hash for every seeded account
+    hashed_password = utils.hash_password(PASSWORD)
+    started = time.perf_counter()
+
+    db = database.SessionLocal()
+    try:
+        admin = crud.create_user(db=db, user=schemas.UserCreate(
+            username=f"{tag}-admin", email=f"{tag}-admin@example.com",
+            password=PASSWORD, is_admin=True), hashed_password=hashed_password).username
+        usernames = [
+            crud.create_user(db=db, user=schemas.UserCreate(
+                username=f"{tag}-annotator-{i}", email=f"{tag}-annotator-{i}@example.com",
+                password=PASSWORD), hashed_password=hashed_password).username
+            for i in range(annotators)
+        ]
+
+        manifest_projects = []
+        for p in range(projects):
+            project = crud.create_project(db=db, project=schemas.ProjectCreate(
+                name=f"{tag}-project-{p}", p_type="text-to-text"))
+            crud.create_roles(db=db, roles=[
+                schemas.RoleCreate(role="annotator", username=username, project_id=project.id)
+                for username in usernames
+            ])
+
+            sentence_ids = []
+            texts = list(synthetic_sentences(sentences, seed=seed_value + p))
+            for batch in _batches(texts, batch_size):
+                created = crud.create_sentences(db=db, project_id=project.id, on_duplicate="skip", sentences=[
+                    schemas.SentenceCreate(text=text, language_iso="en") for text in batch])
+                sentence_ids.extend(sentence.id for sentence in created)
+
+            pairs = [
+                (sentence_id, schemas.TranslationCreate(
+                    text=f"translation {k} of sentence {sentence_id}",
+                    language_iso=TARGET_LANGUAGES[k % len(TARGET_LANGUAGES)],
+                    annotator_username=usernames[(sentence_id + k) % len(usernames)]))
+                for sentence_id in sentence_ids for k in range(translations)
+            ] if usernames else []
+            for batch in _batches(pairs, batch_size):
+                crud.create_translations(db=db, translations=batch)
+
+            manifest_projects.append({
+                "id": project.id,
+                "sentences": len(sentence_ids),
+                "sentence_ids": rng.sample(sentence_ids, min(sample, len(sentence_ids))),
+            })
+    finally:
+        db.close()
+
+    return {
+        "tag": tag,
+        "seed": seed_value,
+        "password": PASSWORD,
+        "admin": admin,
+        "annotators": usernames,
+        "projects": manifest_projects,
+        "translations_per_sentence": translations,
+        "target_languages": TARGET_LANGUAGES[:max(translations, 1)],
+        "seed_seconds": time.perf_counter() - started,
+    }
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--projects", type=int, default=2)
+    parser.add_argument("--sentences", type=int, default=2000, help="sentences per project")
+    parser.add_argument("--translations", type=int, default=1, help="translations per sentence")
+    parser.add_argument("--annotators", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tag", help="name prefix for seeded rows (random by default)")
+
+
+def seed_from_args(args):
+    return seed(projects=args.projects, sentences=args.sentences, translations=args.translations,
+                annotators=args.annotators, batch_size=args.batch_size, seed_value=args.seed, tag=args.tag)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.corpus")
+    add_arguments(parser)
+    parser.add_argument("--manifest", default="corpus.json", help="where to write the corpus manifest")
+    args = parser.parse_args(argv)
+
+    manifest = seed_from_args(args)
+    with open(args.manifest, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    print(json.dumps({key: value for key, value in manifest.items() if key != "projects"}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
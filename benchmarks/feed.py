@@ -0,0 +1,120 @@
+"""Fan-out of the project activity feed to thousands of subscribers.
+
+Drives `events.ProjectFeed` directly: writer threads publish like crud does
+after a commit, and each subscriber is a task draining its queue the way the
+WebSocket route does, a fraction of them slowly. Event ids carry the publish
+time, so delivery latency includes the coalescing window. Needs the
+application settings (`.env`) but no database.
+
+    python -m benchmarks.feed --subscribers 5000 --projects 10 --events-per-second 500
+"""
+import argparse
+import asyncio
+import json
+import resource
+import threading
+import time
+
+import orjson
+
+from backend.events import RESYNC, ProjectFeed
+
+
+def percentile(ordered: list[float], q: float):
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] if ordered else None
+
+
+async def consume(subscription, delay: float, latencies: list):
+    while True:
+        message = await subscription.queue.get()
+        received = time.time()
+        if message != RESYNC:
+            batch = orjson.loads(message)
+            oldest = min(min(event["ids"]) for event in batch["events"])
+            latencies.append((received - oldest) * 1000)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+def publish(feed: ProjectFeed, projects: int, rate: float, seconds: float):
+    # Paced writer thread: one event per commit, spread over the projects
+    interval = 1 / rate
+    deadline = time.monotonic() + seconds
+    sent = 0
+    while time.monotonic() < deadline:
+        feed.publish(sent % projects, "translations.created", [time.time()])
+        sent += 1
+        time.sleep(interval)
+
+
+async def run(args):
+    feed = ProjectFeed(coalesce_seconds=args.coalesce_seconds, queue_size=args.queue_size)
+    feed.bind(asyncio.get_running_loop())
+
+    latencies = []
+    subscriptions = [feed.subscribe(i % args.projects) for i in range(args.subscribers)]
+    slow_every = round(1 / args.slow_fraction) if args.slow_fraction else 0
+    consumers = [
+        asyncio.create_task(consume(subscription, args.slow_delay if slow_every and i % slow_every == 0 else 0,
+                                    latencies))
+        for i, subscription in enumerate(subscriptions)
+    ]
+
+    writers = [
+        threading.Thread(target=publish, args=(feed, args.projects, args.events_per_second / args.writers, args.seconds))
+        for _ in range(args.writers)
+    ]
+    started = time.perf_counter()
+    for writer in writers:
+        writer.start()
+    while any(writer.is_alive() for writer in writers):
+        await asyncio.sleep(0.05)
+    # Let the last coalescing window flush and drain
+    await asyncio.sleep(args.coalesce_seconds + 0.5)
+    elapsed = time.perf_counter() - started
+
+    for consumer in consumers:
+        consumer.cancel()
+    await asyncio.gather(*consumers, return_exceptions=True)
+    feed.bind(None)
+
+    latencies.sort()
+    return {
+        "subscribers": args.subscribers,
+        "projects": args.projects,
+        "events_published": feed.published,
+        "messages_delivered": feed.delivered,
+        "messages_per_second": feed.delivered / elapsed,
+        "resyncs": sum(subscription.overflows for subscription in subscriptions),
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else None,
+        },
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.feed")
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--projects", type=int, default=10)
+    parser.add_argument("--events-per-second", type=float, default=500)
+    parser.add_argument("--writers", type=int, default=4, help="publishing threads")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--coalesce-seconds", type=float, default=0.25)
+    parser.add_argument("--queue-size", type=int, default=32)
+    parser.add_argument("--slow-fraction", type=float, default=0.01, help="share of subscribers that read slowly")
+    parser.add_argument("--slow-delay", type=float, default=1.0, help="seconds a slow subscriber spends per message")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run(args))
+    config = {key: getattr(args, key) for key in ("events_per_second", "writers", "seconds", "coalesce_seconds",
+                                                  "queue_size", "slow_fraction", "slow_delay")}
+
+    print(json.dumps({"benchmark": "feed", "config": config, "result": result}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""Load test of the real app through an in-process ASGI client.
+
+Requests go through `httpx.ASGITransport` into `backend.api.core.app`, so
+routing, dependencies, serialization and the database are all exercised
+without a network hop. Seed a corpus first (`python -m benchmarks.corpus`)
+or let this command seed one with the same size options.
+
+    python -m benchmarks.load --manifest corpus.json --concurrency 50 \\
+        --requests 1000 --output results.json
+
+Set `ASYNC_DB=true` to measure the asyncio database stack instead.
+Admission control is off unless `--admission` is given: every request comes
+from one client and a handful of users, so the rate limits would mostly
+measure rejections.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+from collections import Counter
+
+import httpx
+
+from backend import admission, utils
+from backend.api.core import app
+from backend.db import database
+
+from . import corpus
+
+
+class Context:
+    """Corpus manifest plus the bearer tokens of every seeded account."""
+
+    def __init__(self, manifest: dict, bulk_size: int, recording_bytes: int):
+        self.manifest = manifest
+        self.projects = [project for project in manifest["projects"] if project["sentence_ids"]]
+        # The words each project's sentences were drawn from, for search terms
+        self.vocabularies = {
+            project["id"]: corpus.vocabulary(random.Random(manifest["seed"] + index))
+            for index, project in enumerate(manifest["projects"])
+        }
+        self.bulk_size = bulk_size
+        self.recording_bytes = recording_bytes
+        self.tokens = {}
+        self.bulk_counter = itertools.count()
+
+    async def login_all(self, client: httpx.AsyncClient):
+        for username in [self.manifest["admin"], *self.manifest["annotators"]]:
+            response = await client.post("/login", data={"username": username, "password": self.manifest["password"]})
+            response.raise_for_status()
+            self.tokens[username] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    def annotator(self, rng: random.Random):
+        username = rng.choice(self.manifest["annotators"])
+        return username, self.tokens[username]
+
+    def sentence(self, rng: random.Random):
+        project = rng.choice(self.projects)
+        return project["id"], rng.choice(project["sentence_ids"])
+
+
+# Scenarios: one request each, against a random project/sentence/annotator
+
+async def login(client, ctx: Context, rng: random.Random):
+    return await client.post("/login", data={"username": rng.choice(ctx.manifest["annotators"]),
+                                             "password": ctx.manifest["password"]})
+
+
+async def list_sentences(client, ctx: Context, rng: random.Random):
+    project_id, sentence_id = ctx.sentence(rng)
+    _, headers = ctx.annotator(rng)
+    return await client.get(f"/projects/{project_id}/sentences/", headers=headers,
+                            params={"limit": 50, "cursor": utils.encode_cursor(sentence_id)})
+
+
+async def get_sentence(client, ctx: Context, rng: random.Random):
+    project_id, sentence_id = ctx.sentence(rng)
+    _, headers = ctx.annotator(rng)
+    return await client.get(f"/projects/{project_id}/sentences/{sentence_id}", headers=headers)
+
+
+async def create_translation(client, ctx: Context, rng: random.Random):
+    project_id, sentence_id = ctx.sentence(rng)
+    username, headers = ctx.annotator(rng)
+    return await client.post(f"/projects/{project_id}/sentences/{sentence_id}/translations/", headers=headers, json={
+        "text": f"benchmark translation {rng.getrandbits(32)}",
+        "language_iso": rng.choice(ctx.manifest["target_languages"]),
+        "annotator_username": username,
+    })
+
+
+async def bulk_sentences(client, ctx: Context, rng: random.Random):
+    project_id, _ = ctx.sentence(rng)
+    batch = next(ctx.bulk_counter)
+    return await client.post(f"/projects/{project_id}/sentences/", headers=ctx.tokens[ctx.manifest["admin"]], json=[
+        {"text": f"bulk {ctx.manifest['tag']} batch {batch} sentence {i} {rng.getrandbits(32)}", "language_iso": "en"}
+        for i in range(ctx.bulk_size)
+    ])
+
+
+async def search(client, ctx: Context, rng: random.Random):
+    project_id, _ = ctx.sentence(rng)
+    _, headers = ctx.annotator(rng)
+    return await client.get(f"/projects/{project_id}/search/", headers=headers,
+                            params={"q": rng.choice(ctx.vocabularies[project_id])})
+
+
+async def suggestions(client, ctx: Context, rng: random.Random):
+    project_id, sentence_id = ctx.sentence(rng)
+    _, headers = ctx.annotator(rng)
+    return await client.get(f"/projects/{project_id}/sentences/{sentence_id}/suggestions/", headers=headers,
+                            params={"language_iso": rng.choice(ctx.manifest["target_languages"])})
+
+
+async def upload_recording(client, ctx: Context, rng: random.Random):
+    project_id, sentence_id = ctx.sentence(rng)
+    _, headers = ctx.annotator(rng)
+    return await client.post(f"/projects/{project_id}/sentences/{sentence_id}/recordings/",
+                             headers={**headers, "Content-Type": "audio/wav"},
+                             params={"language_iso": rng.choice(ctx.manifest["target_languages"])},
+                             content=rng.randbytes(ctx.recording_bytes))
+
+
+SCENARIOS = {
+    "login": login,
+    "list_sentences": list_sentences,
+    "get_sentence": get_sentence,
+    "create_translation": create_translation,
+    "bulk_sentences": bulk_sentences,
+    "search": search,
+    "suggestions": suggestions,
+    "upload_recording": upload_recording,
+}
+DEFAULT_SCENARIOS = ["login", "list_sentences", "get_sentence", "create_translation", "bulk_sentences"]
+
+
+def percentile(ordered: list[float], q: float):
+    # Nearest-rank percentile of an already sorted list
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+async def run_scenario(client: httpx.AsyncClient, name: str, ctx: Context, requests: int, concurrency: int,
+                       warmup: int, seed: int):
+    scenario = SCENARIOS[name]
+    rng = random.Random(seed)
+    for _ in range(warmup):
+        await scenario(client, ctx, rng)
+
+    latencies = []
+    failed = 0
+    statuses = Counter()
+    remaining = iter(range(requests))
+
+    async def worker(worker_id: int):
+        worker_rng = random.Random(f"{seed}-{name}-{worker_id}")
+        nonlocal failed
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await scenario(client, ctx, worker_rng)
+            elapsed = time.perf_counter() - start
+            statuses[response.status_code] += 1
+            # Rejections are cheap, so only successes count towards latency
+            if 200 <= response.status_code < 300:
+                latencies.append(elapsed)
+            else:
+                failed += 1
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    ordered = sorted(latency * 1000 for latency in latencies)
+    result = {
+        "scenario": name,
+        "requests": len(latencies) + failed,
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        # Successful requests only
+        "throughput_rps": len(latencies) / elapsed if elapsed else None,
+        "non_2xx": failed,
+        "status_codes": {str(status_code): count for status_code, count in sorted(statuses.items())},
+        "latency_ms": {
+            "mean": statistics.fmean(ordered) if ordered else None,
+            "p50": percentile(ordered, 50),
+            "p95": percentile(ordered, 95),
+            "p99": percentile(ordered, 99),
+            "max": ordered[-1] if ordered else None,
+        },
+    }
+    if name == "bulk_sentences":
+        result["rows_per_second"] = result["throughput_rps"] * ctx.bulk_size
+    if name == "upload_recording":
+        result["megabytes_per_second"] = result["throughput_rps"] * ctx.recording_bytes / 2 ** 20
+        # ru_maxrss is in KiB on Linux; a rise means uploads grew the process peak
+        result["peak_rss_growth_kib"] = rss_after - rss_before
+
+    return result
+
+
+async def run(args, manifest: dict):
+    ctx = Context(manifest, bulk_size=args.bulk_size, recording_bytes=args.recording_bytes)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        await ctx.login_all(client)
+        results = []
+        for name in args.scenarios:
+            result = await run_scenario(client, name, ctx, requests=args.requests, concurrency=args.concurrency,
+                                        warmup=args.warmup, seed=args.seed)
+            print(f"{name:>20}: {result['throughput_rps']:8.1f} req/s  p50 {result['latency_ms']['p50'] or 0:8.2f} ms  "
+                  f"p99 {result['latency_ms']['p99'] or 0:8.2f} ms  non-2xx {result['non_2xx']}", file=sys.stderr)
+            results.append(result)
+
+    if database.async_engine is not None:
+        await database.async_engine.dispose()
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    parser.add_argument("--manifest", help="corpus manifest written by benchmarks.corpus; seeds a new corpus if omitted")
+    corpus.add_arguments(parser)
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=DEFAULT_SCENARIOS)
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--bulk-size", type=int, default=100, help="sentences per bulk_sentences request")
+    parser.add_argument("--recording-bytes", type=int, default=1024 * 1024)
+    parser.add_argument("--admission", action="store_true",
+                        help="keep admission control on, with the limits from the settings")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Read per request, so this applies to the already built app
+    admission.settings.admission_enabled = args.admission
+
+    if args.manifest and os.path.exists(args.manifest):
+        with open(args.manifest) as f:
+            manifest = json.load(f)
+    else:
+        manifest = corpus.seed_from_args(args)
+
+    try:
+        results = asyncio.run(run(args, manifest))
+    finally:
+        utils.shutdown_password_executor()
+        database.engine.dispose()
+
+    report = {
+        "benchmark": "load",
+        "config": {
+            "async_db": database.settings.async_db,
+            "fast_list_routes": sorted(database.settings.fast_list_routes),
+            "db_pool_size": database.settings.db_pool_size,
+            "db_max_overflow": database.settings.db_max_overflow,
+            "bcrypt_rounds": database.settings.bcrypt_rounds,
+            "admission": {
+                "enabled": admission.settings.admission_enabled,
+                "rate_limit_user_rps": admission.settings.rate_limit_user_rps,
+                "rate_limit_user_burst": admission.settings.rate_limit_user_burst,
+                "rate_limit_ip_rps": admission.settings.rate_limit_ip_rps,
+                "rate_limit_ip_burst": admission.settings.rate_limit_ip_burst,
+                "max_in_flight": admission.settings.admission_max_in_flight,
+                "route_limits": admission.settings.admission_route_limits,
+            },
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "bulk_size": args.bulk_size,
+        },
+        "corpus": {
+            "tag": manifest["tag"],
+            "projects": len(manifest["projects"]),
+            "sentences": sum(project["sentences"] for project in manifest["projects"]),
+            "annotators": len(manifest["annotators"]),
+            "translations_per_sentence": manifest["translations_per_sentence"],
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Serialization cost per page: ORM objects + response_model vs orjson rows.
+
+Needs the application settings (`.env`) to import the models, but no
+database connection.
+
+    python -m benchmarks.serialization --page-sizes 10 100 1000 --repeat 200
+"""
+import argparse
+import json
+import time
+
+import orjson
+from pydantic import TypeAdapter
+
+from backend.db import models, schemas
+
+
+def orm_page(size: int):
+    return [
+        models.Sentence(id=i, text=f"Sentence number {i} of the benchmark corpus.",
+                        language_iso="en", project_id=1)
+        for i in range(size)
+    ]
+
+
+def row_page(size: int):
+    return [
+        {"id": i, "text": f"Sentence number {i} of the benchmark corpus.",
+         "language_iso": "en", "project_id": 1}
+        for i in range(size)
+    ]
+
+
+def response_model_path(page, adapter: TypeAdapter):
+    # What FastAPI does for `response_model=list[schemas.Sentence]`
+    validated = adapter.validate_python(page, from_attributes=True)
+    return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+
+def fast_path(page):
+    return orjson.dumps(page)
+
+
+def measure(fn, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+
+    return (time.perf_counter() - start) / repeat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization")
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    adapter = TypeAdapter(list[schemas.Sentence])
+    results = []
+    for size in args.page_sizes:
+        orm, rows = orm_page(size), row_page(size)
+        slow = measure(lambda: response_model_path(orm, adapter), args.repeat)
+        fast = measure(lambda: fast_path(rows), args.repeat)
+        results.append({"page_size": size, "response_model_ms": slow * 1000,
+                        "orjson_rows_ms": fast * 1000, "speedup": slow / fast})
+
+    print(json.dumps({"benchmark": "serialization", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
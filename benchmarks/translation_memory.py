@@ -0,0 +1,121 @@
+"""Translation-memory index: build rate, memory, query latency and recall.
+
+Indexes synthetic corpora with the same MinHash/LSH settings as the app and
+compares each query's reranked top-k against an exact brute-force Jaccard
+search. Needs the application settings (`.env`) but no database.
+
+    python -m benchmarks.translation_memory --sizes 10000 100000 --queries 200
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+from backend.translation_memory import MinHashLSH, settings, shingles, similarity
+
+from .corpus import synthetic_sentences
+
+
+def build(corpus: list[str], args):
+    lsh = MinHashLSH(num_perm=args.num_perm, bands=args.bands, ngram=args.ngram)
+    for sentence_id, text in enumerate(corpus):
+        lsh.add(sentence_id, text)
+
+    return lsh
+
+
+def lsh_top_k(lsh: MinHashLSH, corpus_shingles: list[set], text: str, k: int, args):
+    # Same candidate generation and exact rerank as ProjectIndex.suggest
+    query = shingles(text, args.ngram)
+    scored = [(similarity(query, corpus_shingles[sentence_id]), sentence_id)
+              for sentence_id in lsh.query(text, args.max_candidates)]
+
+    return [sentence_id for score, sentence_id in sorted(scored, reverse=True) if score >= args.min_score][:k]
+
+
+def exact_top_k(corpus_shingles: list[set], text: str, k: int, args):
+    query = shingles(text, args.ngram)
+    scored = [(similarity(query, candidate), sentence_id) for sentence_id, candidate in enumerate(corpus_shingles)]
+
+    return [sentence_id for score, sentence_id in sorted(scored, reverse=True)[:k] if score >= args.min_score]
+
+
+def queries(corpus: list[str], count: int, seed: int):
+    # One-word edits of indexed sentences: what an annotator would open next
+    rng = random.Random(seed)
+    result = []
+    for text in rng.sample(corpus, min(count, len(corpus))):
+        tokens = text.split()
+        tokens[rng.randrange(len(tokens))] = rng.choice(tokens)
+        result.append(" ".join(tokens))
+
+    return result
+
+
+def run(size: int, args):
+    corpus = list(synthetic_sentences(size, seed=args.seed))
+
+    started = time.perf_counter()
+    lsh = build(corpus, args)
+    build_seconds = time.perf_counter() - started
+
+    # Separate build under tracemalloc, which slows allocation down
+    tracemalloc.start()
+    build(corpus, args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    corpus_shingles = [shingles(text, args.ngram) for text in corpus]
+    probes = queries(corpus, args.queries, args.seed)
+
+    latencies = []
+    for text in probes:
+        started = time.perf_counter()
+        lsh_top_k(lsh, corpus_shingles, text, args.k, args)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+
+    found = relevant = 0
+    for text in probes[:args.recall_queries]:
+        expected = set(exact_top_k(corpus_shingles, text, args.k, args))
+        found += len(expected & set(lsh_top_k(lsh, corpus_shingles, text, args.k, args)))
+        relevant += len(expected)
+
+    return {
+        "sentences": size,
+        "build_seconds": build_seconds,
+        "sentences_per_second": size / build_seconds,
+        "index_peak_bytes": peak,
+        "bytes_per_sentence": peak / size,
+        "query_ms": {
+            "p50": latencies[len(latencies) // 2],
+            "p95": latencies[int(len(latencies) * 0.95)],
+            "max": latencies[-1],
+        },
+        f"recall_at_{args.k}": found / relevant if relevant else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.translation_memory")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--recall-queries", type=int, default=50, help="queries checked against brute force")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--num-perm", type=int, default=settings.tm_num_perm)
+    parser.add_argument("--bands", type=int, default=settings.tm_bands)
+    parser.add_argument("--ngram", type=int, default=settings.tm_ngram)
+    parser.add_argument("--max-candidates", type=int, default=settings.tm_max_candidates)
+    parser.add_argument("--min-score", type=float, default=settings.tm_min_score)
+    args = parser.parse_args(argv)
+
+    results = [run(size, args) for size in args.sizes]
+    config = {key: getattr(args, key) for key in ("num_perm", "bands", "ngram", "max_candidates", "min_score", "k")}
+
+    print(json.dumps({"benchmark": "translation_memory", "config": config, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import uuid
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from backend import oauth2
+from backend.db import crud, models, schemas
+from backend.db.database import SessionLocal, engine
+
+
+# These tests run against the Postgres database configured in `.env`; every
+# fixture creates uniquely named rows and removes them afterwards.
+
+
+@pytest.fixture(scope="session")
+def database():
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except OperationalError as e:
+        pytest.skip(f"Database is not reachable: {e}")
+    models.Base.metadata.create_all(bind=engine)
+
+    return engine
+
+
+@pytest.fixture
+def db(database):
+    db = SessionLocal()
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def make_user(db):
+    usernames = []
+
+    def make(is_admin: bool = False):
+        username = f"test-{uuid.uuid4().hex[:12]}"
+        crud.create_user(db=db, user=schemas.UserCreate(
+            username=username, email=f"{username}@example.com", password="unused", is_admin=is_admin
+        ), hashed_password="unused")
+        usernames.append(username)
+        return username
+
+    yield make
+    for username in usernames:
+        crud.delete_user(db=db, username=username)
+
+
+@pytest.fixture
+def make_token(db):
+    """Signs an access token carrying the user's current claims, as login does."""
+
+    def make(username: str):
+        db_user = crud.get_user(db=db, username=username, use_cache=False)
+        return oauth2.create_access_token(data={
+            "username": db_user.username, "is_admin": db_user.is_admin, "ver": db_user.token_version})
+
+    return make
+
+
+@pytest.fixture
+def make_project(db, make_user):
+    project_ids = []
+
+    def make(sentences: int = 0, language_iso: str = "en"):
+        db_project = crud.create_project(db=db, project=schemas.ProjectCreate(
+            name=f"test-{uuid.uuid4().hex[:12]}", p_type="translation"))
+        project_ids.append(db_project.id)
+        crud.create_sentences(db=db, project_id=db_project.id, sentences=[
+            schemas.SentenceCreate(text=f"sentence {i}", language_iso=language_iso)
+            for i in range(sentences)
+        ])
+        return db_project.id
+
+    yield make
+    for project_id in project_ids:
+        while crud.purge_project_sentences(db=db, project_id=project_id, duplicates=True):
+            pass
+        while crud.purge_project_sentences(db=db, project_id=project_id):
+            pass
+        crud.delete_project(db=db, project_id=project_id)
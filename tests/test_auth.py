@@ -0,0 +1,38 @@
+import pytest
+from fastapi import HTTPException
+
+from backend import oauth2
+from backend.cache import principal_cache, token_version_cache
+from backend.db import crud, schemas
+
+
+def _forget_locally(username: str):
+    # What another worker holds: nothing revoked in its own caches
+    principal_cache.delete_where(lambda key: key[0] == username)
+    token_version_cache.delete(username)
+
+
+def test_demotion_revokes_tokens_issued_before_it(db, make_user, make_token):
+    username = make_user(is_admin=True)
+    token = make_token(username)
+    assert oauth2.get_current_user(token=token, db=db).is_admin
+
+    crud.update_user(db=db, username=username, user=schemas.UserUpdate(
+        username=username, email=f"{username}@example.com", is_admin=False))
+    _forget_locally(username)
+
+    with pytest.raises(HTTPException) as e:
+        oauth2.get_current_user(token=token, db=db)
+    assert e.value.status_code == 401
+    assert not oauth2.get_current_user(token=make_token(username), db=db).is_admin
+
+
+def test_profile_changes_keep_tokens_valid(db, make_user, make_token):
+    username = make_user()
+    token = make_token(username)
+
+    crud.update_user(db=db, username=username, user=schemas.UserUpdate(
+        username=username, email=f"{username}@example.com", age=30))
+    _forget_locally(username)
+
+    assert oauth2.get_current_user(token=token, db=db).username == username
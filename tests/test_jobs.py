@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import jobs
+from backend.api.core import app
+from backend.db import crud, models
+
+
+@pytest.fixture
+def own_jobs(db, make_user):
+    username = make_user()
+    # Cancelled right away, so no worker or test claims them
+    job_ids = [crud.cancel_job(db=db, job_id=crud.create_job(db=db, kind="export_project", username=username).id).id
+               for _ in range(5)]
+    yield username, job_ids
+    db.query(models.Job).filter(models.Job.id.in_(job_ids)).delete()
+    db.commit()
+
+
+def test_job_pages_follow_the_next_cursor(database, own_jobs, make_token):
+    username, job_ids = own_jobs
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {make_token(username)}"}
+
+    seen, params = [], {"limit": 2}
+    while True:
+        response = client.get("/jobs/", params=params, headers=headers)
+        assert response.status_code == 200
+        seen += [job["id"] for job in response.json()]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    assert seen == job_ids
+    assert client.get("/jobs/", params={"cursor": "not-a-cursor"}, headers=headers).status_code == 400
+
+
+def test_small_export_reports_its_size_as_progress(db, make_user, make_project, tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs.settings, "exports_dir", str(tmp_path))
+    db_job = crud.create_job(db=db, kind="export_project", username=make_user(), project_id=make_project(sentences=3),
+                             payload={"format": "ndjson", "language_iso": None, "gzip": False})
+    try:
+        # Claimed by hand, so no other queued job is touched
+        db.query(models.Job).filter(models.Job.id == db_job.id).update(
+            {"status": "running", "worker_id": "test-worker", "attempts": 1})
+        db.commit()
+        # Byte counts of large exports do not fit in int4
+        assert crud.checkpoint_job(db=db, job_id=db_job.id, worker_id="test-worker", progress=5 * 2 ** 30) is not None
+
+        jobs.run_job(crud.get_job(db=db, job_id=db_job.id), "test-worker", threading.Event())
+
+        db.expire_all()
+        db_job = crud.get_job(db=db, job_id=db_job.id)
+        assert db_job.status == "succeeded"
+        assert 0 < db_job.progress == db_job.total == db_job.result["bytes"]
+    finally:
+        db.query(models.Job).filter(models.Job.id == db_job.id).delete()
+        db.commit()
@@ -0,0 +1,106 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import metrics
+from backend.api.core import app
+from backend.db import crud, database, schemas
+
+
+# Guards against N+1 queries: a page of many rows must take as many SQL
+# statements as a page of one. Counts come from the per-route RequestStats
+# accounting that backs /internal/metrics; every request is made twice and
+# the second one measured, so warming caches do not skew the comparison.
+
+
+@pytest.fixture
+def client(database):
+    # No lifespan: these requests only read
+    return TestClient(app)
+
+
+def _statements(client, token: str, path: str, route: str, **params):
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get(path, params=params, headers=headers).status_code == 200
+
+    histogram = metrics._route_metrics(("GET", route, "200")).statements
+    _, before, _ = histogram.snapshot()
+    response = client.get(path, params=params, headers=headers)
+    assert response.status_code == 200
+    _, after, _ = histogram.snapshot()
+
+    return int(after - before), response.json()
+
+
+@pytest.fixture(params=[True, False], ids=["rows", "orm"])
+def fast_list_routes(request, monkeypatch):
+    monkeypatch.setattr(database.settings, "fast_list_routes",
+                        {"sentences", "users"} if request.param else set())
+
+
+@pytest.fixture
+def member(db, make_user, make_project):
+    """An annotator of five projects, each with two more annotators."""
+    username = make_user()
+    project_ids = [make_project(sentences=5) for _ in range(5)]
+    for project_id in project_ids:
+        for annotator in (username, make_user(), make_user()):
+            crud.create_role(db=db, role=schemas.RoleCreate(
+                role="annotator", username=annotator, project_id=project_id))
+
+    return username, project_ids
+
+
+@pytest.mark.parametrize("include", [None, "annotators"])
+def test_project_list(db, client, member, make_token, include):
+    username, _ = member
+    token = make_token(username)
+
+    one, page = _statements(client, token, "/projects/", "/projects/", limit=1, include=include)
+    many, page = _statements(client, token, "/projects/", "/projects/", limit=5, include=include)
+
+    assert len(page) == 5
+    if include:
+        assert all(len(project["annotators"]) == 3 for project in page)
+    assert many == one
+
+
+def test_project_detail(db, client, make_user, make_token, member):
+    username, project_ids = member
+    token = make_token(username)
+    path = f"/projects/{project_ids[0]}/"
+
+    few, project = _statements(client, token, path, "/projects/{project_id}/")
+    assert len(project["annotators"]) == 3
+
+    for _ in range(5):
+        crud.create_role(db=db, role=schemas.RoleCreate(
+            role="annotator", username=make_user(), project_id=project_ids[0]))
+    more, project = _statements(client, token, path, "/projects/{project_id}/")
+
+    assert len(project["annotators"]) == 8
+    assert more == few
+
+
+def test_sentence_list(db, client, member, make_token, fast_list_routes):
+    username, project_ids = member
+    token = make_token(username)
+    path = f"/projects/{project_ids[0]}/sentences/"
+    route = "/projects/{project_id}/sentences/"
+
+    one, _ = _statements(client, token, path, route, limit=1)
+    many, page = _statements(client, token, path, route, limit=5)
+
+    assert len(page) == 5
+    assert many == one
+
+
+def test_user_list(db, client, make_user, make_token, fast_list_routes):
+    token = make_token(make_user())
+    for _ in range(5):
+        make_user()
+
+    one, _ = _statements(client, token, "/users/", "/users/", limit=1)
+    many, page = _statements(client, token, "/users/", "/users/", limit=5)
+
+    assert len(page) == 5
+    assert many == one
@@ -0,0 +1,154 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.db import crud, schemas
+
+
+# EXPLAINs the statements crud functions actually issue and asserts the index
+# each access path is meant to use. Test tables are tiny, so plans are taken
+# in a transaction that first loads a production-like volume of rows (rolled
+# back afterwards); naming the expected index keeps a primary key or another
+# index that merely happens to be cheap on small tables from passing.
+
+SEED = """
+INSERT INTO users (username, is_admin, token_version)
+    SELECT 'plan-seed-' || i, false, 0 FROM generate_series(1, 2000) i;
+INSERT INTO projects (name, version)
+    SELECT 'plan-seed-' || i, 0 FROM generate_series(1, 100) i;
+CREATE TEMP TABLE plan_seed_projects ON COMMIT DROP AS
+    SELECT id, row_number() OVER (ORDER BY id) - 1 AS n FROM projects WHERE name LIKE 'plan-seed-%%';
+INSERT INTO roles (username, project_id, role)
+    SELECT 'plan-seed-' || i, CASE WHEN i %% 50 = 0 THEN %(project_id)s ELSE p.id END, 'annotator'
+    FROM generate_series(1, 2000) i JOIN plan_seed_projects p ON p.n = i %% 100;
+INSERT INTO sentences (text, language_iso, project_id)
+    SELECT 'filler ' || i, 'en', CASE WHEN i %% 50 = 0 THEN %(project_id)s ELSE p.id END
+    FROM generate_series(1, 20000) i JOIN plan_seed_projects p ON p.n = i %% 100;
+INSERT INTO translations (text, language_iso, src_sentence_id, annotator_username)
+    SELECT 'filler', 'fr', s.id, 'plan-seed-1' FROM sentences s WHERE s.text LIKE 'filler %%';
+INSERT INTO recordings (audio_file_path, language_iso, src_sentence_id, annotator_username)
+    SELECT 'filler', 'fr', s.id, 'plan-seed-1' FROM sentences s WHERE s.text LIKE 'filler %%';
+INSERT INTO jobs (kind, status, username, payload, progress, attempts, cancel_requested)
+    SELECT 'export_project', 'succeeded', 'plan-seed-' || i %% 2000, '{}', 0, 1, false
+    FROM generate_series(1, 10000) i;
+ANALYZE users, projects, roles, sentences, translations, recordings, jobs;
+-- Fresh rows sit in the GIN pending lists, which inflates the search index costs
+SELECT gin_clean_pending_list('ix_sentences_text_fts'), gin_clean_pending_list('ix_translations_text_fts');
+"""
+
+
+@contextmanager
+def _issued(db):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and not statement.lstrip().upper().startswith(("SET", "EXPLAIN", "SAVEPOINT", "RELEASE", "ROLLBACK")):
+            statements.append((statement, parameters))
+
+    engine = db.get_bind().engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+        db.rollback()
+
+
+def _indexes(plan: dict):
+    if "Index Name" in plan:
+        yield plan["Index Name"]
+    yield from plan.get("Conflict Arbiter Indexes", [])
+    for child in plan.get("Plans", []):
+        yield from _indexes(child)
+
+
+def _plan_indexes(db, statements, project_id):
+    used = set()
+    connection = db.connection()
+    connection.exec_driver_sql(SEED, {"project_id": project_id})
+    for statement, parameters in statements:
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        used.update(_indexes(plan[0]["Plan"]))
+    db.rollback()
+
+    return used
+
+
+def assert_uses(db, project_id, call, *indexes):
+    with _issued(db) as statements:
+        call()
+    assert statements, "the call issued no SQL"
+    used = _plan_indexes(db, statements, project_id)
+    missing = set(indexes) - used
+    assert not missing, f"expected {sorted(missing)} in plans, got {sorted(used)}"
+
+
+@pytest.fixture
+def rolled_back_db(database):
+    """A session whose commits only release savepoints; everything is rolled back at the end."""
+    connection = database.connect()
+    transaction = connection.begin()
+    db = Session(bind=connection, join_transaction_mode="create_savepoint")
+    yield db
+    db.close()
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture
+def corpus(db, make_user, make_project):
+    project_id = make_project(sentences=3)
+    username = make_user()
+    crud.create_role(db=db, role=schemas.RoleCreate(role="annotator", username=username, project_id=project_id))
+
+    return project_id, username
+
+
+def test_project_sentence_pages(db, corpus):
+    project_id, _ = corpus
+    assert_uses(db, project_id, lambda: crud.get_project_sentences(db=db, project_id=project_id, after=0, limit=2),
+                "ix_sentences_project_id_id")
+    assert_uses(db, project_id, lambda: crud.get_project_sentence_rows(db=db, project_id=project_id, after=0, limit=2),
+                "ix_sentences_project_id_id")
+
+
+def test_project_corpus_export(db, corpus):
+    project_id, _ = corpus
+    assert_uses(db, project_id, lambda: list(crud.iter_project_corpus(db=db, project_id=project_id)),
+                "ix_sentences_project_id_id", "ix_translations_src_sentence_id_id",
+                "ix_recordings_src_sentence_id_id")
+
+
+def test_membership_and_annotators(db, corpus):
+    project_id, username = corpus
+    # A fresh user, so the membership cache misses
+    assert_uses(db, project_id, lambda: crud.get_project_role(db=db, username=username + "-x", project_id=project_id),
+                "uq_roles_username_project_id")
+    assert_uses(db, project_id, lambda: crud.get_project(db=db, project_id=project_id, include_annotators=True),
+                "ix_roles_project_id")
+
+
+def test_search(db, corpus):
+    project_id, _ = corpus
+    for target, index in (("sentences", "ix_sentences_text_fts"), ("translations", "ix_translations_text_fts")):
+        assert_uses(db, project_id, lambda: crud.search_project(db=db, project_id=project_id, q="sentence", target=target),
+                    index)
+
+
+def test_task_checkout(db, corpus):
+    project_id, username = corpus
+    assert_uses(db, project_id, lambda: crud.lease_next_sentences(
+        db=db, project_id=project_id, username=username, language_iso="fr",
+        task_type="translation", count=1, lease_seconds=60),
+        "ix_sentences_project_id_id", "uq_task_leases_sentence_id_language_iso_task_type")
+
+
+def test_job_queue(db, rolled_back_db, corpus):
+    project_id, username = corpus
+    assert_uses(db, project_id, lambda: crud.get_jobs(db=db, username=username, after=0), "ix_jobs_username_id")
+    # Claiming commits, so it runs where that commit is rolled back and no
+    # real queued job is taken
+    assert_uses(rolled_back_db, project_id, lambda: crud.claim_job(db=rolled_back_db, worker_id="test"),
+                "ix_jobs_status_id")
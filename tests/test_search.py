@@ -0,0 +1,28 @@
+from backend import utils
+from backend.db import crud, schemas
+
+
+def _pages(db, project_id: int, limit: int):
+    after = None
+    while True:
+        hits = crud.search_project(db=db, project_id=project_id, q="apple", limit=limit, after=after)
+        yield hits
+        if len(hits) < limit:
+            return
+        # Through the opaque cursor, as clients send it back
+        after = utils.decode_cursor(utils.encode_cursor([hits[-1].rank, hits[-1].id]), key_type=list)
+
+
+def test_pages_with_tied_ranks_neither_skip_nor_repeat(db, make_project):
+    project_id = make_project()
+    db_sentences = crud.create_sentences(db=db, project_id=project_id, sentences=[
+        schemas.SentenceCreate(text=f"apple {word}", language_iso="en")
+        for word in ("red", "green", "yellow", "sour", "sweet", "ripe", "fresh")
+    ])
+
+    pages = list(_pages(db, project_id, limit=3))
+    hits = [hit for page in pages for hit in page]
+
+    # Every sentence ranks the same, so each page boundary falls inside a tie
+    assert len({hit.rank for hit in hits}) == 1
+    assert [hit.id for hit in hits] == sorted(db_sentence.id for db_sentence in db_sentences)
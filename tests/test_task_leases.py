@@ -0,0 +1,73 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from sqlalchemy import func, insert, select, text, update
+
+from backend.db import crud, models
+from backend.db.database import SessionLocal
+
+
+def _checkout(project_id: int, username: str):
+    db = SessionLocal()
+    try:
+        return crud.lease_next_sentences(
+            db=db, project_id=project_id, username=username, language_iso="fr",
+            task_type="translation", count=10, lease_seconds=300)
+    finally:
+        db.close()
+
+
+def _wait_for_lock_waiter(db, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if db.scalar(text("SELECT count(*) FROM pg_locks WHERE NOT granted")):
+            return
+        db.rollback()
+        time.sleep(0.05)
+    raise AssertionError("Checkout never waited on the concurrent lease")
+
+
+def test_checkout_does_not_take_over_a_lease_renewed_after_its_scan(db, make_user, make_project):
+    project_id = make_project(sentences=1)
+    sentence_id = db.scalar(select(models.Sentence.id).where(models.Sentence.project_id == project_id))
+    first, second = make_user(), make_user()
+    db.execute(insert(models.TaskLease).values(
+        sentence_id=sentence_id, language_iso="fr", task_type="translation",
+        username=first, expires_at=func.now() - timedelta(minutes=5)))
+    db.commit()
+
+    # `first` renews the expired lease in a transaction still open while
+    # `second` scans: the scan sees an expired lease, and the upsert waits
+    # on the renewal and must then leave it alone
+    other = SessionLocal()
+    try:
+        other.execute(update(models.TaskLease).where(models.TaskLease.sentence_id == sentence_id).values(
+            expires_at=func.now() + timedelta(minutes=5)))
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            checkout = pool.submit(_checkout, project_id, second)
+            _wait_for_lock_waiter(db)
+            other.commit()
+            leases = checkout.result(timeout=10)
+    finally:
+        other.close()
+
+    assert leases == []
+    assert db.scalar(select(models.TaskLease.username).where(
+        models.TaskLease.sentence_id == sentence_id)) == first
+
+
+def test_concurrent_checkouts_never_share_a_sentence(db, make_user, make_project):
+    project_id = make_project(sentences=40)
+    usernames = [make_user() for _ in range(8)]
+
+    with ThreadPoolExecutor(max_workers=len(usernames)) as pool:
+        results = list(pool.map(lambda username: _checkout(project_id, username), usernames))
+
+    leased = [lease["sentence"].id for leases in results for lease in leases]
+    assert len(leased) == len(set(leased))
+    owners = dict(db.execute(select(models.TaskLease.sentence_id, models.TaskLease.username).where(
+        models.TaskLease.sentence_id.in_(leased))).all())
+    for username, leases in zip(usernames, results):
+        assert all(owners[lease["sentence"].id] == username for lease in leases)
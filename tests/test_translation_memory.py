@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pytest
+
+from backend.db import crud, schemas
+from backend.translation_memory import TranslationMemory
+
+
+@pytest.fixture
+def translated_project(db, make_user, make_project):
+    """A project whose sentences all have a French translation."""
+    username = make_user()
+
+    def make(sentences: int):
+        project_id = make_project(sentences=sentences)
+        for sentence in crud.get_project_sentences(db=db, project_id=project_id):
+            crud.create_translation(db=db, src_sentence_id=sentence.id, translation=schemas.TranslationCreate(
+                text=f"phrase {sentence.id}", language_iso="fr", annotator_username=username))
+        return project_id
+
+    return make
+
+
+def _wait_until_built(index):
+    deadline = time.monotonic() + 10
+    while not index.built:
+        assert time.monotonic() < deadline, "index was never built"
+        time.sleep(0.01)
+
+
+def test_cold_index_answers_without_building(db, translated_project):
+    project_id = translated_project(3)
+    sentence = crud.get_project_sentences(db=db, project_id=project_id)[0]
+    memory = TranslationMemory(max_sentences=100, build_workers=1)
+
+    # Occupy the only build worker, so the index stays cold
+    release = threading.Event()
+    memory._executor.submit(release.wait)
+    index = memory.index(project_id=project_id, source_iso="en", target_iso="fr")
+    assert index.suggest(db=db, text=sentence.text, exclude_id=sentence.id, limit=5) is None
+
+    release.set()
+    _wait_until_built(index)
+    suggestions = index.suggest(db=db, text=sentence.text, exclude_id=sentence.id, limit=5)
+    assert suggestions and all(suggestion["sentence_id"] != sentence.id for suggestion in suggestions)
+
+
+def test_indexes_are_evicted_by_total_sentences(db, translated_project):
+    first, second = translated_project(3), translated_project(3)
+    memory = TranslationMemory(max_sentences=5, build_workers=1)
+
+    old = memory.index(project_id=first, source_iso="en", target_iso="fr")
+    _wait_until_built(old)
+    new = memory.index(project_id=second, source_iso="en", target_iso="fr")
+    _wait_until_built(new)
+    memory._executor.shutdown(wait=True)
+
+    assert old.dropped and not new.dropped
+    assert memory.index(project_id=second, source_iso="en", target_iso="fr") is new